@@ -80,6 +80,38 @@ class Embeddings(np.ndarray):
         """
         return np.multiply(self, ratings[::, np.newaxis])
 
+    def projection(self):
+        """
+        The matrix giving, for some ratings of the voters, the vector
+        whose scalar products with the embeddings are the closest to the
+        ratings (in the least squares sense). It is the pseudo-inverse of
+        the embeddings, computed with a QR decomposition when the
+        embeddings have full column rank.
+
+        Return
+        ------
+        np.ndarray
+            The projection matrix. Of shape :attr:`n_dim`, :attr:`n_voters`.
+
+        Examples
+        --------
+        >>> embs = Embeddings(np.array([[1, 0], [0, 1], [1, 1]]), norm=False)
+        >>> embs.projection()
+        array([[ 0.66666667, -0.33333333,  0.33333333],
+               [-0.33333333,  0.66666667,  0.33333333]])
+        >>> Embeddings(np.array([[1, 1], [2, 2]]), norm=False).projection()
+        array([[0.1, 0.2],
+               [0.1, 0.2]])
+        """
+        positions = np.asarray(self, dtype=float)
+        n_voters, n_dim = positions.shape
+        if n_voters >= n_dim:
+            q, r = np.linalg.qr(positions)
+            diagonal = np.abs(np.diagonal(r))
+            if n_dim > 0 and diagonal.min() > diagonal.max() * max(n_voters, n_dim) * np.finfo(float).eps:
+                return np.linalg.solve(r, q.T)
+        return np.linalg.pinv(positions)
+
     def _get_center(self):
         """
         Return the center of the ratings, computed
@@ -10,6 +10,7 @@ import numpy as np
 
 from embedded_voting.ratings.ratings import Ratings
 from embedded_voting.embeddings.embeddings import Embeddings
+from embedded_voting.utils.rng import RandomMixin
 
 
 class EmbeddingsFromRatings:
@@ -34,10 +35,18 @@ class EmbeddingsFromRatings:
         raise NotImplementedError
 
 
-class EmbeddingsFromRatingsRandom(EmbeddingsFromRatings):
+class EmbeddingsFromRatingsRandom(RandomMixin, EmbeddingsFromRatings):
     """
     Generates random normalized embeddings for the voters
 
+    Parameters
+    ----------
+    n_dim: int
+        Number of dimensions for the embeddings
+    rng : None, int, np.random.SeedSequence or np.random.Generator
+        The source of random numbers. If None, the global random
+        state of numpy is used (cf. :class:`~embedded_voting.utils.rng.RandomMixin`).
+
     Examples
     --------
     >>> np.random.seed(42)
@@ -50,13 +59,14 @@ class EmbeddingsFromRatingsRandom(EmbeddingsFromRatings):
                 [0.89942118, 0.43708299],
                 [0.65433791, 0.75620229]])
     """
-    def __init__(self, n_dim=0):
+    def __init__(self, n_dim=0, rng=None):
         self.n_dim = n_dim
+        self.rng = rng
 
     def __call__(self, ratings):
         ratings = Ratings(ratings)
         n_voters = ratings.shape[0]
-        embs = np.abs(np.random.randn(n_voters, self.n_dim))
+        embs = np.abs(self._random.standard_normal((n_voters, self.n_dim)))
         return Embeddings(embs, norm=True)
 
 
@@ -7,10 +7,10 @@ This file is part of Embedded Voting.
 """
 import numpy as np
 from embedded_voting.embeddings.embeddings import Embeddings
-from embedded_voting.utils.miscellaneous import normalize
+from embedded_voting.utils.rng import RandomMixin
 
 
-class EmbeddingsGenerator:
+class EmbeddingsGenerator(RandomMixin):
     """
     This abstract class creates Embeddings from scratch using some function
 
@@ -20,6 +20,9 @@ class EmbeddingsGenerator:
         Number of voters in the embeddings
     n_dim: int
         Number of dimensions for the embeddings
+    rng : None, int, np.random.SeedSequence or np.random.Generator
+        The source of random numbers. If None, the global random
+        state of numpy is used (cf. :class:`~embedded_voting.utils.rng.RandomMixin`).
 
     Attributes
     ----------
@@ -29,9 +32,10 @@ class EmbeddingsGenerator:
         Number of dimensions for the embeddings
 
     """
-    def __init__(self, n_voters, n_dim):
+    def __init__(self, n_voters, n_dim, rng=None):
         self.n_dim = n_dim
         self.n_voters = n_voters
+        self.rng = rng
 
     def __call__(self, *args):
         """
@@ -65,7 +69,7 @@ class EmbeddingsGeneratorRandom(EmbeddingsGenerator):
                 [0.54080587, 0.84114744]])
     """
     def __call__(self, *args):
-        embs = np.abs(np.random.randn(self.n_voters, self.n_dim))
+        embs = np.abs(self._random.standard_normal((self.n_voters, self.n_dim)))
         return Embeddings(embs, norm=True)
 
 
@@ -83,6 +87,9 @@ class EmbeddingsGeneratorPolarized(EmbeddingsGenerator):
         Number of dimensions for the embeddings
     prob: list
         The probabilities for each voter to be in each group. Default is uniform distribution
+    rng : None, int, np.random.SeedSequence or np.random.Generator
+        The source of random numbers. If None, the global random
+        state of numpy is used (cf. :class:`~embedded_voting.utils.rng.RandomMixin`).
 
     Attributes
     ----------
@@ -132,14 +139,11 @@ class EmbeddingsGeneratorPolarized(EmbeddingsGenerator):
                 [0.28182668, 0.95946533]])
 
     """
-    def __init__(self, n_voters, n_dim, prob=None):
-        super().__init__(n_voters, n_dim)
+    def __init__(self, n_voters, n_dim, prob=None, rng=None):
+        super().__init__(n_voters, n_dim, rng=rng)
         if prob is None:
             prob = np.ones(self.n_dim)/self.n_dim
         self.prob = list(prob)
-        self._orthogonal_profile = np.zeros((n_voters, self.n_dim))
-        self._random_profile = np.zeros((n_voters, self.n_dim))
-        self._thetas = np.zeros(n_voters)
         self._build_profiles()
 
     def _build_profiles(self):
@@ -152,17 +156,12 @@ class EmbeddingsGeneratorPolarized(EmbeddingsGenerator):
         EmbeddingsGeneratorPolarized
             The object itself.
         """
-
-        for i in range(self.n_voters):
-            new_vec = np.abs(np.random.randn(self.n_dim))
-            r = np.argmax(new_vec * self.prob)
-            new_vec = normalize(new_vec)
-            self._orthogonal_profile[i, r] = 1
-            self._random_profile[i] = new_vec
-
-            theta = np.arccos(np.dot(self._random_profile[i], self._orthogonal_profile[i]))
-            self._thetas[i] = theta
-
+        new_vecs = np.abs(self._random.standard_normal((self.n_voters, self.n_dim)))
+        groups = np.argmax(new_vecs * self.prob, axis=1)
+        self._orthogonal_profile = np.zeros((self.n_voters, self.n_dim))
+        self._orthogonal_profile[np.arange(self.n_voters), groups] = 1
+        self._random_profile = new_vecs / np.linalg.norm(new_vecs, axis=1)[:, np.newaxis]
+        self._thetas = np.arccos(self._random_profile[np.arange(self.n_voters), groups])
         return self
 
     def __call__(self, polarisation=0.0):
@@ -172,17 +171,23 @@ class EmbeddingsGeneratorPolarized(EmbeddingsGenerator):
 
         Parameters
         _________
-        polarisation : float
+        polarisation : float or np.ndarray
             Should be between `0` and `1`.
             If it is equal to `0`, then the
             embeddings are uniformly distributed.
             If it is equal to `1`, then each voter's
             embeddings align to the dimension of its group.
+            If it is an array of `P` polarisations, the
+            embeddings are created for each of them.
 
         Return
         ------
-        Embeddings
-            The embeddings generated
+        Embeddings or np.ndarray
+            The embeddings generated. For an array of polarisations, the
+            stack of the normalized embeddings, of shape ``P, n_voters, n_dim``.
+            It is a plain array, since :class:`Embeddings` holds the embeddings
+            of a single profile: each slice can be given to
+            ``Embeddings(stack[i], norm=False)`` without a copy.
 
         Examples
         --------
@@ -191,19 +196,24 @@ class EmbeddingsGeneratorPolarized(EmbeddingsGenerator):
         >>> embs = generator(.8)
         >>> embs.voter_embeddings(0)
         array([0.12915167, 0.03595039, 0.99097296])
+        >>> stack = generator(np.array([0, .8, 1]))
+        >>> stack.shape
+        (3, 100, 3)
+        >>> stack[1, 0]
+        array([0.12915167, 0.03595039, 0.99097296])
         """
-
-        if polarisation > 1 or polarisation < 0:
+        polarisations = np.asarray(polarisation, dtype=float)
+        if np.any(polarisations > 1) or np.any(polarisations < 0):
             raise ValueError("Polarisation should be between 0 and 1")
 
-        n = len(self._thetas)
-        positions = np.zeros((n, self.n_dim))
-        for i in range(n):
-            p_1 = np.dot(self._orthogonal_profile[i], self._random_profile[i]) * self._orthogonal_profile[i]
-            p_2 = self._random_profile[i] - p_1
-            e_2 = normalize(p_2)
-            positions[i] = self._orthogonal_profile[i] * np.cos(self._thetas[i] * (1 - polarisation)) + e_2 * np.sin(
-                self._thetas[i] * (1 - polarisation))
-
-        return Embeddings(positions)
-
+        # The unit vector orthogonal to the group axis, in the plane of the two profiles.
+        p_1 = self._orthogonal_profile * np.sum(
+            self._orthogonal_profile * self._random_profile, axis=1)[:, np.newaxis]
+        p_2 = self._random_profile - p_1
+        e_2 = p_2 / np.linalg.norm(p_2, axis=1)[:, np.newaxis]
+        angles = self._thetas * (1 - polarisations[..., np.newaxis])
+        positions = (self._orthogonal_profile * np.cos(angles)[..., np.newaxis]
+                     + e_2 * np.sin(angles)[..., np.newaxis])
+        if polarisations.ndim == 0:
+            return Embeddings(positions)
+        return positions / np.sqrt((positions ** 2).sum(axis=-1))[..., np.newaxis]
@@ -3,6 +3,7 @@ import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.pyplot import cm
 from embedded_voting.ratings.ratingsGenerator import RatingsGenerator
+from embedded_voting.utils.cached import cached_property
 
 
 class RatingsGeneratorEpistemic(RatingsGenerator):
@@ -22,22 +23,23 @@ class RatingsGeneratorEpistemic(RatingsGenerator):
     groups_sizes : list or np.ndarray
         The number of voters in each group.
         If set to None, then there are no "groups".
+    rng : None, int, np.random.SeedSequence or np.random.Generator
+        The source of random numbers. If None, the global random
+        state of numpy is used (cf. :class:`~embedded_voting.utils.rng.RandomMixin`).
 
     Attributes
     ----------
     n_groups : int
         The number of groups. If `groups_size` is None, then `n_groups` is None.
-    m_voter_group : np.ndarray
-        Incidence matrix between voters and groups: `m_voter_group[v, g]` is 1 if
-        and only if voter `v` is in group `g`, and 0 otherwise.
-        Size `n_voters` * `n_groups`.
-        If `groups_size` is None, then `m_voter_group` is None.
+    voter_group : np.ndarray
+        The index of the group of each voter. Size `n_voters`.
+        If `groups_size` is None, then `voter_group` is None.
     ground_truth_ : np.ndarray
         The ground truth ("true value") for each candidate, corresponding to the
         last ratings generated.
     """
 
-    def __init__(self, n_voters=None, minimum_value=10, maximum_value=20, groups_sizes=None):
+    def __init__(self, n_voters=None, minimum_value=10, maximum_value=20, groups_sizes=None, rng=None):
         if groups_sizes is not None:
             groups_sizes = np.array(groups_sizes)
             n_voters_computed = np.sum(groups_sizes)
@@ -45,23 +47,45 @@ class RatingsGeneratorEpistemic(RatingsGenerator):
                 raise ValueError('n_voters should be equal to the sum of groups_sizes.')
             n_voters = n_voters_computed
             self.n_groups = len(groups_sizes)
-            self.m_voter_group = np.vstack([
-                np.hstack((
-                    np.zeros((group_size, i_group)),
-                    np.ones((group_size, 1)),
-                    np.zeros((group_size, self.n_groups - i_group - 1))
-                ))
-                for i_group, group_size in enumerate(groups_sizes)
-            ])
+            self.voter_group = np.repeat(np.arange(self.n_groups), groups_sizes)
         else:
             self.n_groups = None
-            self.m_voter_group = None
-        super().__init__(n_voters)
+            self.voter_group = None
+        super().__init__(n_voters, rng=rng)
         self.minimum_value = minimum_value
         self.maximum_value = maximum_value
         self.groups_sizes = groups_sizes
         self.ground_truth_ = None
 
+    @cached_property
+    def m_voter_group(self):
+        """
+        Incidence matrix between voters and groups: `m_voter_group[v, g]` is 1 if
+        and only if voter `v` is in group `g`, and 0 otherwise.
+        Size `n_voters` * `n_groups`.
+        If `groups_size` is None, then `m_voter_group` is None.
+
+        It is only built on demand, since the generators
+        use :attr:`voter_group` instead.
+
+        Return
+        ------
+        np.ndarray
+            The incidence matrix between voters and groups.
+
+        Examples
+        --------
+        >>> RatingsGeneratorEpistemic(groups_sizes=[2, 1]).m_voter_group
+        array([[1., 0.],
+               [1., 0.],
+               [0., 1.]])
+        """
+        if self.voter_group is None:
+            return None
+        m_voter_group = np.zeros((self.n_voters, self.n_groups))
+        m_voter_group[np.arange(self.n_voters), self.voter_group] = 1
+        return m_voter_group
+
     def generate_true_values(self, n_candidates=1):
         """
         This function generate a true value for each alternative.
@@ -73,7 +97,7 @@ class RatingsGeneratorEpistemic(RatingsGenerator):
         """
         return (
             self.minimum_value
-            + np.random.rand(n_candidates) * (self.maximum_value - self.minimum_value)
+            + self._random.random(n_candidates) * (self.maximum_value - self.minimum_value)
         )
 
     def __call__(self, n_candidates=1, *args):
@@ -93,6 +117,49 @@ class RatingsGeneratorEpistemic(RatingsGenerator):
         """
         raise NotImplementedError
 
+    def iter_chunks(self, n_candidates, chunk_size):
+        """
+        This function generates the ground truth and the ratings of
+        `n_candidates` candidates by chunks of `chunk_size` candidates,
+        so that the ratings of all candidates are never held in memory at once.
+
+        Each chunk is generated by a call of the generator, so the random
+        numbers are drawn chunk after chunk: with the same seed, the chunks
+        are always the same. Since the candidates are independent, the
+        ratings have the same distribution as in a single call. After the
+        iteration, :attr:`ground_truth_` is the ground truth of the last chunk.
+
+        Parameters
+        ----------
+        n_candidates : int
+            The number of candidates of which we want the ratings.
+        chunk_size : int
+            The number of candidates in each chunk.
+
+        Return
+        ------
+        generator
+            For each chunk, the ground truth and the ratings of the candidates.
+
+        Examples
+        --------
+        >>> from embedded_voting.epistemicGenerators.ratings_generator_epistemic_grouped_noise import (
+        ...     RatingsGeneratorEpistemicGroupedNoise)
+        >>> from embedded_voting.scoring.singlewinner.trivialRules import SumScores
+        >>> np.random.seed(42)
+        >>> generator = RatingsGeneratorEpistemicGroupedNoise([2, 2])
+        >>> chunks = list(generator.iter_chunks(5, 2))
+        >>> [ratings.shape for _, ratings in chunks]
+        [(4, 2), (4, 2), (4, 1)]
+        >>> SumScores().stream_scores(ratings for _, ratings in chunks)
+        array([55.767..., 78.494..., 57.205..., 51.302..., 41.183...])
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size should be positive.")
+        for start in range(0, n_candidates, chunk_size):
+            ratings = self(min(chunk_size, n_candidates - start))
+            yield self.ground_truth_, ratings
+
     def plot_ratings(self, show=True):
         """
         This function plots the true value of a candidate and the ratings
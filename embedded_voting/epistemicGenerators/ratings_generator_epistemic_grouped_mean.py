@@ -38,6 +38,9 @@ class RatingsGeneratorEpistemicGroupedMean(RatingsGeneratorEpistemicGroupedMix):
     maximum_value : float or int
         The maximum true value of an alternative.
         By default, it is set to 20.
+    rng : None, int, np.random.SeedSequence or np.random.Generator
+        The source of random numbers. If None, the global random
+        state of numpy is used (cf. :class:`~embedded_voting.utils.rng.RandomMixin`).
 
     Attributes
     ----------
@@ -50,17 +53,17 @@ class RatingsGeneratorEpistemicGroupedMean(RatingsGeneratorEpistemicGroupedMix):
     >>> np.random.seed(44)
     >>> generator = RatingsGeneratorEpistemicGroupedMean([2, 2])
     >>> generator()
-    Ratings([[17.625...],
-             [17.625...],
-             [17.422...],
-             [17.422...]])
+    Ratings([[17.619...],
+             [17.619...],
+             [17.430...],
+             [17.430...]])
     >>> generator.ground_truth_
     array([18.348...])
     """
     def __init__(self, groups_sizes, group_noise=1, independent_noise=0, minimum_value=10,
-                 maximum_value=20):
+                 maximum_value=20, rng=None):
         n_groups = len(groups_sizes)
         group_features = np.eye(n_groups)
         super().__init__(groups_sizes=groups_sizes, groups_features=group_features,
                          group_noise=group_noise, independent_noise=independent_noise,
-                         minimum_value=minimum_value, maximum_value=maximum_value)
+                         minimum_value=minimum_value, maximum_value=maximum_value, rng=rng)
@@ -43,6 +43,9 @@ class RatingsGeneratorEpistemicGroupedMix(RatingsGeneratorEpistemic):
     maximum_value : float or int
         The maximum true value of an alternative.
         By default, it is set to 20.
+    rng : None, int, np.random.SeedSequence or np.random.Generator
+        The source of random numbers. If None, the global random
+        state of numpy is used (cf. :class:`~embedded_voting.utils.rng.RandomMixin`).
 
     Attributes
     ----------
@@ -69,17 +72,17 @@ class RatingsGeneratorEpistemicGroupedMix(RatingsGeneratorEpistemic):
     >>> features = [[1, 0, 1, 1], [0, 1, 0, 1], [1, 1, 0, 0]]
     >>> generator = RatingsGeneratorEpistemicGroupedMix([2, 2, 2], features)
     >>> generator()
-    Ratings([[13.20254261],
-             [13.20254261],
-             [13.32010606],
-             [13.32010606],
-             [13.27781234],
-             [13.27781234]])
+    Ratings([[13.13097862],
+             [13.13097862],
+             [13.13265144],
+             [13.13265144],
+             [13.29086017],
+             [13.29086017]])
     """
     def __init__(self, groups_sizes, groups_features, group_noise=1, independent_noise=0,
-                 minimum_value=10, maximum_value=20):
+                 minimum_value=10, maximum_value=20, rng=None):
         super().__init__(minimum_value=minimum_value, maximum_value=maximum_value,
-                         groups_sizes=groups_sizes)
+                         groups_sizes=groups_sizes, rng=rng)
         self.groups_features = np.array(groups_features)
         self.groups_features_normalized = (
             self.groups_features
@@ -91,19 +94,15 @@ class RatingsGeneratorEpistemicGroupedMix(RatingsGeneratorEpistemic):
 
     def __call__(self, n_candidates=1, *args):
         self.ground_truth_ = self.generate_true_values(n_candidates=n_candidates)
-        ratings = np.zeros((self.n_voters, n_candidates))
-        for i in range(n_candidates):
-            sigma_features = np.abs(
-                np.random.normal(loc=0, scale=self.group_noise, size=self.n_features)
-            )
-            noise_features = np.random.multivariate_normal(
-                mean=np.zeros(self.n_features), cov=np.diag(sigma_features))
-            v_noise_dependent = (
-                self.m_voter_group
-                @ self.groups_features_normalized
-                @ noise_features
-            )
-            v_noise_independent = np.random.normal(
-                loc=0, scale=self.independent_noise, size=self.n_voters)
-            ratings[:, i] = self.ground_truth_[i] + v_noise_dependent + v_noise_independent
+        sigma_features = np.abs(
+            self._random.normal(loc=0, scale=self.group_noise, size=(self.n_features, n_candidates))
+        )
+        noise_features = (
+            np.sqrt(sigma_features)
+            * self._random.standard_normal((self.n_features, n_candidates))
+        )
+        ratings = (self.groups_features_normalized @ noise_features)[self.voter_group]
+        if self.independent_noise:
+            ratings += self._random.normal(loc=0, scale=self.independent_noise, size=ratings.shape)
+        ratings += self.ground_truth_[np.newaxis, :]
         return Ratings(ratings)
@@ -30,6 +30,9 @@ class RatingsGeneratorEpistemicGroupedNoise(RatingsGeneratorEpistemic):
     maximum_value : float or int
         The maximum true value of an alternative.
         By default, it is set to 20.
+    rng : None, int, np.random.SeedSequence or np.random.Generator
+        The source of random numbers. If None, the global random
+        state of numpy is used (cf. :class:`~embedded_voting.utils.rng.RandomMixin`).
 
     Attributes
     ----------
@@ -49,18 +52,18 @@ class RatingsGeneratorEpistemicGroupedNoise(RatingsGeneratorEpistemic):
     >>> generator.ground_truth_
     array([13.7454...])
     """
-    def __init__(self, groups_sizes, group_noise=1, minimum_value=10, maximum_value=20):
+    def __init__(self, groups_sizes, group_noise=1, minimum_value=10, maximum_value=20, rng=None):
         super().__init__(minimum_value=minimum_value, maximum_value=maximum_value,
-                         groups_sizes=groups_sizes)
+                         groups_sizes=groups_sizes, rng=rng)
         self.group_noise = group_noise
 
     def __call__(self, n_candidates=1, *args):
         self.ground_truth_ = self.generate_true_values(n_candidates=n_candidates)
-        ratings = np.zeros((self.n_voters, n_candidates))
-        for i in range(n_candidates):
-            sigma_groups = np.abs(np.random.normal(loc=0, scale=self.group_noise, size=self.n_groups))
-            sigma_voters = self.m_voter_group @ sigma_groups
-            v_noise = np.random.multivariate_normal(
-                mean=np.zeros(self.n_voters), cov=np.diag(sigma_voters))
-            ratings[:, i] = self.ground_truth_[i] + v_noise
-        return Ratings(ratings)
+        # The noises are independent: each voter gets a standard normal
+        # noise scaled by the standard deviation of their group.
+        sigma_groups = np.abs(
+            self._random.normal(loc=0, scale=self.group_noise, size=(self.n_groups, n_candidates))
+        )
+        sigma_voters = np.sqrt(sigma_groups)[self.voter_group]
+        v_noise = sigma_voters * self._random.standard_normal((self.n_voters, n_candidates))
+        return Ratings(self.ground_truth_[np.newaxis, :] + v_noise)
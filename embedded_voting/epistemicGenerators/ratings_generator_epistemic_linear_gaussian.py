@@ -22,6 +22,9 @@ class RatingsGeneratorEpistemicLinearGaussian(RatingsGeneratorEpistemic):
     maximum_value : float or int
         The maximum true value of an alternative.
         By default, it is set to 20.
+    rng : None, int, np.random.SeedSequence or np.random.Generator
+        The source of random numbers. If None, the global random
+        state of numpy is used (cf. :class:`~embedded_voting.utils.rng.RandomMixin`).
 
     Attributes
     ----------
@@ -46,18 +49,19 @@ class RatingsGeneratorEpistemicLinearGaussian(RatingsGeneratorEpistemic):
     array([16.118..., 11.394...])
     """
 
-    def __init__(self, m_voters_noises, minimum_value=10, maximum_value=20):
+    def __init__(self, m_voters_noises, minimum_value=10, maximum_value=20, rng=None):
         self.m_voters_noises = np.array(m_voters_noises)
         self.n_voters, self.n_noises = m_voters_noises.shape
         super().__init__(
             n_voters=self.n_voters,
             minimum_value=minimum_value,
-            maximum_value=maximum_value
+            maximum_value=maximum_value,
+            rng=rng
         )
 
     def __call__(self, n_candidates=1, *args):
         self.ground_truth_ = self.generate_true_values(n_candidates=n_candidates)
-        m_noises_candidates = np.random.randn(self.n_noises, n_candidates)
+        m_noises_candidates = self._random.standard_normal((self.n_noises, n_candidates))
         return Ratings(
             self.ground_truth_[np.newaxis, :]
             + self.m_voters_noises @ m_noises_candidates
@@ -2,9 +2,10 @@ from embedded_voting.epistemicGenerators.ratings_generator_epistemic \
     import RatingsGeneratorEpistemic
 import numpy as np
 from embedded_voting.ratings.ratings import Ratings
+from embedded_voting.utils.cached import DeleteCacheMixin, cached_property
 
 
-class RatingsGeneratorEpistemicMultivariate(RatingsGeneratorEpistemic):
+class RatingsGeneratorEpistemicMultivariate(DeleteCacheMixin, RatingsGeneratorEpistemic):
     """
     A generator of ratings based on a covariance matrix.
 
@@ -22,6 +23,12 @@ class RatingsGeneratorEpistemicMultivariate(RatingsGeneratorEpistemic):
     maximum_value : float or int
         The maximum true value of an alternative.
         By default, it is set to 20.
+    chunk_size : int
+        The maximal number of candidates whose noise is drawn at once.
+        By default, the noise of all candidates is drawn at once.
+    rng : None, int, np.random.SeedSequence or np.random.Generator
+        The source of random numbers. If None, the global random
+        state of numpy is used (cf. :class:`~embedded_voting.utils.rng.RandomMixin`).
 
     Attributes
     ----------
@@ -34,35 +41,84 @@ class RatingsGeneratorEpistemicMultivariate(RatingsGeneratorEpistemic):
     >>> np.random.seed(42)
     >>> generator = RatingsGeneratorEpistemicMultivariate(np.ones((5, 5)))
     >>> generator()
-    Ratings([[14.857...],
-             [14.857...],
-             [14.857...],
-             [14.857...],
-             [14.857...]])
+    Ratings([[14.326...],
+             [14.326...],
+             [14.326...],
+             [14.326...],
+             [14.326...]])
     >>> generator.independent_noise = 0.5
     >>> generator()
-    Ratings([[13.812...],
-             [13.958...],
-             [13.212...],
-             [13.652...],
-             [13.980...]])
+    Ratings([[11.889...],
+             [12.553...],
+             [11.942...],
+             [11.690...],
+             [13.129...]])
 
     """
 
-    def __init__(self, covariance_matrix, independent_noise=0, minimum_value=10, maximum_value=20):
+    def __init__(self, covariance_matrix, independent_noise=0, minimum_value=10, maximum_value=20,
+                 chunk_size=None, rng=None):
         n_voters = len(covariance_matrix)
         super().__init__(n_voters=n_voters, minimum_value=minimum_value,
-                         maximum_value=maximum_value)
+                         maximum_value=maximum_value, rng=rng)
         self.covariance_matrix = covariance_matrix
         self.independent_noise = independent_noise
+        self.chunk_size = chunk_size
+
+    @property
+    def covariance_matrix(self):
+        """
+        The covariance matrix of the voters. Setting a new
+        matrix deletes the cached factor :attr:`factor_`.
+        """
+        return self._covariance_matrix
+
+    @covariance_matrix.setter
+    def covariance_matrix(self, covariance_matrix):
+        self._covariance_matrix = np.asarray(covariance_matrix, dtype=float)
+        self.delete_cache()
+
+    @cached_property
+    def factor_(self):
+        """
+        A matrix `L` such that `L @ L.T` is the covariance matrix. It is the
+        Cholesky factor if the covariance matrix is positive definite, and
+        is obtained from its eigendecomposition if it is only positive
+        semi-definite.
+
+        Return
+        ------
+        np.ndarray
+            The factor of the covariance matrix. Of shape
+            :attr:`~embedded_voting.RatingsGenerator.n_voters`,
+            :attr:`~embedded_voting.RatingsGenerator.n_voters`.
+
+        Examples
+        --------
+        >>> generator = RatingsGeneratorEpistemicMultivariate([[4, 2], [2, 5]])
+        >>> generator.factor_
+        array([[2., 0.],
+               [1., 2.]])
+        >>> generator.covariance_matrix = np.ones((2, 2))
+        >>> generator.factor_ @ generator.factor_.T
+        array([[1., 1.],
+               [1., 1.]])
+        """
+        try:
+            return np.linalg.cholesky(self.covariance_matrix)
+        except np.linalg.LinAlgError:
+            eigenvalues, eigenvectors = np.linalg.eigh(self.covariance_matrix)
+            return eigenvectors * np.sqrt(np.maximum(eigenvalues, 0))
 
     def __call__(self, n_candidates=1, *args):
         self.ground_truth_ = self.generate_true_values(n_candidates=n_candidates)
-        ratings = np.zeros((self.n_voters, n_candidates))
-        for i in range(n_candidates):
-            v_dependent_noise = np.random.multivariate_normal(
-                mean=np.zeros(self.n_voters), cov=self.covariance_matrix)
-            v_independent_noise = np.random.normal(
-                loc=0, scale=self.independent_noise, size=self.n_voters)
-            ratings[:, i] = self.ground_truth_[i] + v_dependent_noise + v_independent_noise
-        return Ratings(ratings)
+        ratings = np.empty((n_candidates, self.n_voters))
+        chunk_size = max(n_candidates if self.chunk_size is None else self.chunk_size, 1)
+        for start in range(0, n_candidates, chunk_size):
+            stop = min(start + chunk_size, n_candidates)
+            noise = self._random.standard_normal((stop - start, self.n_voters))
+            np.matmul(noise, self.factor_.T, out=ratings[start:stop])
+        if self.independent_noise:
+            ratings += self._random.normal(loc=0, scale=self.independent_noise, size=ratings.shape)
+        ratings += self.ground_truth_[:, np.newaxis]
+        return Ratings(ratings.T)
@@ -1 +1,2 @@
 from embedded_voting.experiments.online import OnlineLearning
+from embedded_voting.experiments.store import ExperimentStore
@@ -1,45 +1,156 @@
 import numpy as np
-from embedded_voting.ratings.ratings import Ratings
-from embedded_voting.scoring.singlewinner.trivialRules import SumScores
 from tqdm import tqdm
 import matplotlib.pyplot as plt
+from embedded_voting.experiments.store import run_tasks
 
 
 class OnlineLearning:
+    """
+    This class compares several aggregators on epistemic ratings,
+    when the aggregators learn the embeddings of the voters from
+    the elections they have already seen.
+
+    Parameters
+    ----------
+    list_agg : list
+        The list of :class:`Aggregator` to compare.
+    generator : RatingsGeneratorEpistemic
+        The generator of the ratings and of the ground truth.
+
+    Attributes
+    ----------
+    results_ : np.ndarray
+        The average welfare of the winner of each aggregator at each step.
+        Of shape ``n_agg, n_steps``.
+    results_full_ : np.ndarray
+        The welfare of the winner of each aggregator at each step of each try.
+        Of shape ``n_try, n_agg, n_steps``.
+    winners_ : np.ndarray
+        The winner chosen by each aggregator at each step of each try.
+        Of shape ``n_try, n_agg, n_steps``.
+
+    Examples
+    --------
+    >>> from embedded_voting.aggregation.particular import AggregatorSum, AggregatorMLEGaussian
+    >>> from embedded_voting.epistemicGenerators import RatingsGeneratorEpistemicGroupedMean
+    >>> np.random.seed(42)
+    >>> generator = RatingsGeneratorEpistemicGroupedMean([3, 3])
+    >>> experiment = OnlineLearning([AggregatorSum(), AggregatorMLEGaussian()], generator)
+    >>> experiment(n_candidates=5, n_steps=3, n_try=2)
+    >>> experiment.results_full_.shape
+    (2, 2, 3)
+    >>> experiment.winners_.shape
+    (2, 2, 3)
+    >>> np.allclose(experiment.results_, experiment.results_full_.mean(axis=0))
+    True
+    """
 
     def __init__(self, list_agg, generator=None):
         self.list_agg = list_agg
         self.generator = generator
 
+    @staticmethod
+    def _welfare(truth):
+        """
+        This function computes the welfare of the candidates
+        from their true values, i.e. the true values normalized
+        between `0` and `1`.
+
+        Parameters
+        ----------
+        truth : np.ndarray
+            The true value of each candidate.
+
+        Return
+        ------
+        np.ndarray
+            The welfare of each candidate.
+
+        Examples
+        --------
+        >>> OnlineLearning._welfare(np.array([12., 20., 10.]))
+        array([0.2, 1. , 0. ])
+        """
+        min_truth = truth.min()
+        delta = truth.max() - min_truth
+        if delta == 0:
+            return np.ones(len(truth))
+        return (truth - min_truth) / delta
+
     def _run(self, n_candidates=20, n_steps=10):
+        """
+        This function runs one try of the experiment.
 
-        results = []
+        Return
+        ------
+        np.ndarray
+            The welfare of the winner of each aggregator at each step.
+            Of shape ``n_agg, n_steps``.
+        np.ndarray
+            The winner of each aggregator at each step.
+            Of shape ``n_agg, n_steps``.
+        """
+        n_agg = len(self.list_agg)
+        welfare = np.zeros((n_agg, n_steps))
+        winners = np.zeros((n_agg, n_steps), dtype=int)
         for agg in self.list_agg:
             agg.reset()
 
         for i in range(n_steps):
-            ratings = self.generator(n_candidates)
-            truth = self.generator.ground_truth_
-            ratings = np.maximum(ratings, 0)
-
-            # We get the real welfare of each candidate using a SumScoresProfile
-            welfare = SumScores()(Ratings([truth])).welfare_
-
-            results_i = []
-            for agg in self.list_agg:
-                w = agg(ratings).winner_
-                results_i.append(welfare[w])
-            results.append(results_i)
-        return np.array(results).T
-
-    def __call__(self, n_candidates=20, n_steps=10, n_try=100):
-        results = np.zeros((len(self.list_agg), n_steps))
+            ratings = np.maximum(self.generator(n_candidates), 0)
+            welfare_candidates = self._welfare(self.generator.ground_truth_)
+            for k, agg in enumerate(self.list_agg):
+                winners[k, i] = agg(ratings).winner_
+            welfare[:, i] = welfare_candidates[winners[:, i]]
+        return welfare, winners
+
+    def __call__(self, n_candidates=20, n_steps=10, n_try=100, store=None, checkpoint_every=1):
+        """
+        This function runs the experiment.
+
+        Parameters
+        ----------
+        n_candidates : int
+            The number of candidates in each election.
+        n_steps : int
+            The number of elections in each try.
+        n_try : int
+            The number of tries. The results are averaged over the tries.
+        store : ExperimentStore
+            If not None, the completed tries are written in this store,
+            and the tries already in the store are not run again. The
+            aggregators, the generator, :attr:`n_candidates` and
+            :attr:`n_steps` are recorded in the store, and a ValueError
+            is raised if it contains the results of another experiment.
+        checkpoint_every : int
+            The number of completed tries written at once in the store.
+        """
+        n_agg = len(self.list_agg)
         self.labels_ = [n_candidates*(i+1) for i in range(n_steps)]
+        self.results_full_ = np.zeros((n_try, n_agg, n_steps))
+        self.winners_ = np.zeros((n_try, n_agg, n_steps), dtype=int)
+
+        def run(t):
+            welfare, winners = self._run(n_candidates, n_steps)
+            return {"welfare": welfare, "winners": winners}
+
+        # The aggregators are reset, so that their parameters do not include what they learned.
+        for agg in self.list_agg:
+            agg.reset()
+        parameters = {"experiment": type(self), "list_agg": self.list_agg, "generator": self.generator,
+                      "n_candidates": n_candidates, "n_steps": n_steps}
+
+        progress = tqdm(total=n_try)
+        tasks = {"try_%i" % t: (t,) for t in range(n_try)}
+        results = run_tasks(run, tasks, store=store, checkpoint_every=checkpoint_every,
+                            callback=lambda key, result: progress.update(), parameters=parameters)
+        progress.close()
 
-        for _ in tqdm(range(n_try)):
-            results += self._run(n_candidates, n_steps)
+        for t in range(n_try):
+            self.results_full_[t] = results["try_%i" % t]["welfare"]
+            self.winners_[t] = results["try_%i" % t]["winners"]
 
-        self.results_ = results / n_try
+        self.results_ = self.results_full_.mean(axis=0)
 
     def plot(self, show=True):
         rules_names = [agg.name for agg in self.list_agg]
@@ -0,0 +1,462 @@
+# -*- coding: utf-8 -*-
+"""
+Copyright Théo Delemazure
+theo.delemazure@ens.fr
+
+This file is part of Embedded Voting.
+"""
+import os
+import json
+import uuid
+import hashlib
+import inspect
+import multiprocessing
+import numpy as np
+
+
+def _describe(value, ancestors=()):
+    """
+    Return a description of a parameter of an experiment which can be
+    written in JSON and which does not depend on the process: arrays
+    are described by a hash of their content, functions and classes by
+    their name, and other objects by their class and their attributes
+    named after the parameters of their constructor, so that what
+    they computed is not included.
+
+    Parameters
+    ----------
+    value : object
+        The parameter to describe.
+    ancestors : tuple
+        The ids of the objects being described, to avoid cycles.
+
+    Return
+    ------
+    object
+        The description of the parameter.
+
+    Examples
+    --------
+    >>> _describe({"size": 3, "matrix": np.eye(2), "rule": np.max})
+    {'size': 3, 'matrix': {'sha1': '...', 'shape': [2, 2], 'dtype': 'float64'}, 'rule': 'numpy.max'}
+    """
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        if value.dtype != object:
+            return {"sha1": hashlib.sha1(np.ascontiguousarray(value).tobytes()).hexdigest(),
+                    "shape": list(value.shape), "dtype": str(value.dtype)}
+        value = value.tolist()
+    if isinstance(value, (list, tuple)):
+        return [_describe(item, ancestors) for item in value]
+    if isinstance(value, dict):
+        return {str(key): _describe(item, ancestors) for key, item in value.items()}
+    if isinstance(value, type) or inspect.isroutine(value):
+        return "%s.%s" % (getattr(value, "__module__", None), getattr(value, "__qualname__", repr(value)))
+    name = "%s.%s" % (type(value).__module__, type(value).__qualname__)
+    if id(value) in ancestors or not hasattr(value, "__dict__"):
+        return name
+    ancestors = ancestors + (id(value),)
+    names = set()
+    for cls in type(value).__mro__:
+        if inspect.isfunction(cls.__dict__.get("__init__")):
+            names.update(inspect.signature(cls.__init__).parameters)
+    return {"class": name,
+            "attributes": {key: _describe(item, ancestors) for key, item in sorted(vars(value).items())
+                           if key in names}}
+
+
+class ExperimentStore:
+    """
+    An on-disk store for the results of long experiments.
+
+    Each unit of work (a try of an :class:`OnlineLearning` experiment,
+    a cell of a manipulation map, etc.) is identified by a string key,
+    and its result is a dictionary of arrays. The results are written
+    in ``.npz`` shards in the directory :attr:`path`, and the file
+    ``manifest.json`` lists the keys stored in each shard.
+
+    Several processes can write in the same store: each shard is written
+    atomically under a unique name, and the manifest is rebuilt from the
+    shards present in the directory every time a shard is written.
+
+    A store should only be used for one experiment, since keys are not
+    namespaced. The parameters of the experiment can be recorded in the
+    manifest with :meth:`set_parameters`, so that the results of an
+    experiment are never resumed with other parameters.
+
+    Parameters
+    ----------
+    path : str
+        The directory of the store. It is created if it does not exist.
+
+    Attributes
+    ----------
+    path : str
+        The directory of the store.
+
+    Examples
+    --------
+    >>> import tempfile
+    >>> store = ExperimentStore(tempfile.mkdtemp())
+    >>> store.save({"try_0": {"welfare": np.array([1., .5])}})
+    >>> store.save({"try_1": {"welfare": np.array([.8, 1.])}})
+    >>> sorted(store.keys())
+    ['try_0', 'try_1']
+    >>> store.load()["try_1"]["welfare"]
+    array([0.8, 1. ])
+    >>> store.merge()
+    >>> len(store.manifest())
+    1
+    >>> fingerprint = store.set_parameters({"n_try": 2, "seed": 42})
+    >>> store.parameters()["seed"]
+    42
+    >>> store.set_parameters({"n_try": 2, "seed": 43})
+    Traceback (most recent call last):
+    ...
+    ValueError: The store contains the results of an experiment with other parameters.
+    """
+
+    _manifest_name = "manifest.json"
+    _parameters_name = "parameters"
+    _separator = "/"
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+
+    def _shards(self):
+        """
+        Return the names of the shards currently in the store.
+
+        Return
+        ------
+        str list
+            The names of the shards, sorted by name.
+        """
+        return sorted(name for name in os.listdir(self.path)
+                      if name.startswith("shard-") and name.endswith(".npz"))
+
+    def _shard_keys(self, shard):
+        """
+        Return the keys stored in a shard.
+
+        Parameters
+        ----------
+        shard : str
+            The name of the shard.
+
+        Return
+        ------
+        str list
+            The keys stored in the shard.
+        """
+        with np.load(os.path.join(self.path, shard)) as data:
+            keys = [name.split(self._separator, 1)[0] for name in data.files]
+        return sorted(set(keys))
+
+    def _write_atomic(self, name, write):
+        """
+        Write a file of the store atomically, by writing
+        a temporary file which is then renamed.
+
+        Parameters
+        ----------
+        name : str
+            The name of the file.
+        write : callable
+            The function writing the content in a file object opened in binary mode.
+        """
+        tmp_path = os.path.join(self.path, ".%s.%s.tmp" % (name, uuid.uuid4().hex))
+        with open(tmp_path, "wb") as f:
+            write(f)
+        os.replace(tmp_path, os.path.join(self.path, name))
+
+    def _read_manifest(self):
+        """
+        Read the manifest file of the store.
+
+        Return
+        ------
+        dict
+            The content of the manifest file, or an
+            empty dictionary if it does not exist yet.
+        """
+        try:
+            with open(os.path.join(self.path, self._manifest_name)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return dict()
+
+    def manifest(self):
+        """
+        Return the manifest of the store, i.e. the keys stored in each shard.
+        Shards that are missing from the manifest file (for instance because
+        they were written concurrently by another process) are read directly.
+
+        Return
+        ------
+        dict
+            The list of keys stored in each shard.
+        """
+        manifest_file = self._read_manifest()
+        manifest = dict()
+        for shard in self._shards():
+            if shard in manifest_file:
+                manifest[shard] = manifest_file[shard]
+            else:
+                manifest[shard] = self._shard_keys(shard)
+        return manifest
+
+    def _update_manifest(self, parameters=None):
+        manifest = self.manifest()
+        if parameters is None:
+            parameters = self.parameters()
+        if len(parameters) > 0:
+            manifest[self._parameters_name] = parameters
+        self._write_atomic(self._manifest_name, lambda f: f.write(json.dumps(manifest, indent=1).encode()))
+
+    def parameters(self):
+        """
+        Return the parameters of the experiment recorded
+        in the manifest (cf. :meth:`set_parameters`).
+
+        Return
+        ------
+        dict
+            The description of the parameters, or an
+            empty dictionary if none are recorded.
+        """
+        return self._read_manifest().get(self._parameters_name, dict())
+
+    def set_parameters(self, parameters):
+        """
+        Record the parameters of the experiment in the manifest, or check
+        that they are the ones already recorded. Arrays are recorded by a
+        hash of their content, and objects by their class and the attributes
+        named after the parameters of their constructor.
+
+        Parameters
+        ----------
+        parameters : dict
+            The parameters of the experiment.
+
+        Return
+        ------
+        str
+            The fingerprint of the parameters.
+
+        Raises
+        ------
+        ValueError
+            If other parameters are already recorded in the store.
+        """
+        description = json.loads(json.dumps(_describe(parameters)))
+        recorded = self.parameters()
+        if len(recorded) == 0:
+            self._update_manifest(description)
+        elif recorded != description:
+            raise ValueError("The store contains the results of an experiment with other parameters.")
+        return hashlib.sha1(json.dumps(description, sort_keys=True).encode()).hexdigest()[:12]
+
+    def keys(self):
+        """
+        Return the keys of the results already stored.
+
+        Return
+        ------
+        set
+            The keys stored in the store.
+        """
+        return {key for keys in self.manifest().values() for key in keys}
+
+    def load(self):
+        """
+        Load all the results of the store.
+
+        Return
+        ------
+        dict
+            For each key, the dictionary of arrays stored.
+        """
+        results = dict()
+        for shard in self._shards():
+            with np.load(os.path.join(self.path, shard)) as data:
+                for name in data.files:
+                    key, field = name.split(self._separator, 1)
+                    results.setdefault(key, dict())[field] = data[name]
+        return results
+
+    def save(self, records):
+        """
+        Write some results in a new shard.
+
+        Parameters
+        ----------
+        records : dict
+            For each key, a dictionary of arrays (or floats).
+        """
+        if len(records) == 0:
+            return
+        arrays = {key + self._separator + field: value
+                  for key, record in records.items() for field, value in record.items()}
+        shard = "shard-%s.npz" % uuid.uuid4().hex
+        self._write_atomic(shard, lambda f: np.savez(f, **arrays))
+        self._update_manifest()
+
+    def merge(self):
+        """
+        Merge all the shards of the store into a single one.
+        This is useful when several processes wrote in the store.
+        """
+        shards = self._shards()
+        if len(shards) <= 1:
+            return
+        results = self.load()
+        arrays = {key + self._separator + field: value
+                  for key, record in results.items() for field, value in record.items()}
+        self._write_atomic("shard-%s.npz" % uuid.uuid4().hex, lambda f: np.savez(f, **arrays))
+        for shard in shards:
+            os.remove(os.path.join(self.path, shard))
+        self._update_manifest()
+
+
+_shared = None
+
+
+def _init_worker(shared):
+    """
+    Initializer of the worker processes of :func:`run_tasks`.
+    """
+    global _shared
+    _shared = shared
+
+
+def _run_task(item):
+    """
+    Run a task in a worker process of :func:`run_tasks`.
+    """
+    function, key, args = item
+    if _shared is None:
+        return key, function(*args)
+    return key, function(_shared, *args)
+
+
+def worker_pool(n_jobs, shared=None):
+    """
+    Create a pool of worker processes for :func:`run_tasks`. This is
+    useful to run several batches of tasks with the same pool.
+
+    Parameters
+    ----------
+    n_jobs : int
+        The number of worker processes.
+    shared : object
+        Read-only data used by every task. It is sent only once
+        to each worker process.
+
+    Return
+    ------
+    multiprocessing.pool.Pool
+        The pool of worker processes.
+    """
+    return multiprocessing.Pool(n_jobs, initializer=_init_worker, initargs=(shared,))
+
+
+def run_tasks(function, tasks, store=None, checkpoint_every=1, callback=None, n_jobs=None, shared=None,
+              pool=None, parameters=None):
+    """
+    Run a function on a collection of independent tasks,
+    skipping the tasks whose result is already in the store
+    and checkpointing the new results regularly.
+
+    Parameters
+    ----------
+    function : callable
+        The function computing a task. It takes the arguments
+        of the task and returns a dictionary of arrays (or floats).
+        If :attr:`shared` is not None, it is given as first argument.
+    tasks : dict
+        For each key, the tuple of arguments of the task.
+    store : ExperimentStore
+        The store in which the results are written. If None,
+        the results are only kept in memory.
+    checkpoint_every : int
+        The number of new results written at once in the store.
+    callback : callable
+        If not None, it is called with the key and the result of
+        each task, as soon as the result is available.
+    n_jobs : int
+        The number of worker processes. If None, the tasks are run
+        in the current process. Otherwise, :attr:`function` must
+        be defined at the top level of a module.
+    shared : object
+        Read-only data used by every task. It is sent only once
+        to each worker process.
+    pool : multiprocessing.pool.Pool
+        A pool created by :func:`worker_pool`, used instead of creating
+        a new one. In that case, :attr:`n_jobs` and :attr:`shared` are
+        ignored, since the shared data is the one given to the pool.
+    parameters : dict
+        The parameters of the experiment. If not None, they are recorded
+        in the store (cf. :meth:`ExperimentStore.set_parameters`), and the
+        keys written in the store are prefixed by their fingerprint.
+
+    Return
+    ------
+    dict
+        The result of each task.
+
+    Examples
+    --------
+    >>> import tempfile
+    >>> store = ExperimentStore(tempfile.mkdtemp())
+    >>> results = run_tasks(lambda x: {"square": x ** 2}, {"a": (2,), "b": (3,)}, store=store)
+    >>> results["b"]["square"]
+    9
+    >>> results = run_tasks(lambda x: {"square": 0}, {"a": (2,), "c": (4,)}, store=store)
+    >>> int(results["a"]["square"]), results["c"]["square"]
+    (4, 0)
+    """
+    results = dict()
+    prefix = ""
+    if store is not None:
+        if parameters is not None:
+            prefix = store.set_parameters(parameters) + "_"
+        done = store.load()
+        for key in tasks:
+            if prefix + key in done:
+                results[key] = done[prefix + key]
+                if callback is not None:
+                    callback(key, results[key])
+
+    todo = [(key, args) for key, args in tasks.items() if key not in results]
+    own_pool = None
+    if pool is None and n_jobs is not None:
+        pool = own_pool = worker_pool(n_jobs, shared)
+    if pool is not None:
+        outputs = pool.imap_unordered(_run_task, [(function, key, args) for key, args in todo])
+    elif shared is None:
+        outputs = ((key, function(*args)) for key, args in todo)
+    else:
+        outputs = ((key, function(shared, *args)) for key, args in todo)
+
+    pending = dict()
+    try:
+        for key, result in outputs:
+            results[key] = result
+            if callback is not None:
+                callback(key, result)
+            if store is not None:
+                pending[prefix + key] = result
+                if len(pending) >= checkpoint_every:
+                    store.save(pending)
+                    pending = dict()
+    finally:
+        if own_pool is not None:
+            own_pool.terminate()
+        if store is not None:
+            store.save(pending)
+    return results
@@ -1,4 +1,5 @@
 
+import copy
 import numpy as np
 from embedded_voting.utils.cached import DeleteCacheMixin, cached_property
 from embedded_voting.scoring.singlewinner.svd import SVDNash
@@ -8,6 +9,8 @@ from embedded_voting.embeddings.generator import EmbeddingsGeneratorPolarized
 from embedded_voting.ratings.ratingsFromEmbeddings import RatingsFromEmbeddingsCorrelated
 from embedded_voting.ratings.ratings import Ratings
 from embedded_voting.embeddings.embeddings import Embeddings
+from embedded_voting.experiments.store import run_tasks
+from embedded_voting.manipulation.maps import MapProfiles
 
 
 class ManipulationCoalition(DeleteCacheMixin):
@@ -123,33 +126,109 @@ class ManipulationCoalition(DeleteCacheMixin):
         >>> ratings = RatingsFromEmbeddingsCorrelated(3, 3, scores_matrix)(embeddings, .8)
         >>> manipulation = ManipulationCoalition(ratings, embeddings, SVDNash())
         >>> manipulation.trivial_manipulation(0, verbose=True)
-        2 voters interested to elect 0 instead of 1
+        4 voters interested to elect 0 instead of 1
         Winner is 0
         True
         """
 
-        voters_interested = []
-        for i in range(self.ratings.shape[1]):
-            score_i = self.ratings[i]
-            if score_i[self.winner_] < score_i[candidate]:
-                voters_interested.append(i)
-
+        n_interested = np.sum(self.ratings[:, candidate] > self.ratings[:, self.winner_])
         if verbose:
             print("%i voters interested to elect %i instead of %i" %
-                  (len(voters_interested), candidate, self.winner_))
-
-        profile = self.ratings.copy()
-        for i in voters_interested:
-            profile[i] = np.zeros(self.ratings.shape[1])
-            profile[i][candidate] = 1
+                  (n_interested, candidate, self.winner_))
 
-        new_winner = self.rule(profile, self.embeddings).winner_
+        new_winner = self._trivial_winners([candidate])[0]
 
         if verbose:
             print("Winner is %i" % new_winner)
 
         return new_winner == candidate
 
+    def _trivial_profiles(self, candidates):
+        """
+        This function creates the profiles of the
+        trivial manipulations for several candidates:
+        in the profile of candidate `c`, every voter who
+        prefers `c` to the winner gives `1` to `c` and `0`
+        to every other candidate.
+
+        Parameters
+        ----------
+        candidates : int list
+            The candidates for which we manipulate.
+
+        Return
+        ------
+        np.ndarray
+            The manipulated ratings for each candidate.
+            Of shape ``len(candidates), n_voters, n_candidates``.
+        """
+        ratings = np.array(self.ratings)
+        interested = ratings[:, candidates] > ratings[:, [self.winner_]]
+        ballots = np.eye(self.ratings.n_candidates)[candidates]
+        return np.where(interested.T[:, :, np.newaxis], ballots[:, np.newaxis, :], ratings)
+
+    def _trivial_winners(self, candidates):
+        """
+        This function computes the winners of the
+        trivial manipulations for several candidates,
+        by scoring all the manipulated profiles at once.
+
+        Parameters
+        ----------
+        candidates : int list
+            The candidates for which we manipulate.
+
+        Return
+        ------
+        np.ndarray
+            The winner of the trivial manipulation for each candidate.
+        """
+        profiles = self._trivial_profiles(candidates)
+        rows = np.flatnonzero(np.any(profiles != np.array(self.ratings), axis=(0, 2)))
+        return self._baseline_.modified_winners(rows, profiles[:, rows])
+
+    @cached_property
+    def _baseline_(self):
+        """
+        A copy of the rule, run once on the current profile.
+        The manipulated profiles are scored from it with
+        :meth:`~embedded_voting.ScoringRule.modified_winners`.
+
+        Return
+        ------
+        ScoringRule
+            The rule run on :attr:`ratings`.
+        """
+        return copy.copy(self.rule)(self.ratings, self.embeddings)
+
+    @cached_property
+    def trivial_winners_(self):
+        """
+        The winner of the trivial manipulation
+        for every candidate. For the winner
+        of the election, it is the winner itself.
+
+        Return
+        ------
+        np.ndarray
+            The winner of the trivial manipulation for each candidate.
+
+        Examples
+        --------
+        >>> np.random.seed(42)
+        >>> scores_matrix = [[1, .2, 0], [.5, .6, .9], [.1, .8, .3]]
+        >>> embeddings = EmbeddingsGeneratorPolarized(10, 3)(.8)
+        >>> ratings = RatingsFromEmbeddingsCorrelated(3, 3, scores_matrix)(embeddings, .8)
+        >>> manipulation = ManipulationCoalition(ratings, embeddings, SVDNash())
+        >>> manipulation.trivial_winners_
+        array([0, 1, 2])
+        """
+        candidates = [c for c in range(self.ratings.n_candidates) if c != self.winner_]
+        trivial_winners = np.full(self.ratings.n_candidates, self.winner_)
+        if len(candidates) > 0:
+            trivial_winners[candidates] = self._trivial_winners(candidates)
+        return trivial_winners
+
     @cached_property
     def is_manipulable_(self):
         """
@@ -172,13 +251,8 @@ class ManipulationCoalition(DeleteCacheMixin):
         >>> manipulation.is_manipulable_
         True
         """
-
-        for i in range(self.ratings.n_candidates):
-            if i == self.winner_:
-                continue
-            if self.trivial_manipulation(i):
-                return True
-        return False
+        candidates = np.arange(self.ratings.n_candidates)
+        return bool(np.any((self.trivial_winners_ == candidates) & (candidates != self.winner_)))
 
     @cached_property
     def worst_welfare_(self):
@@ -201,20 +275,23 @@ class ManipulationCoalition(DeleteCacheMixin):
         >>> manipulation.worst_welfare_
         0.0
         """
-        worst_welfare = self.welfare_[self.winner_]
-        for i in range(self.ratings.n_candidates):
-            if i == self.winner_:
-                continue
-            if self.trivial_manipulation(i):
-                worst_welfare = min(worst_welfare, self.welfare_[i])
-        return worst_welfare
-
-    def manipulation_map(self, map_size=20, scores_matrix=None, show=True):
+        manipulable = np.flatnonzero(self.trivial_winners_ == np.arange(self.ratings.n_candidates))
+        return min(self.welfare_[c] for c in manipulable)
+
+    def manipulation_map(self, map_size=20, scores_matrix=None, show=True, store=None, checkpoint_every=10,
+                         n_jobs=None, seed=None, callback=None):
         """
         A function to plot the manipulability
         of the ratings when the
         ``polarisation`` and the ``coherence`` vary.
 
+        Each cell of the map has its own random seed (cf. :class:`MapProfiles`).
+        The cells can be computed by a pool of processes (in that case,
+        the rule must be picklable). In each cell, the profile is generated
+        once and the candidates are tested by increasing welfare: the cell
+        is complete as soon as a trivial manipulation is found, since the
+        other candidates cannot lower the worst welfare.
+
         Parameters
         ----------
         map_size : int
@@ -232,6 +309,25 @@ class ManipulationCoalition(DeleteCacheMixin):
         show : bool
             If True, displays the manipulation
             maps at the end of the function.
+        store : ExperimentStore
+            If not None, the completed cells of the maps are written
+            in this store, and the cells already in the store are not
+            computed again. The parameters of the map are recorded in
+            the store, and a ValueError is raised if it contains the
+            results of another map.
+        checkpoint_every : int
+            The number of completed cells written at once in the store.
+        n_jobs : int
+            The number of worker processes.
+            If None, the map is computed in the current process.
+        seed : int
+            The seed of the random profiles of the map. If None, the seed
+            recorded in the :attr:`store` is used, or it is drawn from the
+            global random state of numpy.
+        callback : callable
+            If not None, it is called with the indexes `i` and `j`
+            and the dictionary of results of each cell, as soon as
+            the cell is complete.
 
         Return
         ------
@@ -247,46 +343,43 @@ class ManipulationCoalition(DeleteCacheMixin):
         >>> emb = EmbeddingsGeneratorPolarized(100, 3)(0)
         >>> rat = RatingsFromEmbeddingsCorrelated(5, 3)(emb)
         >>> manipulation = ManipulationCoalition(rat, emb, SVDNash())
-        >>> maps = manipulation.manipulation_map(map_size=5, show=False)
+        >>> maps = manipulation.manipulation_map(map_size=5, show=False, seed=42)
         >>> maps['worst_welfare']
-        array([[1.        , 0.98024051, 1.        , 1.        , 1.        ],
-               [1.        , 1.        , 1.        , 1.        , 1.        ],
-               [0.87833419, 1.        , 1.        , 0.97819913, 1.        ],
-               [0.80173984, 0.74016286, 1.        , 1.        , 1.        ],
-               [0.81466796, 1.        , 1.        , 0.92431457, 1.        ]])
+        array([[0.        , 0.        , 0.32666375, 0.6184903 , 0.25222099],
+               [0.        , 0.        , 0.45997559, 0.        , 1.        ],
+               [0.        , 0.        , 0.        , 0.39953871, 0.29233009],
+               [0.        , 0.        , 0.        , 0.11056924, 0.        ],
+               [0.        , 0.        , 0.        , 0.        , 0.        ]])
         """
 
         manipulator_map = np.zeros((map_size, map_size))
         worst_welfare_map = np.zeros((map_size, map_size))
 
         n_voters, n_candidates = self.ratings.shape
-        n_dim = self.embeddings.n_dim
-
-        embeddings_generator = EmbeddingsGeneratorPolarized(n_voters, n_dim)
-        ratings_generator = RatingsFromEmbeddingsCorrelated(n_candidates, n_dim)
+        if seed is None and store is not None:
+            seed = store.parameters().get("seed")
+        if seed is None:
+            seed = np.random.randint(2 ** 31)
+        profiles = MapProfiles(n_voters, self.embeddings.n_dim, n_candidates, map_size,
+                               scores_matrix=scores_matrix, seed=seed)
+        parameters = {"manipulation": type(self), "rule": self.rule, "extension": getattr(self, "extension", None),
+                      "n_voters": n_voters, "n_dim": self.embeddings.n_dim, "n_candidates": n_candidates,
+                      "map_size": map_size, "scores_matrix": scores_matrix, "seed": seed}
+        tasks = {"%i_%i" % (i, j): (i, j) for i in range(map_size) for j in range(map_size)}
+        if callback is not None:
+            def task_callback(key, result):
+                callback(*tasks[key], result)
+        else:
+            task_callback = None
+        results = run_tasks(_coalition_map_cell, tasks, store=store, checkpoint_every=checkpoint_every,
+                            callback=task_callback, n_jobs=n_jobs, shared=(self, profiles),
+                            parameters=parameters)
 
-        if scores_matrix is not None:
-            ratings_generator.set_scores(scores_matrix)
         for i in range(map_size):
             for j in range(map_size):
-                if scores_matrix is None:
-                    ratings_generator.set_scores()
-
-                embeddings = embeddings_generator(polarisation=i/(map_size-1))
-                ratings = ratings_generator(embeddings, coherence=j/(map_size-1))
-                self.set_profile(ratings, embeddings)
-
-                worst_welfare = self.welfare_[self.winner_]
-                is_manipulable = 0
-                for candidate in range(self.ratings.n_candidates):
-                    if candidate == self.winner_:
-                        continue
-                    if self.trivial_manipulation(candidate):
-                        is_manipulable = 1
-                        worst_welfare = min(worst_welfare, self.welfare_[candidate])
-
-                manipulator_map[i, j] = is_manipulable
-                worst_welfare_map[i, j] = worst_welfare
+                result = results["%i_%i" % (i, j)]
+                manipulator_map[i, j] = result["manipulator"]
+                worst_welfare_map[i, j] = result["worst_welfare"]
 
         if show:
             fig = plt.figure(figsize=(10, 5))
@@ -298,3 +391,33 @@ class ManipulationCoalition(DeleteCacheMixin):
 
         return {"manipulator": manipulator_map,
                 "worst_welfare": worst_welfare_map}
+
+
+def _coalition_map_cell(shared, i, j):
+    """
+    Compute the cell `(i, j)` of :meth:`ManipulationCoalition.manipulation_map`.
+    The profile of the cell is generated once, and the candidates are tested
+    by increasing welfare until a trivial manipulation is found.
+
+    Parameters
+    ----------
+    shared : tuple
+        The :class:`ManipulationCoalition` and the :class:`MapProfiles` of the map.
+    i : int
+        The index of the polarisation.
+    j : int
+        The index of the coherence.
+
+    Return
+    ------
+    dict
+        Whether the profile is manipulable and the worst welfare.
+    """
+    manipulation, profiles = shared
+    manipulation.set_profile(*profiles(i, j))
+    welfare = manipulation.welfare_
+    winner = manipulation.winner_
+    for candidate in np.argsort(welfare, kind="stable"):
+        if candidate != winner and manipulation.trivial_manipulation(candidate):
+            return {"manipulator": 1, "worst_welfare": min(welfare[winner], welfare[candidate])}
+    return {"manipulator": 0, "worst_welfare": welfare[winner]}
@@ -1,10 +1,15 @@
 
+import copy
 import numpy as np
+from embedded_voting.utils.cached import cached_property
 from embedded_voting.manipulation.coalition.general import ManipulationCoalition
 from embedded_voting.scoring.singlewinner.svd import SVDNash
 from embedded_voting.scoring.singlewinner.ordinal import InstantRunoffExtension, BordaExtension, KApprovalExtension
 from embedded_voting.embeddings.generator import EmbeddingsGeneratorPolarized
 from embedded_voting.ratings.ratingsFromEmbeddings import RatingsFromEmbeddingsCorrelated
+from embedded_voting.ratings.ratings import Ratings
+from embedded_voting.ratings.rankings import Rankings
+from embedded_voting.embeddings.embeddings import Embeddings
 
 
 class ManipulationCoalitionExtension(ManipulationCoalition):
@@ -16,8 +21,14 @@ class ManipulationCoalitionExtension(ManipulationCoalition):
 
     Parameters
     ----------
-    ratings: Ratings or np.ndarray
-        The ratings of voters to candidates
+    ratings: Ratings, Rankings or np.ndarray
+        The ratings of voters to candidates.
+        :class:`~embedded_voting.Rankings` are converted
+        with :meth:`~embedded_voting.Rankings.to_ratings`, which
+        ties the candidates that are not ranked, as the positional
+        extensions do. Truncated rankings are not supported by
+        :class:`~embedded_voting.InstantRunoffExtension`, whose
+        exhausted ballots cannot be represented by ratings.
     embeddings: Embeddings
         The embeddings of the voters
     extension : PositionalRuleExtension
@@ -55,6 +66,9 @@ class ManipulationCoalitionExtension(ManipulationCoalition):
     """
 
     def __init__(self, ratings, embeddings, extension=None, rule=None):
+        if isinstance(extension, InstantRunoffExtension) and isinstance(ratings, Rankings) \
+                and ratings.k < ratings.n_candidates:
+            raise ValueError("Truncated rankings are not supported with InstantRunoffExtension.")
         super().__init__(ratings, embeddings)
         self.extension = extension
         self.rule = rule
@@ -76,29 +90,27 @@ class ManipulationCoalitionExtension(ManipulationCoalition):
         self.delete_cache()
         return self
 
-    def trivial_manipulation(self, candidate, verbose=False):
-
-        voters_interested = []
-        for i in range(self.ratings.n_voters):
-            score_i = self.ratings.voter_ratings(i)
-            if score_i[self.winner_] < score_i[candidate]:
-                voters_interested.append(i)
-
-        if verbose:
-            print("%i voters interested to elect %i instead of %i" %
-                  (len(voters_interested), candidate, self.winner_))
-
-        profile = self.ratings.copy()
-        for i in voters_interested:
-            profile[i][self.winner_] = -1
-            profile[i][candidate] = 2
-
-        new_winner = self.extended_rule(profile, self.embeddings).winner_
-
-        if verbose:
-            print("Winner is %i" % new_winner)
+    def set_profile(self, ratings, embeddings=None):
+        if embeddings is not None:
+            self.embeddings = Embeddings(embeddings)
+        self.ratings = Ratings(ratings)
+        self.extended_rule(self.ratings, self.embeddings)
+        self.winner_ = self.extended_rule.winner_
+        self.welfare_ = self.rule(self.ratings, self.embeddings).welfare_
+        self.delete_cache()
+        return self
 
-        return new_winner == candidate
+    def _trivial_profiles(self, candidates):
+        ratings = np.array(self.ratings)
+        rows, voters = np.nonzero((ratings[:, candidates] > ratings[:, [self.winner_]]).T)
+        profiles = np.repeat(ratings[np.newaxis], len(candidates), axis=0)
+        profiles[rows, voters, self.winner_] = -1
+        profiles[rows, voters, np.array(candidates)[rows]] = 2
+        return profiles
+
+    @cached_property
+    def _baseline_(self):
+        return copy.copy(self.extended_rule)(self.ratings, self.embeddings)
 
 
 class ManipulationCoalitionBorda(ManipulationCoalitionExtension):
@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""
+Copyright Théo Delemazure
+theo.delemazure@ens.fr
+
+This file is part of Embedded Voting.
+"""
+import numpy as np
+from embedded_voting.embeddings.embeddings import Embeddings
+from embedded_voting.embeddings.generator import EmbeddingsGeneratorPolarized
+from embedded_voting.ratings.ratingsFromEmbeddings import RatingsFromEmbeddingsCorrelated
+
+
+class MapProfiles:
+    """
+    This class generates the profiles of the cells of a manipulation map.
+
+    The embeddings of the cell `(i, j)` are given by a single
+    :class:`EmbeddingsGeneratorPolarized` with polarisation `i / (map_size - 1)`,
+    and its ratings are given by a :class:`RatingsFromEmbeddingsCorrelated`
+    with coherence `j / (map_size - 1)`. Each cell has its own random seed,
+    so that the profile of a cell does not depend on the order in which
+    the cells are computed, nor on the process computing it.
+
+    Parameters
+    ----------
+    n_voters : int
+        The number of voters.
+    n_dim : int
+        The number of dimensions of the embeddings.
+    n_candidates : int
+        The number of candidates.
+    map_size : int
+        The number of different ``coherence``
+        and ``polarisation`` parameters.
+    scores_matrix : np.ndarray
+        The scores matrix of the ratings generator.
+        If None, a new matrix is generated for each cell.
+    seed : int
+        The seed of the map. If None, it is drawn
+        from the global random state of numpy.
+
+    Attributes
+    ----------
+    seeds : np.ndarray
+        The seed of each cell. Of shape ``map_size, map_size``.
+    embeddings_stack : np.ndarray
+        The embeddings of each polarisation, which are the same for each
+        coherence. Of shape ``map_size, n_voters, n_dim``.
+
+    Examples
+    --------
+    >>> profiles = MapProfiles(10, 3, 4, map_size=5, seed=42)
+    >>> ratings, embeddings = profiles(2, 3)
+    >>> ratings.shape, embeddings.shape
+    ((10, 4), (10, 3))
+    >>> ratings_bis, _ = MapProfiles(10, 3, 4, map_size=5, seed=42)(2, 3)
+    >>> np.array_equal(ratings, ratings_bis)
+    True
+    """
+
+    def __init__(self, n_voters, n_dim, n_candidates, map_size, scores_matrix=None, seed=None):
+        if seed is None:
+            seed = np.random.randint(2 ** 31)
+        states = np.random.SeedSequence(seed).generate_state(map_size ** 2 + 1)
+        self.map_size = map_size
+        self.seeds = states[:-1].reshape(map_size, map_size)
+        self.scores_matrix = scores_matrix
+        rng = np.random.default_rng(states[-1])
+        self.embeddings_generator = EmbeddingsGeneratorPolarized(n_voters, n_dim, rng=rng)
+        self.ratings_generator = RatingsFromEmbeddingsCorrelated(n_candidates, n_dim, scores_matrix, rng=rng)
+        self.embeddings_stack = self.embeddings_generator(np.arange(map_size) / (map_size - 1))
+
+    def __call__(self, i, j):
+        """
+        Generate the profile of the cell `(i, j)`.
+
+        Parameters
+        ----------
+        i : int
+            The index of the polarisation.
+        j : int
+            The index of the coherence.
+
+        Return
+        ------
+        Ratings
+            The ratings of the cell.
+        Embeddings
+            The embeddings of the cell.
+        """
+        self.ratings_generator.rng = np.random.default_rng(self.seeds[i, j])
+        if self.scores_matrix is None:
+            self.ratings_generator.set_scores()
+        embeddings = Embeddings(self.embeddings_stack[i], norm=False)
+        ratings = self.ratings_generator(embeddings, coherence=j/(self.map_size-1))
+        return ratings, embeddings
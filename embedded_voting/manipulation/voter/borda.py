@@ -21,6 +21,9 @@ class SingleVoterManipulationBorda(SingleVoterManipulationExtension):
         The embeddings of the voters
     rule : ScoringRule
         The aggregation rule we want to analysis.
+    n_jobs : int
+        The number of worker processes used to analyse the voters.
+        If None, the voters are analysed in the current process.
 
     Examples
     --------
@@ -38,42 +41,44 @@ class SingleVoterManipulationBorda(SingleVoterManipulationExtension):
     >>> manipulation.manipulation_global_
     [1, 2, 1, 1, 2, 2, 1, 1, 1, 1]
     """
-    def __init__(self, ratings, embeddings, rule=None):
+    def __init__(self, ratings, embeddings, rule=None, n_jobs=None):
         ratings = Ratings(ratings)
-        super().__init__(ratings, embeddings, BordaExtension(ratings.n_candidates, rule), rule)
+        super().__init__(ratings, embeddings, BordaExtension(ratings.n_candidates, rule), rule, n_jobs=n_jobs)
 
     def manipulation_voter(self, i):
-        fake_scores_i = self.extended_rule.fake_ratings_[i].copy()
-        score_i = self.ratings.voter_ratings(i).copy()
-        preferences_order = np.argsort(score_i)[::-1]
+        score_i = self.ratings.voter_ratings(i)
+        preferences_order = np.argsort(score_i, kind="stable")[::-1]
 
         n_candidates = self.ratings.n_candidates
 
         if preferences_order[0] == self.winner_:
             return self.winner_
 
-        all_scores = []
-        for e in range(n_candidates):
-            self.extended_rule.fake_ratings_[i] = np.ones(n_candidates) * (e / (n_candidates - 1))
-            altered_scores = self.extended_rule.base_rule(self.extended_rule.fake_ratings_, self.embeddings).scores_
-            all_scores += [(s, j, e) for j, s in enumerate(altered_scores)]
+        # One election for each level e, where the voter gives e / (n_candidates - 1) to every candidate.
+        levels = np.arange(n_candidates)
+        new_ratings = (levels / (n_candidates - 1))[:, np.newaxis, np.newaxis] * np.ones((1, n_candidates))
+        altered_scores = self._fake_baseline_.modified_scores([i], new_ratings)
 
-        self.extended_rule.fake_ratings_[i] = fake_scores_i
-        all_scores.sort()
-        all_scores = all_scores[::-1]
+        # Sort the triples (score, candidate, level) by decreasing order.
+        kinds = np.repeat(levels, n_candidates)
+        candidates = np.tile(np.arange(n_candidates), n_candidates)
+        altered_scores = altered_scores.reshape(n_candidates ** 2, -1)
+        order = np.lexsort((kinds, candidates) + tuple(altered_scores.T[::-1]))[::-1]
+        kinds = kinds[order]
+        candidates = candidates[order]
 
-        buckets = np.arange(n_candidates)
+        # The level e can hold e candidates above the others: the search
+        # stops at the first triple exceeding the capacity of its level.
+        counts = np.cumsum(kinds[:, np.newaxis] == levels, axis=0)[np.arange(len(kinds)), kinds]
+        overflow = np.flatnonzero(counts > kinds)
+        stop = overflow[0] if len(overflow) > 0 else len(kinds)
+        winners = candidates[:stop][kinds[:stop] == n_candidates - 1]
 
         best_manipulation_i = np.where(preferences_order == self.winner_)[0][0]
-        for (_, j, kind) in all_scores:
-            buckets[kind] -= 1
-            if buckets[kind] < 0:
-                break
-
-            if kind == (n_candidates-1):
-                index_candidate = np.where(preferences_order == j)[0][0]
-                if index_candidate < best_manipulation_i:
-                    best_manipulation_i = index_candidate
+        for j in winners:
+            index_candidate = np.where(preferences_order == j)[0][0]
+            if index_candidate < best_manipulation_i:
+                best_manipulation_i = index_candidate
 
         best_manipulation = preferences_order[best_manipulation_i]
 
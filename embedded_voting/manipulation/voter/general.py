@@ -2,13 +2,18 @@ from embedded_voting.utils.cached import DeleteCacheMixin, cached_property
 from embedded_voting.embeddings.generator import EmbeddingsGeneratorPolarized
 from embedded_voting.ratings.ratingsFromEmbeddings import RatingsFromEmbeddingsCorrelated
 from embedded_voting.scoring.singlewinner.svd import SVDNash
-from embedded_voting.scoring.singlewinner.ordinal import BordaExtension
+from embedded_voting.scoring.singlewinner.ordinal import BordaExtension, PositionalRuleExtension, InstantRunoffExtension
 import numpy as np
 import itertools
+import copy
+import multiprocessing
 import matplotlib.pyplot as plt
 from embedded_voting.utils.plots import create_map_plot
 from embedded_voting.ratings.ratings import Ratings
+from embedded_voting.ratings.rankings import Rankings
 from embedded_voting.embeddings.embeddings import Embeddings
+from embedded_voting.experiments.store import run_tasks
+from embedded_voting.manipulation.maps import MapProfiles
 
 
 class SingleVoterManipulation(DeleteCacheMixin):
@@ -29,6 +34,9 @@ class SingleVoterManipulation(DeleteCacheMixin):
         The embeddings of the voters
     rule : ScoringRule
         The aggregation rule we want to analysis.
+    n_jobs : int
+        The number of worker processes used to analyse the voters.
+        If None, the voters are analysed in the current process.
 
     Attributes
     ----------
@@ -36,6 +44,8 @@ class SingleVoterManipulation(DeleteCacheMixin):
         The ratings of voters on which we do the analysis.
     rule : ScoringRule
         The aggregation rule we want to analysis.
+    n_jobs : int
+        The number of worker processes used to analyse the voters.
     winner_ : int
         The index of the winner of the election without manipulation.
     scores_ : float list
@@ -56,10 +66,11 @@ class SingleVoterManipulation(DeleteCacheMixin):
     [0.89..., 1.0, 0.0]
     """
 
-    def __init__(self, ratings, embeddings, rule=None):
+    def __init__(self, ratings, embeddings, rule=None, n_jobs=None):
         self.ratings = Ratings(ratings)
         self.embeddings = Embeddings(embeddings)
         self.rule = rule
+        self.n_jobs = n_jobs
         if rule is not None:
             global_rule = self.rule(self.ratings, self.embeddings)
             self.winner_ = global_rule.winner_
@@ -104,6 +115,20 @@ class SingleVoterManipulation(DeleteCacheMixin):
         self.delete_cache()
         return self
 
+    @cached_property
+    def _baseline_(self):
+        """
+        A copy of the rule, run once on the current profile.
+        The elections where some voters change their ratings are
+        scored from it with :meth:`~embedded_voting.ScoringRule.modified_scores`.
+
+        Return
+        ------
+        ScoringRule
+            The rule run on :attr:`ratings`.
+        """
+        return copy.copy(self.rule)(self.ratings, self.embeddings)
+
     def manipulation_voter(self, i):
         """
         This function return, for the `i^th` voter,
@@ -122,21 +147,18 @@ class SingleVoterManipulation(DeleteCacheMixin):
             that can be elected by manipulation.
         """
         score_i = self.ratings.voter_ratings(i).copy()
-        preferences_order = np.argsort(score_i)[::-1]
+        preferences_order = np.argsort(score_i, kind="stable")[::-1]
 
         # If the favorite of the voter is the winner, he will not manipulate
         if preferences_order[0] == self.winner_:
             return self.winner_
 
         n_candidates = self.ratings.n_candidates
-        self.ratings[i] = np.ones(n_candidates)
-        scores_max = self.rule(self.ratings, self.embeddings).scores_
-        self.ratings[i] = np.zeros(n_candidates)
-        scores_min = self.rule(self.ratings, self.embeddings).scores_
-        self.ratings[i] = score_i
+        new_ratings = np.array([[np.ones(n_candidates)], [np.zeros(n_candidates)]])
+        scores_max, scores_min = self._baseline_.modified_scores([i], new_ratings)
 
-        all_scores = [(s, i, 1) for i, s in enumerate(scores_max)]
-        all_scores += [(s, i, 0) for i, s in enumerate(scores_min)]
+        all_scores = [(s, i, 1) for i, s in enumerate(_sortable(scores_max))]
+        all_scores += [(s, i, 0) for i, s in enumerate(_sortable(scores_min))]
 
         all_scores.sort()
         all_scores = all_scores[::-1]
@@ -175,8 +197,89 @@ class SingleVoterManipulation(DeleteCacheMixin):
         >>> manipulation = SingleVoterManipulation(ratings, embeddings, SVDNash())
         >>> manipulation.manipulation_global_
         [1, 0, 0, 0, 1, 1, 1, 1, 1, 0]
+
+        When the rule implements :meth:`~embedded_voting.ScoringRule.single_voter_scores`,
+        all the voters are computed at once:
+
+        >>> from embedded_voting.scoring.singlewinner.trivialRules import SumScores
+        >>> manipulation = SingleVoterManipulation(ratings, embeddings, SumScores())
+        >>> manipulation.manipulation_global_
+        [1, 0, 0, 0, 1, 1, 1, 1, 1, 0]
+        """
+        try:
+            scores_max = self._baseline_.single_voter_scores(1)
+            scores_min = self._baseline_.single_voter_scores(0)
+        except NotImplementedError:
+            return self._manipulation_voters()
+        return list(self._best_manipulations(scores_max, scores_min))
+
+    def _worker_pool(self):
         """
-        return [self.manipulation_voter(i) for i in range(self.ratings.n_voters)]
+        This function creates a pool of :attr:`n_jobs` worker processes.
+        The analysis is sent once to each worker, which thus gets its own
+        copy of the ratings, since :meth:`manipulation_voter` modifies the
+        ratings of the voter it analyses.
+
+        Return
+        ------
+        multiprocessing.pool.Pool
+            The pool of worker processes.
+        """
+        manipulation = copy.copy(self)
+        manipulation.delete_cache()
+        return multiprocessing.Pool(self.n_jobs, initializer=_init_voter_worker, initargs=(manipulation,))
+
+    def _manipulation_voters(self):
+        """
+        This function applies the function :meth:`manipulation_voter`
+        to every voter, with :attr:`n_jobs` worker processes.
+
+        Return
+        ------
+        int list
+            The list of the best candidates that can be
+            turned into the winner for each voter.
+        """
+        if self.n_jobs is None:
+            return [self.manipulation_voter(i) for i in range(self.ratings.n_voters)]
+        pool = self._worker_pool()
+        try:
+            return pool.map(_manipulation_voter_task, range(self.ratings.n_voters))
+        finally:
+            pool.terminate()
+
+    def _best_manipulations(self, scores_max, scores_min):
+        """
+        This function computes the result of :meth:`manipulation_voter`
+        for every voter at once, from the scores obtained when each voter
+        gives `1` (resp. `0`) to every candidate. A candidate can be
+        turned into the winner by a voter if its maximal score beats
+        the minimal scores of all the candidates.
+
+        Parameters
+        ----------
+        scores_max : np.ndarray
+            The scores of the candidates when each voter gives `1` to every candidate.
+            Of shape :attr:`~embedded_voting.Ratings.n_voters`, :attr:`~embedded_voting.Ratings.n_candidates`.
+        scores_min : np.ndarray
+            The scores of the candidates when each voter gives `0` to every candidate.
+
+        Return
+        ------
+        np.ndarray
+            The best candidate that can be elected by manipulation for each voter.
+        """
+        n_candidates = scores_max.shape[1]
+        candidates = np.arange(n_candidates)
+        # Ties are broken as in manipulation_voter, which sorts (score, candidate) pairs.
+        best_min = scores_min.max(axis=1)[:, np.newaxis]
+        best_min_candidate = n_candidates - 1 - np.argmax(scores_min[:, ::-1], axis=1)[:, np.newaxis]
+        reachable = (scores_max > best_min) | ((scores_max == best_min) & (candidates >= best_min_candidate))
+        reachable[:, self.winner_] = True
+
+        preferences_rank = np.argsort(np.argsort(np.array(self.ratings), axis=1, kind="stable")[:, ::-1], axis=1)
+        preferences_rank[~reachable] = n_candidates
+        return np.argmin(preferences_rank, axis=1)
 
     @cached_property
     def prop_manipulator_(self):
@@ -269,13 +372,29 @@ class SingleVoterManipulation(DeleteCacheMixin):
         >>> manipulation = SingleVoterManipulation(ratings, embeddings, SVDNash())
         >>> manipulation.is_manipulable_
         True
-        """
-        for i in range(self.ratings.n_voters):
-            if self.manipulation_voter(i) != self.winner_:
-                return True
-        return False
 
-    def manipulation_map(self, map_size=20, scores_matrix=None, show=True):
+        With several worker processes, the remaining voters
+        are cancelled as soon as a manipulator is found:
+
+        >>> SingleVoterManipulation(ratings, embeddings, SVDNash(), n_jobs=2).is_manipulable_
+        True
+        """
+        if self.n_jobs is None:
+            for i in range(self.ratings.n_voters):
+                if self.manipulation_voter(i) != self.winner_:
+                    return True
+            return False
+        pool = self._worker_pool()
+        try:
+            for candidate in pool.imap_unordered(_manipulation_voter_task, range(self.ratings.n_voters)):
+                if candidate != self.winner_:
+                    return True
+            return False
+        finally:
+            pool.terminate()
+
+    def manipulation_map(self, map_size=20, scores_matrix=None, show=True, store=None, checkpoint_every=10,
+                         n_jobs=None, seed=None, callback=None):
         """
         A function to plot the manipulability
         of the ratings when the ``polarisation`` and the ``coherence``
@@ -283,6 +402,10 @@ class SingleVoterManipulation(DeleteCacheMixin):
         The number of voters, dimensions, and candidates
         are those of the :attr:`profile_`.
 
+        The cells of the maps are independent: each one has its own
+        random seed (cf. :class:`MapProfiles`), so they can be computed
+        by a pool of processes. In that case, the rule must be picklable.
+
         Parameters
         ----------
         map_size : int
@@ -299,6 +422,25 @@ class SingleVoterManipulation(DeleteCacheMixin):
         show : bool
             If True, display the manipulation maps
             at the end of the function.
+        store : ExperimentStore
+            If not None, the completed cells of the maps are written
+            in this store, and the cells already in the store are not
+            computed again. The parameters of the map are recorded in
+            the store, and a ValueError is raised if it contains the
+            results of another map.
+        checkpoint_every : int
+            The number of completed cells written at once in the store.
+        n_jobs : int
+            The number of worker processes computing the cells.
+            If None, the cells are computed in the current process.
+        seed : int
+            The seed of the random profiles of the map. If None, the seed
+            recorded in the :attr:`store` is used, or it is drawn from the
+            global random state of numpy.
+        callback : callable
+            If not None, it is called with the indexes `i` and `j`
+            and the dictionary of results of each cell, as soon as
+            the cell is computed.
 
         Return
         ------
@@ -314,13 +456,13 @@ class SingleVoterManipulation(DeleteCacheMixin):
         >>> emb = EmbeddingsGeneratorPolarized(100, 3)(0)
         >>> rat = RatingsFromEmbeddingsCorrelated(5, 3)(emb)
         >>> manipulation = SingleVoterManipulation(rat, emb, rule=SVDNash())
-        >>> maps = manipulation.manipulation_map(map_size=5, show=False)
+        >>> maps = manipulation.manipulation_map(map_size=5, show=False, seed=42)
         >>> maps['manipulator']
-        array([[0.02, 0.49, 0.  , 0.  , 0.  ],
-               [0.  , 0.  , 0.  , 0.  , 0.  ],
-               [0.54, 0.  , 0.  , 0.4 , 0.  ],
-               [0.01, 0.51, 0.  , 0.  , 0.  ],
-               [0.  , 0.  , 0.  , 0.36, 0.  ]])
+        array([[0.01, 0.  , 0.  , 0.  , 0.  ],
+               [0.  , 0.51, 0.  , 0.  , 0.  ],
+               [0.56, 0.33, 0.  , 0.46, 0.  ],
+               [0.  , 0.11, 0.  , 0.  , 0.  ],
+               [0.  , 0.  , 0.  , 0.  , 0.  ]])
         """
 
         manipulator = np.zeros((map_size, map_size))
@@ -328,24 +470,38 @@ class SingleVoterManipulation(DeleteCacheMixin):
         avg_welfare = np.zeros((map_size, map_size))
 
         n_voters, n_candidates = self.ratings.shape
-        n_dim = self.embeddings.n_dim
-
-        embeddings_generator = EmbeddingsGeneratorPolarized(n_voters, n_dim)
-        ratings_generator = RatingsFromEmbeddingsCorrelated(n_candidates, n_dim)
-
-        if scores_matrix is not None:
-            ratings_generator.set_scores(scores_matrix)
-
+        if seed is None and store is not None:
+            seed = store.parameters().get("seed")
+        if seed is None:
+            seed = np.random.randint(2 ** 31)
+        profiles = MapProfiles(n_voters, self.embeddings.n_dim, n_candidates, map_size,
+                               scores_matrix=scores_matrix, seed=seed)
+        parameters = {"manipulation": type(self), "rule": self.rule, "extension": getattr(self, "extension", None),
+                      "n_voters": n_voters, "n_dim": self.embeddings.n_dim, "n_candidates": n_candidates,
+                      "map_size": map_size, "scores_matrix": scores_matrix, "seed": seed}
+
+        manipulation = self
+        if n_jobs is not None:
+            # The cells are already computed in worker processes, which cannot have their own workers.
+            manipulation = copy.copy(self)
+            manipulation.n_jobs = None
+            manipulation.delete_cache()
+
+        tasks = {"%i_%i" % (i, j): (i, j) for i in range(map_size) for j in range(map_size)}
+        if callback is not None:
+            def task_callback(key, result):
+                callback(*tasks[key], result)
+        else:
+            task_callback = None
+        results = run_tasks(_manipulation_map_cell, tasks, store=store, checkpoint_every=checkpoint_every,
+                            callback=task_callback, n_jobs=n_jobs, shared=(manipulation, profiles),
+                            parameters=parameters)
         for i in range(map_size):
             for j in range(map_size):
-                if scores_matrix is None:
-                    ratings_generator.set_scores()
-                embeddings = embeddings_generator(polarisation=i/(map_size-1))
-                ratings = ratings_generator(embeddings, coherence=j/(map_size-1))
-                self.set_profile(ratings, embeddings)
-                manipulator[i, j] = self.prop_manipulator_
-                worst_welfare[i, j] = self.worst_welfare_
-                avg_welfare[i, j] = self.avg_welfare_
+                result = results["%i_%i" % (i, j)]
+                manipulator[i, j] = result["manipulator"]
+                worst_welfare[i, j] = result["worst_welfare"]
+                avg_welfare[i, j] = result["avg_welfare"]
 
         if show:
             fig = plt.figure(figsize=(15, 5))
@@ -361,6 +517,60 @@ class SingleVoterManipulation(DeleteCacheMixin):
                 "avg_welfare": avg_welfare}
 
 
+def _manipulation_map_cell(shared, i, j):
+    """
+    Compute the cell `(i, j)` of :meth:`SingleVoterManipulation.manipulation_map`.
+
+    Parameters
+    ----------
+    shared : tuple
+        The :class:`SingleVoterManipulation` and the :class:`MapProfiles` of the map.
+    i : int
+        The index of the polarisation.
+    j : int
+        The index of the coherence.
+
+    Return
+    ------
+    dict
+        The results of the cell.
+    """
+    manipulation, profiles = shared
+    manipulation.set_profile(*profiles(i, j))
+    return {"manipulator": manipulation.prop_manipulator_,
+            "worst_welfare": manipulation.worst_welfare_,
+            "avg_welfare": manipulation.avg_welfare_}
+
+
+def _sortable(scores):
+    """
+    Convert the scores of the candidates into a list of values that
+    can be sorted, i.e. floats or tuples when the scores have several
+    components.
+    """
+    if scores.ndim > 1:
+        return [tuple(score) for score in scores]
+    return list(scores)
+
+
+_worker_manipulation = None
+
+
+def _init_voter_worker(manipulation):
+    """
+    Initializer of the worker processes of :meth:`SingleVoterManipulation._worker_pool`.
+    """
+    global _worker_manipulation
+    _worker_manipulation = manipulation
+
+
+def _manipulation_voter_task(i):
+    """
+    Run :meth:`SingleVoterManipulation.manipulation_voter` in a worker process.
+    """
+    return _worker_manipulation.manipulation_voter(i)
+
+
 class SingleVoterManipulationExtension(SingleVoterManipulation):
     """
     This class extends the :class:`SingleVoterManipulation`
@@ -368,12 +578,20 @@ class SingleVoterManipulationExtension(SingleVoterManipulation):
 
     Parameters
     ----------
-    ratings : Profile
+    ratings : Ratings, Rankings or np.ndarray
         The ratings of voters on which we do the analysis.
+        :class:`~embedded_voting.Rankings` are converted
+        with :meth:`~embedded_voting.Rankings.to_ratings`, which
+        ties the candidates that are not ranked, as the positional
+        extensions do. Truncated rankings are not supported by
+        :class:`~embedded_voting.InstantRunoffExtension`, whose
+        exhausted ballots cannot be represented by ratings.
     extension : PositionalRuleExtension
         The ordinal extension used.
     rule : ScoringRule
         The aggregation rule we want to analysis.
+    n_jobs : int
+        The number of worker processes used to analyse the voters.
 
     Attributes
     ----------
@@ -387,6 +605,9 @@ class SingleVoterManipulationExtension(SingleVoterManipulation):
         The rule we are analysing
     extension : PositionalRuleExtension
         The extension used.
+    n_evaluations_ : int
+        The number of elections run by the last call
+        of :meth:`manipulation_voter`.
 
     Examples
     --------
@@ -404,8 +625,11 @@ class SingleVoterManipulationExtension(SingleVoterManipulation):
     0.7
     """
 
-    def __init__(self, ratings, embeddings, extension, rule=None):
-        super().__init__(ratings, embeddings)
+    def __init__(self, ratings, embeddings, extension, rule=None, n_jobs=None):
+        if isinstance(extension, InstantRunoffExtension) and isinstance(ratings, Rankings) \
+                and ratings.k < ratings.n_candidates:
+            raise ValueError("Truncated rankings are not supported with InstantRunoffExtension.")
+        super().__init__(ratings, embeddings, n_jobs=n_jobs)
         self.rule = rule
         self.extension = extension
         if rule is not None:
@@ -426,28 +650,352 @@ class SingleVoterManipulationExtension(SingleVoterManipulation):
         self.delete_cache()
         return self
 
+    @cached_property
+    def manipulation_global_(self):
+        return self._manipulation_voters()
+
+    def set_profile(self, ratings, embeddings=None):
+        if embeddings is not None:
+            self.embeddings = Embeddings(embeddings)
+        self.ratings = Ratings(ratings)
+        self.extended_rule(self.ratings, self.embeddings)
+        self.winner_ = self.extended_rule.winner_
+        self.welfare_ = self.rule(self.ratings, self.embeddings).welfare_
+        self.delete_cache()
+        return self
+
     def manipulation_voter(self, i):
-        score_i = self.ratings[i].copy()
-        preferences_order = np.argsort(score_i)[::-1]
+        """
+        This function return, for the `i^th` voter,
+        its favorite candidate that he can turn to
+        a winner by manipulating the election.
+
+        For a :class:`PositionalRuleExtension` whose base rule has one
+        score component and is :attr:`~embedded_voting.ScoringRule.column_separable`,
+        the score of a candidate only depends on the points it receives. The scores of all candidates are computed
+        once for each distinct number of points the voter can give, and
+        a candidate can be elected if the other candidates can share
+        the remaining points while staying below it, which is a bipartite
+        matching problem. The ballot found is checked with a real election.
+        Otherwise, every distinct ballot of the voter is tried.
+
+        The number of elections run is stored in :attr:`n_evaluations_`.
+
+        Parameters
+        ----------
+        i : int
+            The index of the voter.
+
+        Return
+        ------
+        int
+            The index of the best candidate
+            that can be elected by manipulation.
 
-        n_candidates = self.ratings.shape[1]
-        points = np.arange(n_candidates)[::-1]
+        Examples
+        --------
+        >>> np.random.seed(42)
+        >>> scores_matrix = [[1, .2, 0], [.5, .6, .9], [.1, .8, .3]]
+        >>> embeddings = EmbeddingsGeneratorPolarized(10, 3)(.8)
+        >>> ratings = RatingsFromEmbeddingsCorrelated(3, 3, scores_matrix)(embeddings, .8)
+        >>> manipulation = SingleVoterManipulationExtension(ratings, embeddings, BordaExtension(3), SVDNash())
+        >>> manipulation.manipulation_voter(1)
+        2
+        >>> manipulation.n_evaluations_
+        4
+        """
+        self.n_evaluations_ = 0
+        preferences_order = np.argsort(self.ratings[i], kind="stable")[::-1]
         if preferences_order[0] == self.winner_:
             return self.winner_
+        targets = preferences_order[:np.where(preferences_order == self.winner_)[0][0]]
 
+        score_i = self.ratings[i].copy()
+        try:
+            levels_scores = self._levels_scores(i)
+            if levels_scores is None:
+                return self._best_ballot(i, preferences_order)
+            for candidate in targets:
+                positions = self._target_positions(levels_scores, candidate)
+                if positions is None:
+                    continue
+                self.ratings[i] = len(positions) - 1 - positions
+                self.n_evaluations_ += 1
+                if self.extended_rule(self.ratings, self.embeddings).winner_ == candidate:
+                    return candidate
+                # The ties are not broken as expected: every ballot is tried.
+                return self._best_ballot(i, preferences_order)
+            return self.winner_
+        finally:
+            self.ratings[i] = score_i
+
+    def _levels_scores(self, i):
+        """
+        This function computes the scores of the candidates for each
+        number of points the `i^th` voter can give to them.
+
+        Parameters
+        ----------
+        i : int
+            The index of the voter.
+
+        Return
+        ------
+        tuple
+            The index of the level of points of each position, and
+            the scores of the candidates, of shape ``n_candidates, n_levels``.
+            None if the extension is not a :class:`PositionalRuleExtension`,
+            or if its base rule has several score components or is not
+            :attr:`~embedded_voting.ScoringRule.column_separable`.
+        """
+        if (not isinstance(self.extension, PositionalRuleExtension) or self.rule.score_components != 1
+                or not self.rule.column_separable):
+            return None
+        points = np.array(self.extension.points) / np.max(self.extension.points)
+        levels, position_levels = np.unique(points, return_inverse=True)
+        new_ratings = levels[:, np.newaxis, np.newaxis] * np.ones((1, self.ratings.n_candidates))
+        scores = self._fake_baseline_.modified_scores([i], new_ratings)
+        self.n_evaluations_ += len(levels)
+        return position_levels, scores.T
+
+    @cached_property
+    def _fake_baseline_(self):
+        """
+        A copy of the base rule, run once on the fake ratings given by the
+        :class:`PositionalRuleExtension` to the current profile. The elections
+        where a voter changes its ballot are scored from it with
+        :meth:`~embedded_voting.ScoringRule.modified_scores`.
+
+        Return
+        ------
+        ScoringRule
+            The base rule run on the fake ratings.
+        """
+        fake_ratings = self.extension._create_fake_ratings(np.array(self.ratings))
+        return copy.copy(self.rule)(fake_ratings, self.embeddings)
+
+    @staticmethod
+    def _target_positions(levels_scores, candidate):
+        """
+        This function looks for a ballot electing a candidate,
+        knowing the scores of the candidates for each level of points.
+
+        A ballot where the other candidates are strictly below the
+        target always elects it. When ties cannot be avoided, the
+        ballots compatible with the ties are enumerated and the winner
+        is obtained by sorting the scores as in :attr:`~embedded_voting.ScoringRule.ranking_`.
+
+        Parameters
+        ----------
+        levels_scores : tuple
+            The output of :meth:`_levels_scores`.
+        candidate : int
+            The candidate we want to elect.
+
+        Return
+        ------
+        np.ndarray
+            The position of each candidate in the ballot,
+            or None if the candidate cannot be elected.
+        """
+        position_levels, scores = levels_scores
+        n_candidates, n_levels = scores.shape
+        others = [c for c in range(n_candidates) if c != candidate]
+        for level in np.unique(position_levels):
+            score = scores[candidate, level]
+            free_levels = list(position_levels)
+            free_levels.remove(level)
+            free_levels = np.array(free_levels)
+            allowed = scores[others][:, free_levels] <= score
+            if _bipartite_matching(allowed) is None:
+                continue
+            matching = _bipartite_matching(scores[others][:, free_levels] < score)
+            if matching is not None:
+                candidate_levels = np.zeros(n_candidates, dtype=int)
+                candidate_levels[candidate] = level
+                candidate_levels[others] = free_levels[matching]
+                return _ballot_positions(position_levels, candidate_levels)
+            counts = np.bincount(free_levels, minlength=n_levels)
+            for candidate_levels in _level_assignments(scores[others] <= score, counts):
+                candidate_levels = np.insert(candidate_levels, candidate, level)
+                new_scores = list(scores[np.arange(n_candidates), candidate_levels])
+                if np.argsort(new_scores)[::-1][0] == candidate:
+                    return _ballot_positions(position_levels, candidate_levels)
+        return None
+
+    def _best_ballot(self, i, preferences_order):
+        """
+        This function tries every distinct ballot of the `i^th` voter,
+        and returns the best candidate that can be elected.
+
+        Parameters
+        ----------
+        i : int
+            The index of the voter.
+        preferences_order : np.ndarray
+            The candidates sorted by decreasing rating of the voter.
+
+        Return
+        ------
+        int
+            The index of the best candidate
+            that can be elected by manipulation.
+        """
+        n_candidates = self.ratings.n_candidates
         best_manipulation_i = np.where(preferences_order == self.winner_)[0][0]
+        if isinstance(self.extension, PositionalRuleExtension):
+            # Ballots giving the same points to every candidate are equivalent.
+            points = np.array(self.extension.points) / np.max(self.extension.points)
+            position_levels = np.unique(points, return_inverse=True)[1]
+            ballots = (_ballot_positions(position_levels, np.array(candidate_levels))
+                       for candidate_levels in _multiset_permutations(position_levels))
+        else:
+            ballots = (np.array(perm) for perm in itertools.permutations(range(n_candidates)))
 
-        for perm in itertools.permutations(range(n_candidates)):
-            self.ratings[i] = points[list(perm)]
-            fake_run = self.extended_rule(self.ratings, self.embeddings)
-            new_winner = fake_run.winner_
+        for positions in ballots:
+            self.ratings[i] = n_candidates - 1 - positions
+            self.n_evaluations_ += 1
+            new_winner = self.extended_rule(self.ratings, self.embeddings).winner_
             index_candidate = np.where(preferences_order == new_winner)[0][0]
             if index_candidate < best_manipulation_i:
                 best_manipulation_i = index_candidate
                 if best_manipulation_i == 0:
                     break
 
-        best_manipulation = preferences_order[best_manipulation_i]
-        self.ratings[i] = score_i
+        return preferences_order[best_manipulation_i]
 
-        return best_manipulation
+
+def _bipartite_matching(allowed):
+    """
+    Find a perfect matching in a bipartite graph, with augmenting paths.
+
+    Parameters
+    ----------
+    allowed : np.ndarray
+        The adjacency matrix of the graph, of shape ``n, n``.
+
+    Return
+    ------
+    np.ndarray
+        The column matched with each row, or None if there is no perfect matching.
+
+    Examples
+    --------
+    >>> _bipartite_matching(np.array([[True, True], [True, False]]))
+    array([1, 0])
+    >>> _bipartite_matching(np.array([[True, False], [True, False]])) is None
+    True
+    """
+    n_rows, n_columns = allowed.shape
+    column_match = -np.ones(n_columns, dtype=int)
+
+    def augment(row, visited):
+        for column in np.flatnonzero(allowed[row]):
+            if not visited[column]:
+                visited[column] = True
+                if column_match[column] < 0 or augment(column_match[column], visited):
+                    column_match[column] = row
+                    return True
+        return False
+
+    for row in range(n_rows):
+        if not augment(row, np.zeros(n_columns, dtype=bool)):
+            return None
+    row_match = np.zeros(n_rows, dtype=int)
+    row_match[column_match[column_match >= 0]] = np.flatnonzero(column_match >= 0)
+    return row_match
+
+
+def _level_assignments(allowed, counts):
+    """
+    Generate the assignments of levels to candidates such that
+    each candidate gets an allowed level and each level is used
+    the required number of times.
+
+    Parameters
+    ----------
+    allowed : np.ndarray
+        For each candidate, the levels allowed. Of shape ``n_candidates, n_levels``.
+    counts : np.ndarray
+        The number of candidates of each level.
+
+    Examples
+    --------
+    >>> list(_level_assignments(np.array([[True, True], [True, False]]), np.array([1, 1])))
+    [array([1, 0])]
+    """
+    n_candidates = allowed.shape[0]
+    counts = counts.copy()
+    levels = np.zeros(n_candidates, dtype=int)
+
+    def generate(c):
+        if c == n_candidates:
+            yield levels.copy()
+            return
+        for level in np.flatnonzero(allowed[c] & (counts > 0)):
+            counts[level] -= 1
+            levels[c] = level
+            yield from generate(c + 1)
+            counts[level] += 1
+
+    return generate(0)
+
+
+def _multiset_permutations(values):
+    """
+    Generate the distinct permutations of a list of values, in lexicographic order.
+
+    Parameters
+    ----------
+    values : list
+        The values, possibly with repetitions.
+
+    Examples
+    --------
+    >>> list(_multiset_permutations([1, 0, 1]))
+    [(0, 1, 1), (1, 0, 1), (1, 1, 0)]
+    """
+    values, counts = np.unique(values, return_counts=True)
+    values = list(values)
+    counts = list(counts)
+    n_values = sum(counts)
+
+    def generate(prefix):
+        if len(prefix) == n_values:
+            yield tuple(prefix)
+            return
+        for k, value in enumerate(values):
+            if counts[k] > 0:
+                counts[k] -= 1
+                yield from generate(prefix + [value])
+                counts[k] += 1
+
+    return generate([])
+
+
+def _ballot_positions(position_levels, candidate_levels):
+    """
+    Give a position in the ballot to each candidate, so that
+    every candidate receives the level of points required.
+
+    Parameters
+    ----------
+    position_levels : np.ndarray
+        The level of points of each position.
+    candidate_levels : np.ndarray
+        The level of points of each candidate. It must be
+        a permutation of :attr:`position_levels`.
+
+    Return
+    ------
+    np.ndarray
+        The position of each candidate.
+
+    Examples
+    --------
+    >>> _ballot_positions(np.array([1, 0, 0]), np.array([0, 0, 1]))
+    array([1, 2, 0])
+    """
+    positions = np.zeros(len(position_levels), dtype=int)
+    positions[np.argsort(candidate_levels, kind="stable")] = np.argsort(position_levels, kind="stable")
+    return positions
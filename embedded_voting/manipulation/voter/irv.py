@@ -1,10 +1,13 @@
 import numpy as np
-from embedded_voting.manipulation.voter.general import SingleVoterManipulationExtension
+from embedded_voting.manipulation.voter.general import SingleVoterManipulationExtension, _sortable
 from embedded_voting.scoring.singlewinner.ordinal import InstantRunoffExtension
 from embedded_voting.ratings.ratingsFromEmbeddings import RatingsFromEmbeddingsCorrelated
 from embedded_voting.embeddings.generator import EmbeddingsGeneratorPolarized
 from embedded_voting.scoring.singlewinner.svd import SVDNash
 from embedded_voting.ratings.ratings import Ratings
+from embedded_voting.ratings.rankings import Rankings
+from embedded_voting.utils.cached import cached_property
+import copy
 
 
 class SingleVoterManipulationIRV(SingleVoterManipulationExtension):
@@ -22,6 +25,9 @@ class SingleVoterManipulationIRV(SingleVoterManipulationExtension):
         The embeddings of the voters
     rule : ScoringRule
         The aggregation rule we want to analysis.
+    n_jobs : int
+        The number of worker processes used to analyse the voters.
+        If None, the voters are analysed in the current process.
 
     Examples
     --------
@@ -40,9 +46,10 @@ class SingleVoterManipulationIRV(SingleVoterManipulationExtension):
     [1, 1, 1, 1, 1, 1, 1, 1, 1, 1]
     """
 
-    def __init__(self, ratings, embeddings, rule=None):
-        ratings = Ratings(ratings)
-        super().__init__(ratings, embeddings, InstantRunoffExtension(ratings.n_candidates), rule)
+    def __init__(self, ratings, embeddings, rule=None, n_jobs=None):
+        if not isinstance(ratings, Rankings):
+            ratings = Ratings(ratings)
+        super().__init__(ratings, embeddings, InstantRunoffExtension(ratings.n_candidates), rule, n_jobs=n_jobs)
 
     def _create_fake_scores(self, eliminated, scores):
         """
@@ -63,67 +70,161 @@ class SingleVoterManipulationIRV(SingleVoterManipulationExtension):
 
         """
         n_voters, n_candidates = self.ratings.shape
+        rankings = np.argsort(np.array(scores), axis=1, kind="stable")[:, ::-1]
+        remaining = ~np.isin(rankings, eliminated)
         fake_profile = np.zeros((n_voters, n_candidates))
-        points = np.zeros(n_candidates)
-        points[0] = 1
+        fake_profile[np.arange(n_voters), rankings[np.arange(n_voters), np.argmax(remaining, axis=1)]] = 1
+        return fake_profile
 
-        for i in range(n_voters):
-            scores_i = scores[i].copy()
-            scores_i[eliminated] = 0
-            ord_i = np.argsort(scores_i)[::-1]
-            ord_i = np.argsort(ord_i)
-            fake_profile[i] = points[ord_i]
+    @cached_property
+    def _rankings_(self):
+        """
+        The candidates sorted by decreasing rating for every voter,
+        tied candidates being ranked by decreasing index, as in
+        :class:`~embedded_voting.InstantRunoffExtension`.
 
-        return fake_profile
+        Return
+        ------
+        np.ndarray
+            The ranking of each voter.
+        """
+        return np.argsort(np.array(self.ratings), axis=1, kind="stable")[:, ::-1]
+
+    @cached_property
+    def _fake_tops_table_(self):
+        """
+        The table of the top candidate of every voter in the fake
+        profiles, for each set of eliminated candidates already met.
+        The sets are represented by bitmasks. This table does
+        not depend on the manipulator, so it is shared by all voters.
+
+        Return
+        ------
+        dict
+            For each bitmask, the top candidate of every voter.
+        """
+        return {0: self._rankings_[:, 0]}
+
+    def _fake_tops(self, mask):
+        """
+        This function gives the top candidate of every voter once the
+        candidates of the bitmask :attr:`mask` are eliminated, i.e. the
+        candidate with 1 point in the fake profile of :meth:`_create_fake_scores`.
+
+        It is computed from the parent set, where the candidate with the
+        highest index is not eliminated yet: only the voters whose top
+        candidate is this one move to their next remaining candidate.
+
+        Parameters
+        ----------
+        mask : int
+            The bitmask of the eliminated candidates.
+
+        Return
+        ------
+        np.ndarray
+            The top candidate of every voter.
+        """
+        table = self._fake_tops_table_
+        if mask in table:
+            return table[mask]
+        n_candidates = self.ratings.n_candidates
+        eliminated = np.array([mask >> c & 1 for c in range(n_candidates)], dtype=bool)
+        last = np.flatnonzero(eliminated)[-1]
+        tops = self._fake_tops(mask ^ (1 << last)).copy()
+        changed = tops == last
+        rankings = self._rankings_[changed]
+        tops[changed] = rankings[np.arange(len(rankings)), np.argmax(~eliminated[rankings], axis=1)]
+        table[mask] = tops
+        return tops
+
+    @cached_property
+    def _fake_baselines_(self):
+        """
+        The table of the rule run on the fake profile of each set
+        of eliminated candidates already met. Like :attr:`_fake_tops_table_`,
+        it is shared by all voters.
+
+        Return
+        ------
+        dict
+            For each bitmask, a copy of the rule run on the fake profile.
+        """
+        return dict()
+
+    def _fake_baseline(self, mask):
+        """
+        This function gives the rule run on the fake profile where the
+        candidates of the bitmask :attr:`mask` are eliminated. The elections
+        where a voter changes its ballot are scored from it with
+        :meth:`~embedded_voting.ScoringRule.modified_scores`.
+
+        Parameters
+        ----------
+        mask : int
+            The bitmask of the eliminated candidates.
+
+        Return
+        ------
+        ScoringRule
+            The rule run on the fake profile.
+        """
+        table = self._fake_baselines_
+        if mask not in table:
+            n_voters, n_candidates = self.ratings.shape
+            fake_profile = np.zeros((n_voters, n_candidates))
+            fake_profile[np.arange(n_voters), self._fake_tops(mask)] = 1
+            table[mask] = copy.copy(self.extended_rule.rule)(fake_profile, self.embeddings)
+        return table[mask]
 
     def manipulation_voter(self, i):
-        ratings = self.ratings.copy()
-        ratings_i = self.ratings[i].copy()
-        preferences_order = np.argsort(ratings_i)[::-1]
+        preferences_order = np.argsort(self.ratings[i], kind="stable")[::-1]
 
-        n_candidates = self.ratings.shape[1]
+        n_candidates = self.ratings.n_candidates
 
         if preferences_order[0] == self.winner_:
             return self.winner_
 
         best_manipulation_i = np.where(preferences_order == self.winner_)[0][0]
 
-        queue_eliminated = [([], -1)]
+        # The subtree of a node only depends on the set of eliminated
+        # candidates and on the protected candidate `one`.
+        visited = set()
+        queue_eliminated = [([], 0, -1)]
 
         while len(queue_eliminated) > 0:
-            (el, one) = queue_eliminated.pop()
+            (el, mask, one) = queue_eliminated.pop()
 
             if len(el) == n_candidates:
                 winner = el[-1]
                 index_candidate = np.where(preferences_order == winner)[0][0]
                 if index_candidate < best_manipulation_i:
                     best_manipulation_i = index_candidate
-            else:
-                fake_profile = self._create_fake_scores(el, ratings)
-                fake_profile[i] = np.ones(n_candidates)
-                self.ratings = fake_profile
-                scores_max = self.extended_rule.rule(self.ratings, self.embeddings).scores_
+                continue
+            if (mask, one) in visited:
+                continue
+            visited.add((mask, one))
 
-                fake_profile[i] = np.zeros(n_candidates)
-                self.ratings = fake_profile
-                scores_min = self.extended_rule.rule(self.ratings, self.embeddings).scores_
+            new_ratings = np.array([[np.ones(n_candidates)], [np.zeros(n_candidates)]])
+            scores_max, scores_min = self._fake_baseline(mask).modified_scores([i], new_ratings)
 
-                all_scores = [(s, j, 1) for j, s in enumerate(scores_max) if j not in el]
-                all_scores += [(s, j, 0) for j, s in enumerate(scores_min) if j not in el]
+            all_scores = [(s, j, 1) for j, s in enumerate(_sortable(scores_max)) if not mask >> j & 1]
+            all_scores += [(s, j, 0) for j, s in enumerate(_sortable(scores_min)) if not mask >> j & 1]
 
-                all_scores.sort()
+            all_scores.sort()
 
-                if all_scores[0][1] == one:
-                    if all_scores[1][1] == one:
-                        queue_eliminated.append((el+[all_scores[0][1]], -1))
-                    else:
-                        queue_eliminated.append((el+[all_scores[1][1]], one))
-                else:
-                    queue_eliminated.append((el+[all_scores[0][1]], one))
-                    if all_scores[1][2] == 0 and one == -1:
-                        queue_eliminated.append((el+[all_scores[1][1]], all_scores[0][1]))
+            def child(candidate, protected):
+                return el + [candidate], mask | 1 << candidate, protected
 
-        self.ratings = ratings
+            if all_scores[0][1] == one:
+                if all_scores[1][1] == one:
+                    queue_eliminated.append(child(all_scores[0][1], -1))
+                else:
+                    queue_eliminated.append(child(all_scores[1][1], one))
+            else:
+                queue_eliminated.append(child(all_scores[0][1], one))
+                if all_scores[1][2] == 0 and one == -1:
+                    queue_eliminated.append(child(all_scores[1][1], all_scores[0][1]))
 
         best_manipulation = preferences_order[best_manipulation_i]
 
@@ -1,5 +1,5 @@
 import numpy as np
-from embedded_voting.manipulation.voter.general import SingleVoterManipulationExtension
+from embedded_voting.manipulation.voter.general import SingleVoterManipulationExtension, _sortable
 from embedded_voting.scoring.singlewinner.ordinal import KApprovalExtension
 from embedded_voting.ratings.ratingsFromEmbeddings import RatingsFromEmbeddingsCorrelated
 from embedded_voting.embeddings.generator import EmbeddingsGeneratorPolarized
@@ -22,6 +22,9 @@ class SingleVoterManipulationKApp(SingleVoterManipulationExtension):
         The k parameter for the k-approval rule.
     rule : ScoringRule
         The aggregation rule we want to analysis.
+    n_jobs : int
+        The number of worker processes used to analyse the voters.
+        If None, the voters are analysed in the current process.
 
     Examples
     --------
@@ -40,14 +43,13 @@ class SingleVoterManipulationKApp(SingleVoterManipulationExtension):
     [1, 1, 1, 1, 2, 2, 1, 1, 1, 1]
     """
 
-    def __init__(self, ratings, embeddings, k=2, rule=None):
+    def __init__(self, ratings, embeddings, k=2, rule=None, n_jobs=None):
         ratings = Ratings(ratings)
-        super().__init__(ratings, embeddings, KApprovalExtension(ratings.n_candidates, k=k), rule)
+        super().__init__(ratings, embeddings, KApprovalExtension(ratings.n_candidates, k=k), rule, n_jobs=n_jobs)
 
     def manipulation_voter(self, i):
-        fake_scores_i = self.extended_rule.fake_ratings_[i].copy()
         score_i = self.ratings[i].copy()
-        preferences_order = np.argsort(score_i)[::-1]
+        preferences_order = np.argsort(score_i, kind="stable")[::-1]
 
         k = int(np.sum(self.extension.points))
         n_candidates = self.ratings.n_candidates
@@ -56,14 +58,11 @@ class SingleVoterManipulationKApp(SingleVoterManipulationExtension):
         if preferences_order[0] == self.winner_:
             return self.winner_
 
-        self.extended_rule.fake_ratings_[i] = np.ones(n_candidates)
-        scores_max = self.extended_rule.base_rule(self.extended_rule.fake_ratings_, self.embeddings).scores_
-        self.extended_rule.fake_ratings_[i] = np.zeros(n_candidates)
-        scores_min = self.extended_rule.base_rule(self.extended_rule.fake_ratings_, self.embeddings).scores_
-        self.extended_rule.fake_ratings_[i] = fake_scores_i
+        new_ratings = np.array([[np.ones(n_candidates)], [np.zeros(n_candidates)]])
+        scores_max, scores_min = self._fake_baseline_.modified_scores([i], new_ratings)
 
-        all_scores = [(s, j, 1) for j, s in enumerate(scores_max)]
-        all_scores += [(s, j, 0) for j, s in enumerate(scores_min)]
+        all_scores = [(s, j, 1) for j, s in enumerate(_sortable(scores_max))]
+        all_scores += [(s, j, 0) for j, s in enumerate(_sortable(scores_min))]
 
         all_scores.sort()
         all_scores = all_scores[::-1]
@@ -3,3 +3,4 @@ from embedded_voting.ratings.ratingsGenerator import *
 from embedded_voting.ratings.ratings import *
 from embedded_voting.ratings.ratingsFromEmbeddings import *
 from embedded_voting.ratings.moving import *
+from embedded_voting.ratings.rankings import *
@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+"""
+Copyright Théo Delemazure
+theo.delemazure@ens.fr
+
+This file is part of Embedded Voting.
+"""
+import numpy as np
+from embedded_voting.ratings.ratings import Ratings
+
+
+class Rankings(np.ndarray):
+    """
+    This class contains the ordinal preferences of voters in a given
+    election, stored as the position of each candidate in the ranking
+    of each voter (`0` is the favorite candidate). The positions are
+    stored in the smallest unsigned integer type that can hold them.
+
+    A ranking can be truncated to its top `k` positions: the
+    candidates that are not ranked all have position `k`.
+
+    Parameters
+    ----------
+    positions: list, np.ndarray or Rankings
+        The position of each candidate in the ranking of each voter.
+        They should be non-negative integers. The ranked positions of each
+        voter are `0, ..., k - 1` and the other candidates have position `k`.
+    k : int
+        The number of ranked positions. By default, the rankings are complete.
+
+    Attributes
+    ----------
+    n_voters: int
+        The number of voters.
+    n_candidates: int
+        The number of candidates.
+    k : int
+        The number of ranked positions.
+
+    Examples
+    --------
+    >>> rankings = Rankings([[0, 2, 1], [2, 0, 1]])
+    >>> rankings
+    Rankings([[0, 2, 1],
+              [2, 0, 1]], dtype=uint8)
+    >>> rankings.n_voters, rankings.n_candidates, rankings.k
+    (2, 3, 3)
+    >>> rankings.orders()
+    array([[0, 2, 1],
+           [1, 2, 0]])
+    >>> Rankings.from_ratings([[.9, .1, .5, .3], [.2, .8, .4, .6]], k=2)
+    Rankings([[0, 2, 1, 2],
+              [2, 0, 2, 1]], dtype=uint8)
+    >>> Rankings([[0, 1.5]])
+    Traceback (most recent call last):
+    ...
+    ValueError: The positions should be integers.
+    >>> Rankings([[0, 0, 1]])
+    Traceback (most recent call last):
+    ...
+    ValueError: Each voter should rank its candidates at distinct positions 0, ..., k - 1.
+    """
+    def __new__(cls, positions, k=None):
+        positions = np.asarray(positions)
+        if positions.dtype.kind not in "ui" and not np.array_equal(positions, np.floor(positions)):
+            raise ValueError("The positions should be integers.")
+        if np.any(positions < 0):
+            raise ValueError("The positions should be non-negative.")
+        n_candidates = positions.shape[-1]
+        k = n_candidates if k is None else k
+        if positions.size > 0:
+            if positions.max() > k:
+                raise ValueError("The positions should be at most k.")
+            n_ranked = min(k, n_candidates)
+            expected = np.concatenate([np.arange(n_ranked), np.full(n_candidates - n_ranked, k)])
+            if not np.all(np.sort(positions, axis=-1) == expected):
+                raise ValueError("Each voter should rank its candidates at distinct positions 0, ..., k - 1.")
+        obj = positions.astype(cls._dtype(n_candidates), copy=False).view(cls)
+        obj.k = k
+        return obj
+
+    def __array_finalize__(self, obj):
+        if obj is None:
+            return
+        self.k = getattr(obj, "k", None)
+        if len(self.shape) == 2:
+            self.n_voters, self.n_candidates = self.shape
+            if self.k is None:
+                self.k = self.n_candidates
+
+    @staticmethod
+    def _dtype(n_candidates):
+        """
+        Return the smallest unsigned integer type
+        that can hold the positions of `n_candidates` candidates.
+        """
+        if n_candidates <= np.iinfo(np.uint8).max:
+            return np.uint8
+        if n_candidates <= np.iinfo(np.uint16).max:
+            return np.uint16
+        return np.uint32
+
+    @classmethod
+    def from_ratings(cls, ratings, k=None):
+        """
+        This function converts ratings into rankings.
+        Tied candidates are ranked by decreasing index, as in
+        :class:`~embedded_voting.PositionalRuleExtension`.
+
+        Parameters
+        ----------
+        ratings : Ratings or np.ndarray
+            The ratings of the voters.
+        k : int
+            The number of ranked positions. By default, the rankings are complete.
+
+        Return
+        ------
+        Rankings
+            The rankings of the voters.
+        """
+        ratings = np.asarray(ratings)
+        n_candidates = ratings.shape[1]
+        orders = np.argsort(ratings, axis=1, kind="stable")[:, ::-1]
+        return cls.from_orders(orders[:, :k], n_candidates)
+
+    @classmethod
+    def from_orders(cls, orders, n_candidates):
+        """
+        This function creates the rankings from the lists of candidates
+        ranked by each voter, from its favorite to the last one ranked.
+
+        Parameters
+        ----------
+        orders : np.ndarray
+            The ranked candidates of each voter. Of shape ``n_voters, k``.
+        n_candidates : int
+            The number of candidates.
+
+        Return
+        ------
+        Rankings
+            The rankings of the voters.
+
+        Examples
+        --------
+        >>> Rankings.from_orders([[2, 0], [1, 2]], 4)
+        Rankings([[1, 2, 0, 2],
+                  [2, 0, 1, 2]], dtype=uint8)
+        """
+        orders = np.asarray(orders)
+        n_voters, k = orders.shape
+        positions = np.full((n_voters, n_candidates), k, dtype=cls._dtype(n_candidates))
+        np.put_along_axis(positions, orders, np.arange(k, dtype=positions.dtype), axis=1)
+        return cls(positions, k=k)
+
+    def orders(self):
+        """
+        This function gives the candidates sorted by the
+        ranking of each voter. The candidates that are
+        not ranked are at the end, sorted by index.
+
+        Return
+        ------
+        np.ndarray
+            The candidates sorted by each voter.
+        """
+        return np.argsort(np.asarray(self), axis=1, kind="stable")
+
+    def to_ratings(self):
+        """
+        This function converts the rankings into ratings between `0` and `1`,
+        the candidate at position `i` getting `(k - i) / k`. The candidates
+        that are not ranked get `0`.
+
+        Return
+        ------
+        Ratings
+            The ratings of the voters.
+
+        Examples
+        --------
+        >>> Rankings([[0, 2, 1], [2, 0, 1]]).to_ratings()
+        Ratings([[1.        , 0.33333333, 0.66666667],
+                 [0.33333333, 1.        , 0.66666667]])
+        """
+        return Ratings((self.k - np.asarray(self, dtype=float)) / self.k)
@@ -14,8 +14,9 @@ class Ratings(np.ndarray):
 
     Parameters
     ----------
-    ratings: list, np.ndarray or Ratings
-        The ratings given by each voter to each candidate
+    ratings: list, np.ndarray, Ratings or Rankings
+        The ratings given by each voter to each candidate.
+        :class:`Rankings` are converted with :meth:`Rankings.to_ratings`.
 
     Attributes
     ----------
@@ -42,6 +43,9 @@ class Ratings(np.ndarray):
 
     """
     def __new__(cls, ratings):
+        from embedded_voting.ratings.rankings import Rankings
+        if isinstance(ratings, Rankings):
+            return ratings.to_ratings()
         obj = np.asarray(ratings).view(cls)
         return obj
 
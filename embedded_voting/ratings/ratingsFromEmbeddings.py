@@ -9,9 +9,10 @@ This file is part of Embedded Voting.
 import numpy as np
 from embedded_voting.embeddings.embeddings import Embeddings
 from embedded_voting.ratings.ratings import Ratings
+from embedded_voting.utils.rng import RandomMixin
 
 
-class RatingsFromEmbeddings:
+class RatingsFromEmbeddings(RandomMixin):
     """
     This abstract class is used to generate ratings from embeddings
 
@@ -19,6 +20,9 @@ class RatingsFromEmbeddings:
     ----------
     n_candidates: int
         The number of candidates wanted in the ratings
+    rng : None, int, np.random.SeedSequence or np.random.Generator
+        The source of random numbers. If None, the global random
+        state of numpy is used (cf. :class:`~embedded_voting.utils.rng.RandomMixin`).
 
     Attributes
     ----------
@@ -26,8 +30,9 @@ class RatingsFromEmbeddings:
         The number of candidates wanted in the ratings
     """
 
-    def __init__(self, n_candidates):
+    def __init__(self, n_candidates, rng=None):
         self.n_candidates = n_candidates
+        self.rng = rng
 
     def __call__(self, embeddings, *args):
         """
@@ -50,6 +55,9 @@ class RatingsFromEmbeddingsCorrelated(RatingsFromEmbeddings):
         An array with shape ``n_dim, n_candidates`` such that ``scores_matrix[i,j]`` determines the rating
         given by the group of voter in the dimension i to candidate j. If none is specified, a random one
         is generated
+    rng : None, int, np.random.SeedSequence or np.random.Generator
+        The source of random numbers. If None, the global random
+        state of numpy is used (cf. :class:`~embedded_voting.utils.rng.RandomMixin`).
 
     Attributes
     ----------
@@ -72,11 +80,11 @@ class RatingsFromEmbeddingsCorrelated(RatingsFromEmbeddings):
              [0.30300932, 0.35299726]])
     """
 
-    def __init__(self, n_candidates, n_dim, scores_matrix=None):
-        super().__init__(n_candidates)
+    def __init__(self, n_candidates, n_dim, scores_matrix=None, rng=None):
+        super().__init__(n_candidates, rng=rng)
         self.n_dim = n_dim
         if scores_matrix is None:
-            scores_matrix = np.random.rand(self.n_dim, self.n_candidates)
+            scores_matrix = self._random.random((self.n_dim, self.n_candidates))
         self.scores_matrix = np.array(scores_matrix)
 
     def __call__(self, embeddings, coherence=0, *args):
@@ -97,14 +105,55 @@ class RatingsFromEmbeddingsCorrelated(RatingsFromEmbeddings):
         ------
         Ratings
         """
-        embeddings = Embeddings(embeddings)
-        positions = np.array(embeddings)
-        n_voters = embeddings.n_voters
-        ratings = coherence * (positions ** 2).dot(self.scores_matrix)
-        ratings += (1 - coherence) * np.random.rand(n_voters, self.n_candidates)
-        ratings = np.minimum(ratings, 1)
-        ratings = np.maximum(ratings, 0)
-        return Ratings(ratings)
+        return Ratings(self.batch_ratings(embeddings, [coherence])[0])
+
+    def batch_ratings(self, embeddings, coherences, scores_matrices=None):
+        """
+        This method generates ratings from the same embeddings for several
+        coherences (and possibly several score matrices) at once. The part
+        of the ratings given by the score matrix is computed only once when
+        the score matrix is shared. The random numbers are drawn in the same
+        order as successive calls of the generator with each coherence.
+
+        Parameters
+        ----------
+        embeddings: Embeddings
+            The embeddings we want to use to obtain the ratings.
+        coherences: list or np.ndarray
+            The `C` coherences of the ratings (cf. :meth:`__call__`).
+        scores_matrices: np.ndarray
+            The score matrix of each coherence, of shape ``C, n_dim, n_candidates``,
+            or a single score matrix. By default, :attr:`scores_matrix` is used.
+
+        Return
+        ------
+        np.ndarray
+            The ratings for each coherence. Of shape ``C, n_voters, n_candidates``.
+
+        Examples
+        --------
+        >>> np.random.seed(42)
+        >>> embeddings = Embeddings(np.array([[0, 1], [1, 0], [1, 1]]), norm=True)
+        >>> generator = RatingsFromEmbeddingsCorrelated(2, 3, scores_matrix=np.array([[.8,.4],[.1,.7]]))
+        >>> generator.batch_ratings(embeddings, [.5, 1])
+        array([[[0.23727006, 0.82535715],
+                [0.76599697, 0.49932924],
+                [0.30300932, 0.35299726]],
+        <BLANKLINE>
+               [[0.1       , 0.7       ],
+                [0.8       , 0.4       ],
+                [0.45      , 0.55      ]]])
+        """
+        positions = np.array(Embeddings(embeddings))
+        coherences = np.asarray(coherences, dtype=float)[:, np.newaxis, np.newaxis]
+        if scores_matrices is None:
+            scores_matrices = self.scores_matrix
+        correlated = (positions ** 2) @ np.asarray(scores_matrices)
+        ratings = self._random.random((len(coherences), len(positions), self.n_candidates))
+        ratings *= 1 - coherences
+        ratings += coherences * correlated
+        np.clip(ratings, 0, 1, out=ratings)
+        return ratings
 
     def set_scores(self, scores_matrix=None):
         """
@@ -134,6 +183,6 @@ class RatingsFromEmbeddingsCorrelated(RatingsFromEmbeddings):
                [0.1, 0.7]])
         """
         if scores_matrix is None:
-            scores_matrix = np.random.rand(self.n_dim, self.n_candidates)
+            scores_matrix = self._random.random((self.n_dim, self.n_candidates))
         self.scores_matrix = np.array(scores_matrix)
         return self
@@ -6,11 +6,11 @@ theo.delemazure@ens.fr
 This file is part of Embedded Voting.
 """
 
-import numpy as np
 from embedded_voting.ratings.ratings import Ratings
+from embedded_voting.utils.rng import RandomMixin
 
 
-class RatingsGenerator:
+class RatingsGenerator(RandomMixin):
     """
     This abstract class creates Ratings from scratch using some function
 
@@ -18,6 +18,9 @@ class RatingsGenerator:
     __________
     n_voters: int
         Number of voters in the embeddings
+    rng : None, int, np.random.SeedSequence or np.random.Generator
+        The source of random numbers. If None, the global random
+        state of numpy is used (cf. :class:`~embedded_voting.utils.rng.RandomMixin`).
 
     Attributes
     ----------
@@ -25,8 +28,9 @@ class RatingsGenerator:
         Number of voters in the embeddings
 
     """
-    def __init__(self, n_voters):
+    def __init__(self, n_voters, rng=None):
         self.n_voters = n_voters
+        self.rng = rng
 
     def __call__(self, n_candidates, *args):
         """
@@ -46,6 +50,7 @@ class RatingsGeneratorUniform(RatingsGenerator):
 
     Examples
     --------
+    >>> import numpy as np
     >>> np.random.seed(42)
     >>> generator = RatingsGeneratorUniform(5)
     >>> generator(4)
@@ -57,4 +62,4 @@ class RatingsGeneratorUniform(RatingsGenerator):
     """
 
     def __call__(self, n_candidates, **kwargs):
-        return Ratings(np.random.rand(self.n_voters, n_candidates))
+        return Ratings(self._random.random((self.n_voters, n_candidates)))
@@ -2,6 +2,8 @@
 from embedded_voting.scoring.multiwinner.general import IterRule
 from embedded_voting.embeddings.generator import EmbeddingsGeneratorPolarized
 from embedded_voting.ratings.ratingsFromEmbeddings import RatingsFromEmbeddingsCorrelated
+from embedded_voting.embeddings.embeddings import Embeddings
+from embedded_voting.utils.cached import cached_property
 import numpy as np
 
 
@@ -57,11 +59,19 @@ class IterFeatures(IterRule):
             Of shape :attr:`~embedded_voting.Ratings.n_candidates`,
             :attr:`~embedded_voting.Embeddings.n_dim`.
         """
-        return np.dot(np.dot(np.linalg.inv(np.dot(embeddings.T, embeddings)), embeddings.T), scores).T
+        return np.dot(Embeddings(embeddings, norm=False).projection(), scores).T
+
+    @cached_property
+    def _projection_(self):
+        """
+        The matrix giving the features from the weighted ratings of the voters.
+        It is shared by all the rounds of the election.
+        """
+        return self.embeddings.projection()
 
     def _winner_k(self, winners):
 
-        features = self.compute_features(self.embeddings, np.dot(np.diag(self.weights), self.ratings))
+        features = np.dot(self._projection_, self.weights[:, np.newaxis] * np.array(self.ratings)).T
         scores = np.sum(features ** 2, axis=1)
 
         scores = np.array(scores)
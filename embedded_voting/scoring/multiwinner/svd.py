@@ -29,6 +29,17 @@ class IterSVD(IterRule):
         satisfaction is less than the :attr:`~embedded_voting.IterRule.quota`,
         we replace the quota by the total satisfaction.
         By default, it is set to False.
+    power_iteration : bool
+        If True, only the largest singular value and its vector are
+        computed for each candidate, by power iteration starting from
+        the vector of the candidate at the previous round. This is only
+        possible with the maximum as :attr:`aggregation_rule`.
+    tol : float
+        The tolerance of the power iteration, relative
+        to the largest eigenvalue of the Gram matrix.
+    max_iter : int
+        The maximal number of steps of the power iteration. The candidates
+        for which it has not converged are computed exactly.
 
     Examples
     --------
@@ -50,46 +61,105 @@ class IterSVD(IterRule):
                 [1., 0.],
                 [0., 1.],
                 [1., 0.]])
+    >>> IterSVD(4, power_iteration=True)(ratings, embeddings).winners_
+    [0, 1, 5, 2]
     """
 
-    def __init__(self, k=None, aggregation_rule=np.max, square_root=True, quota="classic", take_min=False):
+    def __init__(self, k=None, aggregation_rule=np.max, square_root=True, quota="classic", take_min=False,
+                 power_iteration=False, tol=1e-10, max_iter=100):
+        if power_iteration and aggregation_rule not in [np.max, np.amax, max]:
+            raise ValueError("The power iteration can only be used with the maximum as aggregation rule")
         self.aggregation_rule = aggregation_rule
         self.square_root = square_root
+        self.power_iteration = power_iteration
+        self.tol = tol
+        self.max_iter = max_iter
+        self._top_vectors = None
         super().__init__(k=k, quota=quota, take_min=take_min)
 
-    def _winner_k(self, winners):
-        vectors = []
-        scores = []
-
-        n_candidates = self.ratings.n_candidates
-        n_dim = self.embeddings.n_dim
-        for candidate in range(n_candidates):
-            if candidate in winners:
-                scores.append(0)
-                vectors.append(np.zeros(n_dim))
-                continue
-            if self.square_root:
-                embeddings = self.embeddings.scored(np.sqrt(self.ratings.candidate_ratings(candidate)))
-            else:
-                embeddings = self.embeddings.scored(self.ratings.candidate_ratings(candidate))
-
-            weights = self.weights
+    def _top_singular_pairs(self, grams, start):
+        """
+        This function computes the largest singular value and its vector
+        for each candidate, by power iteration on its Gram matrix.
 
-            if self.square_root:
-                weights = np.sqrt(weights)
-            embeddings = np.dot(np.diag(weights), embeddings)
+        A small uniform component is added to the initial vectors, so that
+        the iteration can leave the subspace of a previous top vector. The
+        value found is certainly the largest one when its square is more
+        than half the squared Frobenius norm of the Gram matrix, i.e. the sum
+        of the squared eigenvalues. The other candidates, and the ones for
+        which the iteration has not converged after :attr:`max_iter` steps,
+        are computed exactly.
 
-            _, s_values, s_vectors = np.linalg.svd(embeddings, full_matrices=False)
-            scores.append(self.aggregation_rule(s_values))
-            vec = s_vectors[0]
-            if vec.sum() < 0:
-                vec = -vec
-            vectors.append(vec)
+        Parameters
+        ----------
+        grams : np.ndarray
+            The Gram matrix of each candidate. Of shape ``n_candidates, n_dim, n_dim``.
+        start : np.ndarray
+            The initial unit vector of each candidate. Of shape ``n_candidates, n_dim``.
 
-        scores = np.array(scores)
-        scores[winners] = 0
+        Return
+        ------
+        np.ndarray
+            The largest singular value of each candidate.
+        np.ndarray
+            The corresponding right singular vector of each candidate.
+        """
+        vectors = np.array(start, dtype=float) + 1e-3 / np.sqrt(grams.shape[1])
+        vectors /= np.linalg.norm(vectors, axis=1)[:, np.newaxis]
+        values = np.zeros(len(grams))
+        todo = np.arange(len(grams))
+        for _ in range(self.max_iter):
+            products = np.einsum("cij,cj->ci", grams[todo], vectors[todo])
+            values[todo] = np.einsum("ci,ci->c", vectors[todo], products)
+            residuals = np.linalg.norm(products - values[todo, np.newaxis] * vectors[todo], axis=1)
+            converged = residuals <= self.tol * values[todo]
+            norms = np.linalg.norm(products, axis=1)
+            moving = ~converged & (norms > 0)
+            vectors[todo[moving]] = products[moving] / norms[moving, np.newaxis]
+            todo = todo[moving]
+            if len(todo) == 0:
+                break
+        squared_norms = np.einsum("cij,cij->c", grams, grams)
+        todo = np.union1d(todo, np.flatnonzero(2 * values ** 2 <= squared_norms * (1 + self.tol)))
+        if len(todo) > 0:
+            eigenvalues, eigenvectors = np.linalg.eigh(grams[todo])
+            values[todo] = eigenvalues[:, -1]
+            vectors[todo] = eigenvectors[:, :, -1]
+        return np.sqrt(np.maximum(values, 0)), vectors
 
+    def _winner_k(self, winners):
+        # The largest singular value and the first right singular vector of the weighted
+        # scored embeddings of a candidate are given by its d x d Gram matrix.
+        n_candidates = self.ratings.n_candidates
+        candidates = np.setdiff1d(np.arange(n_candidates), winners)
+        positions = np.array(self.embeddings)
+        coefficients = self.weights[:, np.newaxis] * np.array(self.ratings)[:, candidates]
+        if not self.square_root:
+            coefficients = coefficients ** 2
+        n_voters, n_dim = positions.shape
+        outer = (positions[:, :, np.newaxis] * positions[:, np.newaxis, :]).reshape(n_voters, n_dim ** 2)
+        grams = (coefficients.T @ outer).reshape(len(candidates), n_dim, n_dim)
+        scores = np.zeros(n_candidates)
+        if self.power_iteration:
+            if len(winners) == 0:
+                self._top_vectors = np.ones((n_candidates, n_dim)) / np.sqrt(n_dim)
+            scores[candidates], top_vectors = self._top_singular_pairs(grams, self._top_vectors[candidates])
+            self._top_vectors[candidates] = top_vectors
+        elif self.aggregation_rule in [np.max, np.amax, max]:
+            eigenvalues, eigenvectors = np.linalg.eigh(grams)
+            scores[candidates] = np.sqrt(np.maximum(eigenvalues[:, -1], 0))
+            top_vectors = eigenvectors[:, :, -1]
+        else:
+            # The square roots of the small eigenvalues of a Gram matrix are not accurate,
+            # so all the singular values are computed on the weighted scored embeddings.
+            weighted = np.sqrt(coefficients).T[:, :, np.newaxis] * positions
+            _, s_values, s_vectors = np.linalg.svd(weighted, full_matrices=False)
+            scores[candidates] = [self.aggregation_rule(s) for s in s_values]
+            top_vectors = s_vectors[:, 0]
         winner_j = np.argmax(scores)
-        vec = vectors[winner_j]
-
+        if winner_j in winners:
+            return winner_j, np.zeros(n_dim)
+        vec = top_vectors[np.searchsorted(candidates, winner_j)]
+        if vec.sum() < 0:
+            vec = -vec
         return winner_j, vec
@@ -35,6 +35,8 @@ class FeaturesRule(ScoringRule):
     [0.0289..., 1.0, 0.0]
     """
 
+    column_separable = True
+
     @cached_property
     def features_(self):
         """
@@ -47,13 +49,52 @@ class FeaturesRule(ScoringRule):
             The matrix of features.
             Its shape is :attr:`~embedded_voting.Ratings.n_candidates`, :attr:`~embedded_voting.Embeddings.n_dim`
         """
-        positions = np.array(self.embeddings_)
-        ratings = np.array(self.ratings_)
-        return np.dot(np.dot(np.linalg.pinv(np.dot(positions.T, positions)), positions.T), ratings).T
+        return np.dot(self._projection_, np.array(self.ratings_)).T
 
     def _score_(self, candidate):
         return (self.features_[candidate] ** 2).sum()
 
+    def batch_scores(self, ratings_stack, embeddings=None):
+        if embeddings is None:
+            return super().batch_scores(ratings_stack, embeddings)
+        features = np.matmul(Embeddings(embeddings).projection(), ratings_stack)
+        return (features ** 2).sum(axis=1)
+
+    @cached_property
+    def _projection_(self):
+        """
+        The matrix giving the features from the ratings of the voters.
+        Its shape is :attr:`~embedded_voting.Embeddings.n_dim`, :attr:`~embedded_voting.Ratings.n_voters`.
+        """
+        return self.embeddings_.projection()
+
+    def single_voter_scores(self, value):
+        """
+        Since the features are linear in the ratings, changing the ratings
+        of voter `i` by `delta` moves the feature of each candidate by
+        `delta` times the `i^th` column of the projection matrix.
+
+        Examples
+        --------
+        >>> ratings = Ratings(np.array([[.5, .6, .3], [.7, 0, .2], [.2, 1, .8]]))
+        >>> embeddings = Embeddings(np.array([[1, 1], [1, 0], [0, 1]]))
+        >>> election = FeaturesRule()(ratings, embeddings)
+        >>> election.single_voter_scores(0)[0]
+        array([0.22625, 0.625  , 0.305  ])
+        >>> np.round(FeaturesRule()(np.array([[0, 0, 0], [.7, 0, .2], [.2, 1, .8]]), embeddings).scores_, 8)
+        array([0.22625, 0.625  , 0.305  ])
+        """
+        projection = self._projection_
+        delta = value - np.array(self.ratings_)
+        cross = np.dot(projection.T, self.features_.T)
+        return (np.array(self.scores_) + 2 * delta * cross
+                + delta ** 2 * (projection ** 2).sum(axis=0)[:, np.newaxis])
+
+    def modified_scores(self, rows, new_ratings):
+        delta = new_ratings - np.array(self.ratings_)[rows]
+        features = self.features_ + np.einsum("dr,erc->ecd", self._projection_[:, rows], delta)
+        return (features ** 2).sum(axis=2)
+
     def plot_features(self, plot_kind="3D", dim=None, row_size=5, show=True):
         """
         This function plot the features vector of
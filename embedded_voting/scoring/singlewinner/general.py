@@ -6,6 +6,7 @@ theo.delemazure@ens.fr
 This file is part of Embedded Voting.
 """
 
+import copy
 import numpy as np
 
 from embedded_voting.ratings.ratings import Ratings
@@ -33,9 +34,14 @@ class ScoringRule(DeleteCacheMixin):
         The number of components in the aggregated
         score of every candidate. If `> 1`, we
         perform a lexical sort to obtain the ranking.
+    column_separable : bool
+        If True, when the embeddings are given, the aggregated score of
+        a candidate only depends on them and on the ratings of this candidate.
 
     """
 
+    column_separable = False
+
     def __init__(self, score_components=1, embedder=None):
         self.score_components = score_components
         self.ratings_ = None
@@ -119,6 +125,216 @@ class ScoringRule(DeleteCacheMixin):
         """
         return self.scores_[candidate]
 
+    def batch_scores(self, ratings_stack, embeddings=None):
+        """
+        Return the aggregated scores of all candidates in several
+        elections with the same voters and the same candidates.
+
+        By default, a copy of the rule is run on each ratings, so that
+        the current election of the rule is not modified. Rules that can
+        score all the elections at once override this function.
+
+        Parameters
+        ----------
+        ratings_stack : np.ndarray
+            The ratings of each election.
+            Of shape ``n_elections, n_voters, n_candidates``.
+        embeddings : Embeddings or list or np.ndarray
+            The embeddings of the voters, which are the same in every election.
+            If None, the embeddings of each election are given by :attr:`embedder`.
+
+        Return
+        ------
+        np.ndarray
+            The scores of the candidates in each election.
+            Of shape ``n_elections, n_candidates`` if :attr:`score_components` = 1,
+            and ``n_elections, n_candidates, score_components`` otherwise.
+        """
+        rule = copy.copy(self)
+        return np.array([rule(ratings, embeddings).scores_ for ratings in ratings_stack])
+
+    def batch_winners(self, ratings_stack, embeddings=None):
+        """
+        Return the winners of several elections with
+        the same voters and the same candidates.
+
+        Parameters
+        ----------
+        ratings_stack : np.ndarray
+            The ratings of each election.
+            Of shape ``n_elections, n_voters, n_candidates``.
+        embeddings : Embeddings or list or np.ndarray
+            The embeddings of the voters, which are the same in every election.
+            If None, the embeddings of each election are given by :attr:`embedder`.
+
+        Return
+        ------
+        np.ndarray
+            The index of the winner of each election.
+
+        Examples
+        --------
+        >>> from embedded_voting.scoring.singlewinner.trivialRules import SumScores
+        >>> ratings_stack = np.array([[[.5, .6, .3], [.7, 0, .2]], [[.5, .6, .3], [.2, 0, .9]]])
+        >>> SumScores().batch_winners(ratings_stack)
+        array([0, 2])
+        """
+        if self.score_components == 1:
+            return np.argsort(self.batch_scores(ratings_stack, embeddings), axis=1)[:, -1]
+        rule = copy.copy(self)
+        return np.array([rule(ratings, embeddings).winner_ for ratings in ratings_stack])
+
+    def _voter_weights(self, n_voters, embeddings=None):
+        """
+        Return the weights of the voters, for the rules whose
+        aggregated score of a candidate is the weighted sum of the
+        ratings it gets. This should be implemented for these rules
+        to enable :meth:`stream_scores`.
+
+        Parameters
+        ----------
+        n_voters : int
+            The number of voters.
+        embeddings : Embeddings or list or np.ndarray
+            The embeddings of the voters.
+
+        Return
+        ------
+        np.ndarray
+            The weight of each voter. Of size `n_voters`.
+        """
+        raise NotImplementedError
+
+    def stream_scores(self, chunks, embeddings=None):
+        """
+        Return the aggregated scores of all candidates, when the ratings
+        are given by chunks of candidates (cf.
+        :meth:`~embedded_voting.RatingsGeneratorEpistemic.iter_chunks`).
+        The ratings of all candidates are never held in memory at once.
+
+        By default, this is only possible for the rules whose aggregated
+        score of a candidate is a weighted sum of the ratings it gets
+        (cf. :meth:`_voter_weights`).
+
+        Parameters
+        ----------
+        chunks : iterable
+            The ratings of each chunk of candidates, in the order of the
+            candidates. Each chunk is of shape ``n_voters, chunk_size``.
+        embeddings : Embeddings or list or np.ndarray
+            The embeddings of the voters.
+
+        Return
+        ------
+        np.ndarray
+            The scores of all candidates.
+
+        Examples
+        --------
+        >>> from embedded_voting.scoring.singlewinner.trivialRules import SumScores
+        >>> chunks = [np.array([[.5, .6], [.7, 0], [.2, 1]]), np.array([[.3], [.2], [.8]])]
+        >>> SumScores().stream_scores(chunks)
+        array([1.4, 1.6, 1.3])
+        """
+        weights = None
+        scores = []
+        for ratings in chunks:
+            ratings = np.asarray(ratings, dtype=float)
+            if weights is None:
+                weights = self._voter_weights(len(ratings), embeddings)
+            scores.append(weights @ ratings)
+        return np.concatenate(scores)
+
+    def modified_scores(self, rows, new_ratings):
+        """
+        Return the aggregated scores of all candidates in several
+        variants of the current election, where the ratings of some
+        voters are replaced. The embeddings of the current election are kept.
+
+        By default, each variant is scored as a new election.
+        Rules with sufficient statistics of the current election
+        override this function, so that only the modified voters
+        are processed.
+
+        Parameters
+        ----------
+        rows : list or np.ndarray
+            The indexes of the modified voters.
+        new_ratings : np.ndarray
+            The new ratings of the modified voters in each variant.
+            Of shape ``n_variants, len(rows), n_candidates``.
+
+        Return
+        ------
+        np.ndarray
+            The scores of the candidates in each variant.
+            Of shape ``n_variants, n_candidates`` if :attr:`score_components` = 1,
+            and ``n_variants, n_candidates, score_components`` otherwise.
+
+        Examples
+        --------
+        >>> from embedded_voting.scoring.singlewinner.svd import SVDNash
+        >>> ratings = Ratings(np.array([[.5, .6, .3], [.7, 0, .2], [.2, 1, .8]]))
+        >>> embeddings = Embeddings(np.array([[1, 1], [1, 0], [0, 1]]))
+        >>> election = SVDNash()(ratings, embeddings)
+        >>> election.modified_scores([1], np.array([[[1, 1, 1]], [[0, 0, 0]]]))
+        array([[0.70710678, 1.26491106, 1.03440804],
+               [0.2236068 , 0.54772256, 0.34641016]])
+        >>> SVDNash()(np.array([[.5, .6, .3], [1, 1, 1], [.2, 1, .8]]), embeddings).scores_
+        [0.70710678..., 1.26491106..., 1.03440804...]
+        """
+        profiles = np.repeat(np.array(self.ratings_)[np.newaxis], len(new_ratings), axis=0)
+        profiles[:, rows] = new_ratings
+        return copy.copy(self).batch_scores(profiles, self.embeddings_)
+
+    def modified_winners(self, rows, new_ratings):
+        """
+        Return the winners of several variants of the current election,
+        where the ratings of some voters are replaced
+        (cf. :meth:`modified_scores`).
+
+        Parameters
+        ----------
+        rows : list or np.ndarray
+            The indexes of the modified voters.
+        new_ratings : np.ndarray
+            The new ratings of the modified voters in each variant.
+            Of shape ``n_variants, len(rows), n_candidates``.
+
+        Return
+        ------
+        np.ndarray
+            The index of the winner of each variant.
+        """
+        scores = self.modified_scores(rows, new_ratings)
+        if self.score_components == 1:
+            return np.argsort(scores, axis=1)[:, -1]
+        return np.array([np.lexsort(scores_variant.T[::-1])[-1] for scores_variant in scores])
+
+    def single_voter_scores(self, value):
+        """
+        Return the aggregated scores of all candidates when one voter
+        alone gives the rating `value` to every candidate, for each voter
+        of the current election. The embeddings are unchanged.
+
+        This should be implemented for the rules whose scores have
+        a closed form in the ratings of a single voter. It enables
+        the manipulation analysis to avoid running
+        one election for each voter.
+
+        Parameters
+        ----------
+        value : float
+            The rating given to every candidate by the voter.
+
+        Return
+        ------
+        np.ndarray
+            The scores of the candidates when each voter changes its ratings.
+            Of shape :attr:`~embedded_voting.Ratings.n_voters`, :attr:`~embedded_voting.Ratings.n_candidates`.
+        """
+        raise NotImplementedError
+
     @cached_property
     def scores_float_(self):
         """
@@ -189,7 +405,7 @@ class ScoringRule(DeleteCacheMixin):
         max_score = np.max(scores)
         min_score = np.min(scores)
         if max_score == min_score:
-            return np.ones(self.ratings_.n_voters)
+            return np.ones(self.ratings_.n_candidates)
         return list((scores - min_score) / (max_score - min_score))
 
     def plot_winner(self, plot_kind="3D", dim=None, fig=None, plot_position=None, show=True):
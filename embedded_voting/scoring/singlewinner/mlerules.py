@@ -1,6 +1,7 @@
 from embedded_voting.scoring.singlewinner.general import ScoringRule
 from embedded_voting.ratings.ratings import Ratings
 from embedded_voting.embeddings.embeddings import Embeddings
+from embedded_voting.utils.cached import cached_property
 import numpy as np
 
 
@@ -24,15 +25,33 @@ class MLEGaussian(ScoringRule):
     [0.70..., 1.0, 0.0]
     """
 
+    column_separable = True
+
     def __call__(self, ratings, embeddings=None):
         super().__call__(ratings, embeddings)
+        self._positions_are_ratings = embeddings is None
         if embeddings is None:
             positions = np.array(ratings)
         else:
             positions = np.array(self.embeddings_)
-        self.inverse_cov = np.linalg.pinv(np.cov(positions)).sum(axis=0)
+        self.inverse_cov = self._inverse_cov_sums(positions)
         return self
 
+    @staticmethod
+    def _inverse_cov_sums(positions):
+        """
+        Return the sum of each column of the pseudo-inverse
+        of the covariance matrix of the positions of the voters.
+        """
+        return np.linalg.pinv(np.cov(np.array(positions))).sum(axis=0)
+
+    @cached_property
+    def _weights_(self):
+        """
+        The weight of each voter in the scores of the candidates.
+        """
+        return self.inverse_cov / self.inverse_cov.sum()
+
     def _score_(self, candidate):
         scores = self.ratings_.candidate_ratings(candidate)
         sum_cov = self.inverse_cov
@@ -40,3 +59,38 @@ class MLEGaussian(ScoringRule):
         for i in range(len(scores)):
             score += scores[i]*sum_cov[i]
         return score/sum_cov.sum()
+
+    def batch_scores(self, ratings_stack, embeddings=None):
+        if embeddings is None:
+            return super().batch_scores(ratings_stack, embeddings)
+        weights = self._voter_weights(np.shape(ratings_stack)[1], embeddings)
+        return np.einsum("evc,v->ec", ratings_stack, weights)
+
+    def _voter_weights(self, n_voters, embeddings=None):
+        if embeddings is None:
+            # The covariance would be computed from the ratings of all candidates.
+            raise NotImplementedError
+        sum_cov = self._inverse_cov_sums(Embeddings(embeddings))
+        return sum_cov / sum_cov.sum()
+
+    def single_voter_scores(self, value):
+        """
+        Examples
+        --------
+        >>> ratings = Ratings(np.array([[.5, .6, .3], [.7, 0, .2], [.2, 1, .8]]))
+        >>> embeddings = Embeddings(np.array([[1, 1], [1, 0], [0, 1]]))
+        >>> election = MLEGaussian()(ratings, embeddings)
+        >>> election.single_voter_scores(1)[2]
+        array([1.3, 2. , 1.8])
+        >>> MLEGaussian()(np.array([[.5, .6, .3], [.7, 0, .2], [1, 1, 1]]), embeddings).scores_
+        [1.3, 2.0, 1.8]
+        """
+        if self._positions_are_ratings:
+            raise NotImplementedError
+        return np.array(self.scores_) + self._weights_[:, np.newaxis] * (value - np.array(self.ratings_))
+
+    def modified_scores(self, rows, new_ratings):
+        if self._positions_are_ratings:
+            return super().modified_scores(rows, new_ratings)
+        delta = new_ratings - np.array(self.ratings_)[rows]
+        return np.array(self.scores_) + np.einsum("erc,r->ec", delta, self._weights_[rows])
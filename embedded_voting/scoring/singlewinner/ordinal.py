@@ -5,10 +5,12 @@ theo.delemazure@ens.fr
 
 This file is part of Embedded Voting.
 """
+import copy
 import numpy as np
 from embedded_voting.scoring.singlewinner.general import ScoringRule
 from embedded_voting.scoring.singlewinner.svd import *
 from embedded_voting.embeddings.embeddingsFromRatings import EmbeddingsFromRatingsIdentity
+from embedded_voting.ratings.rankings import Rankings
 
 
 class PositionalRuleExtension(ScoringRule):
@@ -28,6 +30,16 @@ class PositionalRuleExtension(ScoringRule):
         The aggregation rule used to
         determine the aggregated scores
         of the candidates.
+    tie_breaking : str
+        How the candidates with the same rating are ranked.
+        With ``'reverse'`` (the default), the candidate with the highest
+        index is ranked first. With ``'stable'``, the candidate with the
+        lowest index is ranked first. With ``'random'``, each voter ranks
+        them in a random order, which only depends on :attr:`seed`.
+        With ``'average'``, they all get the mean of the points of the
+        positions they share.
+    seed : int
+        The seed of the random tie-breaking.
 
     Attributes
     ----------
@@ -66,18 +78,32 @@ class PositionalRuleExtension(ScoringRule):
              [1. , 0.5, 0. , 0.5]])
     >>> election_bis.set_rule(SVDNash())(ratings, embeddings).ranking_
     [1, 3, 0, 2]
+
+    The rankings of the voters can also be given directly:
+
+    >>> rankings = Rankings.from_ratings(ratings)
+    >>> election_bis(rankings, embeddings).ranking_
+    [1, 3, 0, 2]
     """
 
-    def __init__(self, points, rule=None):
+    def __init__(self, points, rule=None, tie_breaking="reverse", seed=None):
         super().__init__()
+        if tie_breaking not in ["reverse", "stable", "random", "average"]:
+            raise ValueError("tie_breaking should be 'reverse', 'stable', 'random' or 'average'")
         self.points = points
         self.base_rule = rule
+        self.tie_breaking = tie_breaking
+        self.seed = seed
+        self._seed_sequence = np.random.SeedSequence(seed)
         if rule is not None:
             self.score_components = rule.score_components
         self._rule = None
 
     def __call__(self, ratings, embeddings=None):
-        self.ratings_ = Ratings(ratings)
+        if isinstance(ratings, Rankings):
+            self.ratings_ = ratings
+        else:
+            self.ratings_ = Ratings(ratings)
         if embeddings is None:
             embeddings = EmbeddingsFromRatingsIdentity()(self.ratings_)
         self.embeddings_ = Embeddings(embeddings)
@@ -106,30 +132,190 @@ class PositionalRuleExtension(ScoringRule):
         self.delete_cache()
         return self
 
-    def _create_fake_ratings(self):
+    def _create_fake_ratings(self, ratings=None, out=None, rows=None):
         """
         This function creates the
         fake ratings for the election
         (using the :attr:`points` vector).
 
+        The candidates of every voter are sorted at once. Tied
+        candidates are ordered according to :attr:`tie_breaking`.
+
+        Parameters
+        ----------
+        ratings : np.ndarray or Rankings
+            The ratings to convert, the candidates being on the last axis.
+            By default, the ratings of the current election. For
+            :class:`~embedded_voting.Rankings`, the points are read directly
+            from the positions. The candidates that are not ranked are tied,
+            as in :meth:`~embedded_voting.Rankings.to_ratings`: with ``'average'``,
+            they get the mean of the remaining points.
+        out : np.ndarray
+            A buffer of the same shape as :attr:`ratings`, in which the
+            fake ratings are written. If None, a new array is created.
+        rows : list
+            The indexes of the voters whose ratings are given, used by
+            the random tie-breaking. By default, all the voters are given.
+
         Return
         ------
         np.ndarray
             The fake ratings.
+
+        Examples
+        --------
+        >>> ratings = np.array([[.8, .2, .8, .5], [.1, .1, .1, .1]])
+        >>> PositionalRuleExtension([3, 2, 1, 0])._create_fake_ratings(ratings)
+        array([[0.66666667, 0.        , 1.        , 0.33333333],
+               [0.        , 0.33333333, 0.66666667, 1.        ]])
+        >>> PositionalRuleExtension([3, 2, 1, 0], tie_breaking="stable")._create_fake_ratings(ratings)
+        array([[1.        , 0.        , 0.66666667, 0.33333333],
+               [1.        , 0.66666667, 0.33333333, 0.        ]])
+        >>> PositionalRuleExtension([3, 2, 1, 0], tie_breaking="average")._create_fake_ratings(ratings)
+        array([[0.83333333, 0.        , 0.83333333, 0.33333333],
+               [0.5       , 0.5       , 0.5       , 0.5       ]])
         """
+        if ratings is None:
+            ratings = self.ratings_
         points = np.array(self.points)/np.max(self.points)
-        fake_ratings = np.zeros(self.ratings_.shape)
-        for i in range(self.ratings_.n_voters):
-            scores_i = self.ratings_.voter_ratings(i)
-            ord_i = np.argsort(scores_i)[::-1]
-            ord_i = np.argsort(ord_i)
-            fake_ratings[i] = points[ord_i]
-
-        return fake_ratings
+        if isinstance(ratings, Rankings):
+            if ratings.k >= len(points):
+                return np.take(points, np.asarray(ratings), out=out)
+            if self.tie_breaking == "average":
+                # The candidates that are not ranked share the remaining points.
+                points = np.append(points[:ratings.k], points[ratings.k:].mean())
+                return np.take(points, np.asarray(ratings), out=out)
+            # The candidates that are not ranked are tied at the last position.
+            ratings = -np.asarray(ratings, dtype=int)
+        ratings = np.asarray(ratings)
+        n_candidates = ratings.shape[-1]
+        flat_ratings = ratings.reshape(-1, n_candidates)
+        if self.tie_breaking == "random":
+            # The random order of a voter is the same at each call.
+            voters = np.arange(ratings.shape[-2]) if rows is None else np.asarray(rows)
+            keys = np.random.default_rng(self._seed_sequence).random((voters.max(initial=-1) + 1, n_candidates))
+            keys = np.broadcast_to(keys[voters], ratings.shape).reshape(-1, n_candidates)
+            order = np.lexsort((keys, -flat_ratings), axis=1)
+        elif self.tie_breaking == "stable":
+            order = np.argsort(-flat_ratings, axis=1, kind="stable")
+        else:
+            order = np.argsort(flat_ratings, axis=1, kind="stable")[:, ::-1]
+        if out is None:
+            out = np.empty(ratings.shape)
+        flat_out = out.reshape(-1, n_candidates)
+        if self.tie_breaking == "average":
+            # Tied candidates share the mean of the points of their positions.
+            sorted_ratings = np.take_along_axis(flat_ratings, order, axis=1)
+            starts = np.ones(sorted_ratings.shape, dtype=bool)
+            starts[:, 1:] = sorted_ratings[:, 1:] != sorted_ratings[:, :-1]
+            groups = np.cumsum(starts.ravel()) - 1
+            sums = np.bincount(groups, weights=np.tile(points, len(flat_ratings)))
+            sorted_points = (sums / np.bincount(groups))[groups].reshape(sorted_ratings.shape)
+        else:
+            sorted_points = np.broadcast_to(points, order.shape)
+        np.put_along_axis(flat_out, order, sorted_points, axis=1)
+        return out
 
     def _score_(self, candidate):
         return self._rule.scores_[candidate]
 
+    def batch_scores(self, ratings_stack, embeddings=None):
+        ratings_stack = np.array(ratings_stack)
+        if embeddings is None:
+            embeddings = EmbeddingsFromRatingsIdentity()(Ratings(ratings_stack[0]))
+        return self.base_rule.batch_scores(self._create_fake_ratings(ratings_stack), embeddings)
+
+    def batch_winners(self, ratings_stack, embeddings=None):
+        ratings_stack = np.array(ratings_stack)
+        if embeddings is None:
+            embeddings = EmbeddingsFromRatingsIdentity()(Ratings(ratings_stack[0]))
+        return self.base_rule.batch_winners(self._create_fake_ratings(ratings_stack), embeddings)
+
+    def stream_scores(self, chunks, embeddings=None):
+        """
+        Return the aggregated scores of all candidates, when the ratings
+        are given by chunks of candidates (cf.
+        :meth:`~embedded_voting.ScoringRule.stream_scores`).
+        The :attr:`base_rule` must support :meth:`stream_scores`
+        and the tie breaking must be ``'reverse'`` or ``'stable'``.
+
+        Only the points that differ from the longest run of equal
+        points are given to specific candidates (e.g. the first
+        position for plurality). Thus, for each voter, only the
+        candidates at these positions are kept from chunk to chunk.
+        For the Borda rule, all candidates are kept.
+
+        Parameters
+        ----------
+        chunks : iterable
+            The ratings of each chunk of candidates, in the order of the
+            candidates. Each chunk is of shape ``n_voters, chunk_size``.
+        embeddings : Embeddings or list or np.ndarray
+            The embeddings of the voters.
+
+        Return
+        ------
+        np.ndarray
+            The scores of all candidates.
+
+        Examples
+        --------
+        >>> from embedded_voting.scoring.singlewinner.trivialRules import SumScores
+        >>> ratings = np.array([[.1, .2, .8, 1], [.7, .9, .8, .6], [1, .6, .1, .3]])
+        >>> extension = KApprovalExtension(4, k=2, rule=SumScores())
+        >>> extension.stream_scores([ratings[:, :3], ratings[:, 3:]])
+        array([1., 2., 2., 1.])
+        >>> extension(ratings).scores_
+        [1.0, 2.0, 2.0, 1.0]
+        """
+        if self.tie_breaking not in ["reverse", "stable"]:
+            raise NotImplementedError
+        points = np.array(self.points)/np.max(self.points)
+        n_candidates = len(points)
+        starts = np.flatnonzero(np.diff(points, prepend=np.nan) != 0)
+        ends = np.append(starts[1:], n_candidates)
+        longest = np.argmax(ends - starts)
+        n_top, n_bottom = starts[longest], n_candidates - ends[longest]
+        middle = points[starts[longest]]
+        weights = None
+        n_seen = 0
+        for ratings in chunks:
+            ratings = np.asarray(ratings, dtype=float)
+            if weights is None:
+                if embeddings is None:
+                    embeddings = EmbeddingsFromRatingsIdentity()(Ratings(ratings))
+                weights = self.base_rule._voter_weights(len(ratings), embeddings)
+                kept_ratings = np.empty((len(ratings), 0))
+                kept_candidates = np.empty((len(ratings), 0), dtype=int)
+            candidates = np.broadcast_to(np.arange(n_seen, n_seen + ratings.shape[1]), ratings.shape)
+            kept_ratings = np.hstack((kept_ratings, ratings))
+            kept_candidates = np.hstack((kept_candidates, candidates))
+            n_seen += ratings.shape[1]
+            # The ties are broken by the index of the candidates.
+            tie_keys = kept_candidates if self.tie_breaking == "reverse" else -kept_candidates
+            order = np.lexsort((tie_keys, kept_ratings), axis=1)[:, ::-1]
+            if order.shape[1] > n_top + n_bottom:
+                order = np.hstack((order[:, :n_top], order[:, order.shape[1] - n_bottom:]))
+            kept_ratings = np.take_along_axis(kept_ratings, order, axis=1)
+            kept_candidates = np.take_along_axis(kept_candidates, order, axis=1)
+        if n_seen != n_candidates:
+            raise ValueError("The chunks should contain %i candidates." % n_candidates)
+        kept_points = np.append(points[:n_top], points[n_candidates - n_bottom:]) - middle
+        return middle * weights.sum() + np.bincount(
+            kept_candidates.ravel(), weights=(weights[:, np.newaxis] * kept_points).ravel(),
+            minlength=n_candidates)
+
+    @cached_property
+    def _fake_rule_(self):
+        """
+        A copy of the base rule, run on the fake ratings of the current election.
+        """
+        return copy.copy(self.base_rule)(self.fake_ratings_, self.embeddings_)
+
+    def modified_scores(self, rows, new_ratings):
+        # The fake ratings of a voter only depend on its own ratings.
+        return self._fake_rule_.modified_scores(rows, self._create_fake_ratings(new_ratings, rows=rows))
+
     def plot_fake_ratings(self, plot_kind="3D", dim=None, list_candidates=None,
                           list_titles=None, row_size=5, show=True):
         """
@@ -182,6 +368,11 @@ class PluralityExtension(PositionalRuleExtension):
         The aggregation rule used to
         determine the aggregated scores
         of the candidates.
+    tie_breaking : str
+        How the candidates with the same rating are ranked
+        (cf. :class:`PositionalRuleExtension`).
+    seed : int
+        The seed of the random tie-breaking.
 
     Examples
     --------
@@ -196,9 +387,9 @@ class PluralityExtension(PositionalRuleExtension):
     [3, 1, 0, 2]
     """
 
-    def __init__(self, n_candidates,  rule=None):
+    def __init__(self, n_candidates,  rule=None, tie_breaking="reverse", seed=None):
         points = [1] + [0]*(n_candidates-1)
-        super().__init__(points, rule)
+        super().__init__(points, rule, tie_breaking, seed)
 
 
 class KApprovalExtension(PositionalRuleExtension):
@@ -217,7 +408,11 @@ class KApprovalExtension(PositionalRuleExtension):
         The aggregation rule used to
         determine the aggregated scores
         of the candidates.
-
+    tie_breaking : str
+        How the candidates with the same rating are ranked
+        (cf. :class:`PositionalRuleExtension`).
+    seed : int
+        The seed of the random tie-breaking.
 
     Examples
     --------
@@ -231,11 +426,11 @@ class KApprovalExtension(PositionalRuleExtension):
     >>> election.ranking_
     [2, 1, 3, 0]
     """
-    def __init__(self, n_candidates, k=2, rule=None):
+    def __init__(self, n_candidates, k=2, rule=None, tie_breaking="reverse", seed=None):
         if k >= n_candidates:
             raise ValueError("k should be < n_candidates")
         points = [1]*k + [0]*(n_candidates-k)
-        super().__init__(points, rule)
+        super().__init__(points, rule, tie_breaking, seed)
 
 
 class VetoExtension(PositionalRuleExtension):
@@ -250,6 +445,11 @@ class VetoExtension(PositionalRuleExtension):
         The aggregation rule used to
         determine the aggregated scores
         of the candidates.
+    tie_breaking : str
+        How the candidates with the same rating are ranked
+        (cf. :class:`PositionalRuleExtension`).
+    seed : int
+        The seed of the random tie-breaking.
 
     Examples
     --------
@@ -263,9 +463,9 @@ class VetoExtension(PositionalRuleExtension):
     >>> election.ranking_
     [1, 3, 2, 0]
     """
-    def __init__(self, n_candidates, rule=None):
+    def __init__(self, n_candidates, rule=None, tie_breaking="reverse", seed=None):
         points = [1]*(n_candidates-1) + [0]
-        super().__init__(points, rule)
+        super().__init__(points, rule, tie_breaking, seed)
 
 
 class BordaExtension(PositionalRuleExtension):
@@ -280,6 +480,11 @@ class BordaExtension(PositionalRuleExtension):
         The aggregation rule used to
         determine the aggregated scores
         of the candidates.
+    tie_breaking : str
+        How the candidates with the same rating are ranked
+        (cf. :class:`PositionalRuleExtension`).
+    seed : int
+        The seed of the random tie-breaking.
 
     Examples
     --------
@@ -293,9 +498,9 @@ class BordaExtension(PositionalRuleExtension):
     >>> election.ranking_
     [1, 3, 2, 0]
     """
-    def __init__(self, n_candidates, rule=None):
+    def __init__(self, n_candidates, rule=None, tie_breaking="reverse", seed=None):
         points = [n_candidates-i-1 for i in range(n_candidates)]
-        super().__init__(points, rule)
+        super().__init__(points, rule, tie_breaking, seed)
 
 
 class InstantRunoffExtension(ScoringRule):
@@ -320,6 +525,8 @@ class InstantRunoffExtension(ScoringRule):
     >>> election = InstantRunoffExtension(SVDNash())(ratings, embeddings)
     >>> election.ranking_
     [1, 3, 2, 0]
+    >>> election(Rankings.from_ratings(ratings, k=2), embeddings).ranking_
+    [1, 3, 2, 0]
     """
 
     def __init__(self,  rule=None):
@@ -327,7 +534,8 @@ class InstantRunoffExtension(ScoringRule):
         self.rule = rule
 
     def __call__(self, ratings, embeddings=None):
-        ratings = Ratings(ratings)
+        if not isinstance(ratings, Rankings):
+            ratings = Ratings(ratings)
         if embeddings is None:
             embeddings = EmbeddingsFromRatingsIdentity()(ratings)
         self.embeddings_ = Embeddings(embeddings)
@@ -343,39 +551,152 @@ class InstantRunoffExtension(ScoringRule):
     def _score_(self, candidate):
         raise NotImplementedError
 
+    def batch_winners(self, ratings_stack, embeddings=None):
+        rule = copy.copy(self)
+        return np.array([rule(ratings, embeddings).winner_ for ratings in ratings_stack])
+
+    def modified_winners(self, rows, new_ratings):
+        if isinstance(self.ratings_, Rankings):
+            n_candidates = self.ratings_.n_candidates
+            new_rankings = Rankings.from_ratings(np.reshape(new_ratings, (-1, n_candidates)))
+            profiles = np.repeat(np.array(self.ratings_)[np.newaxis], len(new_ratings), axis=0)
+            profiles[:, rows] = np.reshape(new_rankings, np.shape(new_ratings))
+            profiles = [Rankings(profile, k=self.ratings_.k) for profile in profiles]
+        else:
+            profiles = np.repeat(np.array(self.ratings_)[np.newaxis], len(new_ratings), axis=0)
+            profiles[:, rows] = new_ratings
+        return copy.copy(self).batch_winners(profiles, self.embeddings_)
+
+    @cached_property
+    def _rankings_(self):
+        """
+        The candidates sorted by decreasing rating for every voter.
+        Tied candidates are ranked by decreasing index.
+
+        Return
+        ------
+        np.ndarray
+            The ranking of each voter. Of shape
+            :attr:`~embedded_voting.Ratings.n_voters`, :attr:`~embedded_voting.Ratings.n_candidates`.
+        """
+        if isinstance(self.ratings_, Rankings):
+            return self.ratings_.orders()
+        return np.argsort(np.array(self.ratings_), axis=1, kind="stable")[:, ::-1]
+
+    @staticmethod
+    def _ranking_from_scores(scores):
+        """
+        This function sorts the candidates by decreasing
+        scores, as in :attr:`~embedded_voting.ScoringRule.ranking_`.
+
+        Parameters
+        ----------
+        scores : np.ndarray
+            The scores of the candidates, with one column
+            per score component if there are several.
+
+        Return
+        ------
+        np.ndarray
+            The ranking of the candidates.
+        """
+        if scores.ndim == 1:
+            return np.argsort(scores)[::-1]
+        return np.lexsort(scores.T[::-1])[::-1]
+
     @cached_property
     def ranking_(self):
-        n_candidates = self.ratings_.n_candidates
+        """
+        Return the ranking of the candidates, from the
+        last eliminated candidate to the first one.
+
+        The ranking of each voter is computed once. After each round,
+        only the voters whose top candidate was just eliminated move
+        to their next candidate, and the base rule scores the new fake
+        ratings from the previous ones with
+        :meth:`~embedded_voting.ScoringRule.modified_scores`. With truncated
+        :class:`~embedded_voting.Rankings`, the voters whose ranked candidates
+        are all eliminated give `0` to every candidate.
+
+        Return
+        ------
+        int list
+            The ranking of the candidates.
+        """
+        n_voters, n_candidates = self.ratings_.shape
+        n_ranked = self._n_ranked()
+        rankings = self._rankings_
+        positions = np.zeros(n_voters, dtype=int)
+        eliminated = np.zeros(n_candidates, dtype=bool)
+        tops = rankings[:, 0].copy() if n_ranked > 0 else np.full(n_voters, -1)
+        fake_ratings = np.zeros((n_voters, n_candidates))
+        fake_ratings[tops >= 0, tops[tops >= 0]] = 1
+        changed = np.ones(n_voters, dtype=bool)
         ranking = np.zeros(n_candidates, dtype=int)
-        eliminated = []
         for i in range(n_candidates):
-            fake_ratings = self._create_fake_ratings(eliminated)
-            rule_i = self.rule(fake_ratings, self.embeddings_)
-            loser = rule_i.ranking_[n_candidates-1-i]
+            rows = np.flatnonzero(changed)
+            if len(rows) > n_voters // 2:
+                # Too many voters changed: the base rule is run again.
+                baseline = copy.copy(self.rule)(fake_ratings.copy(), self.embeddings_)
+                changed[:] = False
+                scores = np.array(baseline.scores_)
+            elif len(rows) == 0:
+                scores = np.array(baseline.scores_)
+            else:
+                scores = baseline.modified_scores(rows, fake_ratings[rows][np.newaxis])[0]
+            order = self._ranking_from_scores(scores)
+            loser = order[~eliminated[order]][-1]
             ranking[n_candidates-i-1] = loser
-            eliminated.append(loser)
+            eliminated[loser] = True
+            if i == n_candidates - 1:
+                break
+
+            moved = np.flatnonzero(tops == loser)
+            fake_ratings[moved, loser] = 0
+            voters = moved
+            while len(voters) > 0:
+                positions[voters] += 1
+                voters = voters[positions[voters] < n_ranked]
+                voters = voters[eliminated[rankings[voters, positions[voters]]]]
+            tops[moved] = -1
+            moved_on = moved[positions[moved] < n_ranked]
+            tops[moved_on] = rankings[moved_on, positions[moved_on]]
+            fake_ratings[moved_on, tops[moved_on]] = 1
+            changed[moved] = True
         return list(ranking)
 
+    def _n_ranked(self):
+        """
+        Return the number of candidates ranked by each voter: all of them,
+        unless the election is run on truncated :class:`~embedded_voting.Rankings`.
+        """
+        if isinstance(self.ratings_, Rankings):
+            return min(self.ratings_.k, self.ratings_.n_candidates)
+        return self.ratings_.n_candidates
+
     def _create_fake_ratings(self, eliminated):
         """
         This function creates a fake ratings for the election, based
         on the candidates already eliminated during the previous
-        steps.
+        steps: each voter gives `1` to its favorite candidate
+        among the remaining ones, and `0` to the others. The voters
+        whose ranked candidates are all eliminated give `0` to every candidate.
+
+        Parameters
+        ----------
+        eliminated : int list
+            The candidates already eliminated.
 
         Return
         ------
         np.ndarray
             The fake ratings.
         """
-        fake_ratings = np.zeros(self.ratings_.shape)
-        points = np.zeros(self.ratings_.n_candidates)
-        points[0] = 1
-
-        for i in range(self.ratings_.n_voters):
-            scores_i = self.ratings_[i].copy()
-            scores_i[eliminated] = 0
-            ord_i = np.argsort(scores_i)[::-1]
-            ord_i = np.argsort(ord_i)
-            fake_ratings[i] = points[ord_i]
-
+        n_voters, n_candidates = self.ratings_.shape
+        rankings = self._rankings_[:, :self._n_ranked()]
+        remaining = ~np.isin(rankings, eliminated)
+        voters = np.flatnonzero(np.any(remaining, axis=1))
+        fake_ratings = np.zeros((n_voters, n_candidates))
+        if len(voters) > 0:
+            fake_ratings[voters, rankings[voters, np.argmax(remaining[voters], axis=1)]] = 1
         return fake_ratings
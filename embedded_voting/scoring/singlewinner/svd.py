@@ -62,6 +62,9 @@ class SVDRule(ScoringRule):
     [1.0, 0.0, 0.16044515869439538]
 
     """
+
+    column_separable = True
+
     def __init__(self, aggregation_rule=np.prod, square_root=True, use_rank=False):
         score_components = 1
         if use_rank:
@@ -91,6 +94,55 @@ class SVDRule(ScoringRule):
         else:
             return self.aggregation_rule(s)
 
+    def batch_scores(self, ratings_stack, embeddings=None):
+        if embeddings is None or self.use_rank:
+            return super().batch_scores(ratings_stack, embeddings)
+        positions = np.array(Embeddings(embeddings))
+        if positions.shape[1] == 0:
+            return super().batch_scores(ratings_stack, embeddings)
+
+        # Scored embeddings of each candidate in each election, of shape
+        # n_elections, n_candidates, n_voters, n_dim.
+        scored = np.sqrt(np.swapaxes(ratings_stack, 1, 2))[..., np.newaxis] * positions
+        if positions.shape[0] < positions.shape[1]:
+            embeddings_matrix = np.matmul(scored, np.swapaxes(scored, 2, 3))
+        else:
+            embeddings_matrix = np.matmul(np.swapaxes(scored, 2, 3), scored)
+
+        s = np.linalg.eigvals(embeddings_matrix)
+        s = np.sqrt(np.maximum(s, 0))
+        return np.array([[self.aggregation_rule(s_c) for s_c in s_e] for s_e in s])
+
+    @cached_property
+    def _gram_(self):
+        """
+        The Gram matrix of the scored embeddings of each candidate,
+        i.e. the sum of the outer products of the embeddings of the
+        voters, weighted by their ratings.
+        Its shape is :attr:`~embedded_voting.Ratings.n_candidates`,
+        :attr:`~embedded_voting.Embeddings.n_dim`, :attr:`~embedded_voting.Embeddings.n_dim`.
+        """
+        positions = np.array(self.embeddings_)
+        return np.einsum("vc,vi,vj->cij", np.array(self.ratings_), positions, positions)
+
+    def modified_scores(self, rows, new_ratings):
+        positions = np.array(self.embeddings_)
+        if self.use_rank or positions.shape[1] == 0 or positions.shape[0] < positions.shape[1]:
+            return super().modified_scores(rows, new_ratings)
+        # Each modified voter adds a rank-one correction to the Gram matrices.
+        delta = new_ratings - np.array(self.ratings_)[rows]
+        embeddings_matrix = self._gram_ + np.einsum("erc,ri,rj->ecij", delta, positions[rows], positions[rows])
+        eigenvalues = np.linalg.eigvalsh(embeddings_matrix)
+        s = np.sqrt(np.maximum(eigenvalues, 0))
+        scores = np.array([[self.aggregation_rule(s_c) for s_c in s_e] for s_e in s])
+        # The small eigenvalues of the corrected matrices are not accurate:
+        # these variants are scored as new elections instead.
+        traces = np.trace(embeddings_matrix, axis1=2, axis2=3)
+        inaccurate = np.any(eigenvalues[:, :, 0] <= 1e-10 * traces, axis=1)
+        if np.any(inaccurate):
+            scores[inaccurate] = np.real(super().modified_scores(rows, new_ratings[inaccurate]))
+        return scores
+
     def set_rule(self, aggregation_rule):
         """
         A function to update the aggregation rule
@@ -32,9 +32,33 @@ class SumScores(ScoringRule):
     >>> election.welfare_
     [0.3333333333333328, 1.0, 0.0]
     """
+
+    column_separable = True
+
     def _score_(self, candidate):
         return self.ratings_.candidate_ratings(candidate).sum()
 
+    def batch_scores(self, ratings_stack, embeddings=None):
+        return np.sum(ratings_stack, axis=1)
+
+    def _voter_weights(self, n_voters, embeddings=None):
+        return np.ones(n_voters)
+
+    def single_voter_scores(self, value):
+        """
+        Examples
+        --------
+        >>> ratings = Ratings(np.array([[.5, .6, .3], [.7, 0, .2], [.2, 1, .8]]))
+        >>> SumScores()(ratings).single_voter_scores(1)
+        array([[1.9, 2. , 2. ],
+               [1.7, 2.6, 2.1],
+               [2.2, 1.6, 1.5]])
+        """
+        return np.array(self.scores_) - np.array(self.ratings_) + value
+
+    def modified_scores(self, rows, new_ratings):
+        return np.array(self.scores_) + np.sum(new_ratings - np.array(self.ratings_)[rows], axis=1)
+
 
 class ProductScores(ScoringRule):
     """
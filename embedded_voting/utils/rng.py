@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+"""
+Copyright Théo Delemazure
+theo.delemazure@ens.fr
+
+This file is part of Embedded Voting.
+"""
+import copy
+import numpy as np
+
+
+class RandomMixin:
+    """
+    Mixin used by the random generators to draw their random numbers.
+
+    The source of random numbers is given by the attribute :attr:`rng`.
+    If it is None, the numbers are drawn from the global random state of
+    numpy (cf. ``np.random.seed``). Otherwise, it can be a seed, a
+    ``np.random.SeedSequence`` or a ``np.random.Generator``, and the numbers
+    are drawn from the corresponding ``np.random.Generator``.
+
+    The function :meth:`spawn` creates copies of the generator with
+    independent random streams, e.g. for parallel workers.
+
+    >>> class Example(RandomMixin):
+    ...     def __init__(self, rng=None):
+    ...         self.rng = rng
+    ...     def __call__(self):
+    ...         return self._random.random(2)
+    >>> Example(rng=42)()
+    array([0.77395605, 0.43887844])
+    >>> np.random.seed(42)
+    >>> Example()()
+    array([0.37454012, 0.95071431])
+    >>> children = Example(rng=42).spawn(2)
+    >>> children[0]()
+    array([0.91674416, 0.91098667])
+    >>> children[1]()
+    array([0.46749078, 0.0464489 ])
+    """
+
+    _rng = None
+    _random = np.random
+
+    @property
+    def rng(self):
+        """
+        The source of random numbers of the generator: None (for the
+        global random state of numpy), a seed, a ``np.random.SeedSequence``
+        or a ``np.random.Generator``.
+        """
+        return self._rng
+
+    @rng.setter
+    def rng(self, rng):
+        if rng is None:
+            self._random = np.random
+        else:
+            if not isinstance(rng, (np.random.SeedSequence, np.random.Generator)):
+                rng = np.random.SeedSequence(rng)
+            self._random = np.random.default_rng(rng)
+        self._rng = rng
+
+    def _seed_sequence(self):
+        """
+        Return the ``np.random.SeedSequence`` from which the
+        child streams of :meth:`spawn` are created.
+        """
+        if self._rng is None:
+            return np.random.SeedSequence(np.random.randint(2 ** 31))
+        if isinstance(self._rng, np.random.SeedSequence):
+            return self._rng
+        seed_sequence = getattr(self._rng.bit_generator, "seed_seq", None)
+        if seed_sequence is None:
+            # Before numpy 1.25, the seed sequence of a generator is not public.
+            seed_sequence = np.random.SeedSequence(self._rng.integers(2 ** 63))
+        return seed_sequence
+
+    def spawn(self, n_children):
+        """
+        This function creates copies of the generator with independent
+        random streams. Each call gives new streams, and with the same seed,
+        the successive calls always give the same streams. If :attr:`rng`
+        is None, the streams are seeded from the global random state of numpy.
+
+        Parameters
+        ----------
+        n_children : int
+            The number of copies.
+
+        Return
+        ------
+        list
+            The copies of the generator.
+        """
+        children = []
+        for seed_sequence in self._seed_sequence().spawn(n_children):
+            child = copy.copy(self)
+            child.rng = seed_sequence
+            children.append(child)
+        return children
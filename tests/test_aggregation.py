@@ -12,3 +12,13 @@ def test_plot():
     generator.plot_ratings(show=False)
     plt.close()
 
+
+def test_multivariate_chunks():
+    covariance_matrix = np.array([[2, 1, 0], [1, 2, .5], [0, .5, 1]])
+    np.random.seed(42)
+    ratings = RatingsGeneratorEpistemicMultivariate(covariance_matrix, .5)(7)
+    np.random.seed(42)
+    generator = RatingsGeneratorEpistemicMultivariate(covariance_matrix, .5, chunk_size=3)
+    assert np.allclose(generator(7), ratings)
+    generator.covariance_matrix = np.eye(3)
+    assert np.allclose(generator.factor_, np.eye(3))
@@ -1,5 +1,6 @@
 from embedded_voting.embeddings.embeddings import Embeddings
 from embedded_voting.ratings.ratings import Ratings
+from embedded_voting.ratings.ratingsFromEmbeddings import RatingsFromEmbeddingsCorrelated
 from embedded_voting.embeddings.embeddingsFromRatings import EmbeddingsFromRatingsRandom, EmbeddingsFromRatingsSelf
 from embedded_voting.embeddings.generator import EmbeddingsGeneratorRandom, EmbeddingsGeneratorPolarized
 import numpy as np
@@ -55,4 +56,39 @@ def test_generator():
         EmbeddingsGeneratorPolarized(10, 3)(1.5)
     with pytest.raises(ValueError):
         EmbeddingsGeneratorPolarized(10, 3)(-.5)
+    generator = EmbeddingsGeneratorPolarized(10, 3)
+    polarisations = np.linspace(0, 1, 4)
+    stack = generator(polarisations)
+    assert stack.shape == (4, 10, 3)
+    for embeddings, polarisation in zip(stack, polarisations):
+        assert np.allclose(embeddings, generator(polarisation))
+    with pytest.raises(ValueError):
+        generator(np.array([.5, 1.5]))
+
+
+def test_rng():
+    np.random.seed(42)
+    state = np.random.get_state()[1].copy()
+    generator = EmbeddingsGeneratorPolarized(10, 3, rng=np.random.SeedSequence(42))
+    assert np.array_equal(generator(.5), EmbeddingsGeneratorPolarized(10, 3, rng=42)(.5))
+    assert np.array_equal(EmbeddingsFromRatingsRandom(3, rng=1)(np.ones((10, 2))),
+                          EmbeddingsFromRatingsRandom(3, rng=np.random.default_rng(1))(np.ones((10, 2))))
+    assert np.array_equal(np.random.get_state()[1], state)
+    children = EmbeddingsGeneratorRandom(10, 3, rng=42).spawn(3)
+    embeddings = [child() for child in children]
+    assert not np.allclose(embeddings[0], embeddings[1])
+    assert np.array_equal(embeddings[2], EmbeddingsGeneratorRandom(10, 3, rng=42).spawn(3)[2]())
+    for child in EmbeddingsGeneratorRandom(10, 3, rng=np.random.default_rng(42)).spawn(2):
+        assert isinstance(child.rng, np.random.SeedSequence)
+
 
+def test_ratings_batch():
+    embeddings = EmbeddingsGeneratorPolarized(20, 3, rng=1)(.5)
+    coherences = np.array([0, .3, .7, 1])
+    scores_matrices = np.random.default_rng(2).random((4, 3, 5)) * 1.5
+    ratings = RatingsFromEmbeddingsCorrelated(5, 3, rng=3).batch_ratings(embeddings, coherences, scores_matrices)
+    assert ratings.shape == (4, 20, 5) and ratings.min() >= 0 and ratings.max() <= 1
+    generator = RatingsFromEmbeddingsCorrelated(5, 3, rng=3)
+    for k, coherence in enumerate(coherences):
+        generator.set_scores(scores_matrices[k])
+        assert np.allclose(generator(embeddings, coherence), ratings[k])
@@ -0,0 +1,90 @@
+from embedded_voting.experiments.store import ExperimentStore, run_tasks
+from embedded_voting.experiments.online import OnlineLearning
+from embedded_voting.aggregation.particular import AggregatorSum, AggregatorMLEGaussian
+from embedded_voting.epistemicGenerators import RatingsGeneratorEpistemicGroupedMean
+from embedded_voting.embeddings.generator import EmbeddingsGeneratorPolarized
+from embedded_voting.ratings.ratingsFromEmbeddings import RatingsFromEmbeddingsCorrelated
+from embedded_voting.manipulation.voter.general import SingleVoterManipulation
+from embedded_voting.scoring.singlewinner.trivialRules import SumScores
+from embedded_voting.scoring.singlewinner.svd import SVDNash
+import numpy as np
+import multiprocessing
+import pytest
+
+
+def _write_shard(path, key):
+    ExperimentStore(path).save({key: {"value": np.arange(3)}})
+
+
+def test_store_resume(tmp_path):
+    store = ExperimentStore(str(tmp_path))
+    calls = []
+
+    def square(x):
+        calls.append(x)
+        return {"square": x ** 2}
+
+    tasks = {"task_%i" % x: (x,) for x in range(5)}
+    run_tasks(square, {key: tasks[key] for key in ["task_0", "task_1"]}, store=store, checkpoint_every=2)
+    results = run_tasks(square, tasks, store=store, checkpoint_every=2)
+    assert calls == [0, 1, 2, 3, 4]
+    assert [int(results["task_%i" % x]["square"]) for x in range(5)] == [0, 1, 4, 9, 16]
+    assert store.keys() == set(tasks)
+
+
+def test_store_concurrent_merge(tmp_path):
+    path = str(tmp_path)
+    processes = [multiprocessing.Process(target=_write_shard, args=(path, "key_%i" % i)) for i in range(4)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    store = ExperimentStore(path)
+    assert store.keys() == {"key_%i" % i for i in range(4)}
+    store.merge()
+    assert len(store.manifest()) == 1
+    assert sorted(store.load()) == ["key_%i" % i for i in range(4)]
+
+
+def test_manipulation_map_store(tmp_path):
+    np.random.seed(42)
+    embeddings = EmbeddingsGeneratorPolarized(20, 3)(0)
+    ratings = RatingsFromEmbeddingsCorrelated(4, 3)(embeddings)
+    manipulation = SingleVoterManipulation(ratings, embeddings, SumScores())
+    store = ExperimentStore(str(tmp_path))
+    maps = manipulation.manipulation_map(map_size=3, show=False, store=store)
+    assert len(store.keys()) == 9
+    maps_resumed = manipulation.manipulation_map(map_size=3, show=False, store=store)
+    for name in maps:
+        assert np.array_equal(maps[name], maps_resumed[name])
+    assert "seed" in store.parameters()
+
+
+def test_manipulation_map_store_parameters(tmp_path):
+    np.random.seed(42)
+    embeddings = EmbeddingsGeneratorPolarized(20, 3)(0)
+    ratings = RatingsFromEmbeddingsCorrelated(4, 3)(embeddings)
+    manipulation = SingleVoterManipulation(ratings, embeddings, SumScores())
+    store = ExperimentStore(str(tmp_path))
+    manipulation.manipulation_map(map_size=3, show=False, store=store, seed=1)
+    with pytest.raises(ValueError):
+        manipulation.manipulation_map(map_size=3, show=False, store=store, seed=2)
+    with pytest.raises(ValueError):
+        manipulation.manipulation_map(map_size=4, show=False, store=store, seed=1)
+    with pytest.raises(ValueError):
+        SingleVoterManipulation(ratings, embeddings, SVDNash()).manipulation_map(map_size=3, show=False,
+                                                                                 store=store, seed=1)
+    assert len(store.keys()) == 9
+
+
+def test_online_store_parameters(tmp_path):
+    np.random.seed(42)
+    generator = RatingsGeneratorEpistemicGroupedMean([3, 3])
+    experiment = OnlineLearning([AggregatorSum(), AggregatorMLEGaussian()], generator)
+    store = ExperimentStore(str(tmp_path))
+    experiment(n_candidates=5, n_steps=3, n_try=2, store=store)
+    results = experiment.results_full_.copy()
+    experiment(n_candidates=5, n_steps=3, n_try=3, store=store)
+    assert np.array_equal(experiment.results_full_[:2], results)
+    with pytest.raises(ValueError):
+        experiment(n_candidates=5, n_steps=4, n_try=2, store=store)
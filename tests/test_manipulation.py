@@ -1,8 +1,19 @@
+import itertools
 import numpy as np
 from embedded_voting.embeddings.generator import EmbeddingsGeneratorPolarized
 from embedded_voting.ratings.ratingsFromEmbeddings import RatingsFromEmbeddingsCorrelated
 from embedded_voting.manipulation.coalition.general import ManipulationCoalition
+from embedded_voting.manipulation.voter.general import SingleVoterManipulation, SingleVoterManipulationExtension
+from embedded_voting.scoring.singlewinner.ordinal import BordaExtension, KApprovalExtension
+from embedded_voting.manipulation.coalition.ordinal import ManipulationCoalitionBorda
+from embedded_voting.manipulation.voter.borda import SingleVoterManipulationBorda
+from embedded_voting.manipulation.voter.irv import SingleVoterManipulationIRV
 from embedded_voting.scoring.singlewinner.svd import SVDNash
+from embedded_voting.scoring.singlewinner.general import ScoringRule
+from embedded_voting.scoring.singlewinner.trivialRules import SumScores
+from embedded_voting.scoring.singlewinner.mlerules import MLEGaussian
+from embedded_voting.scoring.singlewinner.features import FeaturesRule
+from embedded_voting.scoring.singlewinner.fast import FastNash
 import matplotlib.pyplot as plt
 
 
@@ -16,3 +27,125 @@ def test_coalition_general():
     manipulation = ManipulationCoalition(ratings, embeddings, SVDNash())
     manipulation(SVDNash())
     manipulation.manipulation_map(scores_matrix=np.random.rand(3, 3), show=True)
+
+
+def test_single_voter_map_parallel():
+    np.random.seed(42)
+    embeddings = EmbeddingsGeneratorPolarized(20, 3)(0)
+    ratings = RatingsFromEmbeddingsCorrelated(4, 3)(embeddings)
+    manipulation = SingleVoterManipulation(ratings, embeddings, SVDNash())
+    maps = manipulation.manipulation_map(map_size=3, show=False, seed=3)
+    cells = []
+    maps_parallel = manipulation.manipulation_map(map_size=3, show=False, seed=3, n_jobs=2,
+                                                  callback=lambda i, j, result: cells.append((i, j)))
+    assert sorted(cells) == [(i, j) for i in range(3) for j in range(3)]
+    for name in maps:
+        assert np.array_equal(maps[name], maps_parallel[name])
+
+
+def test_coalition_map_parallel():
+    np.random.seed(42)
+    embeddings = EmbeddingsGeneratorPolarized(20, 3)(0)
+    ratings = RatingsFromEmbeddingsCorrelated(4, 3)(embeddings)
+    for manipulation in [ManipulationCoalition(ratings, embeddings, SVDNash()),
+                         ManipulationCoalitionBorda(ratings, embeddings, SVDNash())]:
+        maps = manipulation.manipulation_map(map_size=3, show=False, seed=3)
+        cells = []
+        maps_parallel = manipulation.manipulation_map(map_size=3, show=False, seed=3, n_jobs=2,
+                                                      callback=lambda i, j, result: cells.append((i, j)))
+        assert sorted(cells) == [(i, j) for i in range(3) for j in range(3)]
+        for name in maps:
+            assert np.array_equal(maps[name], maps_parallel[name])
+
+
+def test_single_voter_closed_form():
+    np.random.seed(42)
+    embeddings = EmbeddingsGeneratorPolarized(30, 3)(.5)
+    ratings = RatingsFromEmbeddingsCorrelated(5, 3)(embeddings, .5)
+    for rule in [SumScores(), MLEGaussian(), FeaturesRule()]:
+        manipulation = SingleVoterManipulation(ratings, embeddings, rule)
+        voters = [manipulation.manipulation_voter(i) for i in range(30)]
+        assert manipulation.manipulation_global_ == voters
+
+
+def test_single_voter_parallel():
+    np.random.seed(42)
+    embeddings = EmbeddingsGeneratorPolarized(20, 3)(.5)
+    ratings = RatingsFromEmbeddingsCorrelated(4, 3)(embeddings, .5)
+    for cls in [SingleVoterManipulation, SingleVoterManipulationBorda, SingleVoterManipulationIRV]:
+        manipulation = cls(ratings, embeddings, SVDNash())
+        manipulation_parallel = cls(ratings, embeddings, SVDNash(), n_jobs=2)
+        assert manipulation_parallel.manipulation_global_ == manipulation.manipulation_global_
+        assert manipulation_parallel.is_manipulable_ == manipulation.is_manipulable_
+        assert np.array_equal(manipulation_parallel.ratings, ratings)
+
+
+def test_single_voter_extension_search():
+    np.random.seed(42)
+    embeddings = EmbeddingsGeneratorPolarized(8, 3)(.5)
+    ratings = np.round(RatingsFromEmbeddingsCorrelated(4, 3)(embeddings, .5), 1)
+    for extension in [BordaExtension(4), KApprovalExtension(4, k=2)]:
+        for rule in [SVDNash(), SumScores()]:
+            manipulation = SingleVoterManipulationExtension(ratings, embeddings, extension, rule)
+            for i in range(8):
+                best = manipulation.manipulation_voter(i)
+                assert manipulation.n_evaluations_ <= 24
+                preferences = list(np.argsort(ratings[i])[::-1])
+                winners = set()
+                for ballot in itertools.permutations(range(4)):
+                    fake = ratings.copy()
+                    fake[i] = ballot
+                    winners.add(manipulation.extended_rule(fake, embeddings).winner_)
+                assert best == min(winners, key=preferences.index)
+
+
+def test_single_voter_extension_not_separable():
+    np.random.seed(42)
+    embeddings = EmbeddingsGeneratorPolarized(8, 3)(.5)
+    ratings = np.round(RatingsFromEmbeddingsCorrelated(4, 3)(embeddings, .5), 1)
+    manipulation = SingleVoterManipulationExtension(ratings, embeddings, BordaExtension(4),
+                                                    FastNash(embeddings_as_history=True))
+    for i in range(8):
+        best = manipulation.manipulation_voter(i)
+        preferences = list(np.argsort(ratings[i])[::-1])
+        winners = set()
+        for ballot in itertools.permutations(range(4)):
+            fake = ratings.copy()
+            fake[i] = ballot
+            winners.add(manipulation.extended_rule(fake, embeddings).winner_)
+        assert best == min(winners, key=preferences.index)
+
+
+def test_irv_fake_tops():
+    np.random.seed(42)
+    embeddings = EmbeddingsGeneratorPolarized(20, 3)(.5)
+    ratings = np.round(RatingsFromEmbeddingsCorrelated(5, 3)(embeddings, .5), 1)
+    manipulation = SingleVoterManipulationIRV(ratings, embeddings, SVDNash())
+    for mask in range(2 ** 5 - 1):
+        eliminated = [c for c in range(5) if mask >> c & 1]
+        fake_profile = manipulation._create_fake_scores(eliminated, ratings)
+        assert np.array_equal(np.argmax(fake_profile, axis=1), manipulation._fake_tops(mask))
+
+
+def test_borda_batched_levels():
+    np.random.seed(42)
+    embeddings = EmbeddingsGeneratorPolarized(30, 3)(.5)
+    ratings = RatingsFromEmbeddingsCorrelated(5, 3)(embeddings, .5)
+    manipulation = SingleVoterManipulationBorda(ratings, embeddings, SVDNash())
+    general = SingleVoterManipulationExtension(ratings, embeddings, BordaExtension(5), SVDNash())
+    assert manipulation.manipulation_global_ == general.manipulation_global_
+
+
+def test_irv_rank_deficient():
+    class SVDNashReelection(SVDNash):
+        def modified_scores(self, rows, new_ratings):
+            return ScoringRule.modified_scores(self, rows, new_ratings)
+
+    np.random.seed(42)
+    for _ in range(20):
+        embeddings = np.random.rand(6, 3)
+        embeddings[:, 2] = embeddings[:, 0] + embeddings[:, 1] + 1e-7 * np.random.rand(6)
+        ratings = np.random.rand(6, 4)
+        manipulation = SingleVoterManipulationIRV(ratings, embeddings, SVDNash())
+        reelection = SingleVoterManipulationIRV(ratings, embeddings, SVDNashReelection())
+        assert manipulation.manipulation_global_ == reelection.manipulation_global_
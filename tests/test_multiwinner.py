@@ -1,6 +1,61 @@
+from embedded_voting.scoring.multiwinner.features import IterFeatures
+from embedded_voting.embeddings.embeddings import Embeddings
 from embedded_voting.scoring.multiwinner.svd import IterSVD
 import numpy as np
 import pytest
 import matplotlib.pyplot as plt
 
 
+def test_iter_svd_gram():
+    np.random.seed(42)
+    ratings = np.random.rand(30, 6)
+    embeddings = np.random.rand(30, 3)
+    for aggregation_rule in [np.max, np.sum, np.prod]:
+        for square_root in [True, False]:
+            election = IterSVD(1, aggregation_rule, square_root)(ratings, embeddings)
+            scores, vectors = [], []
+            for candidate in range(6):
+                scored = election.embeddings.scored(ratings[:, candidate] ** (.5 if square_root else 1))
+                _, s_values, s_vectors = np.linalg.svd(scored, full_matrices=False)
+                scores.append(aggregation_rule(s_values))
+                vectors.append(s_vectors[0] * np.sign(s_vectors[0].sum()))
+            winner = int(np.argmax(scores))
+            assert election.winners_ == [winner]
+            assert np.allclose(election.features_vectors[0], vectors[winner])
+
+
+def test_iter_svd_small_singular_values():
+    np.random.seed(42)
+    ratings = np.random.rand(30, 4)
+    embeddings = np.random.rand(30, 3)
+    embeddings[:, 2] = embeddings[:, 0] + 1e-6 * embeddings[:, 1]
+    election = IterSVD(1, np.prod)(ratings, embeddings)
+    expected = [np.prod(np.linalg.svd(election.embeddings.scored(np.sqrt(ratings[:, candidate])), compute_uv=False))
+                for candidate in range(4)]
+    assert election.winners_ == [int(np.argmax(expected))]
+
+
+def test_iter_svd_power_iteration():
+    np.random.seed(42)
+    ratings = np.random.rand(50, 8)
+    blocks = np.random.rand(50, 4)
+    blocks[:25, 2:] = 0
+    blocks[25:, :2] = 0
+    for embeddings in [np.random.rand(50, 4), np.eye(4)[np.random.randint(4, size=50)], blocks]:
+        election = IterSVD(6)(ratings, embeddings)
+        election_power = IterSVD(6, power_iteration=True)(ratings, embeddings)
+        assert election_power.winners_ == election.winners_
+        assert np.allclose(election_power.features_vectors, election.features_vectors)
+    with pytest.raises(ValueError):
+        IterSVD(3, aggregation_rule=np.sum, power_iteration=True)
+
+
+def test_iter_features_projection():
+    np.random.seed(42)
+    ratings = np.random.rand(20, 6)
+    embeddings = Embeddings(np.random.rand(20, 3), norm=True)
+    positions = np.array(embeddings)
+    expected = np.dot(np.dot(np.linalg.inv(np.dot(positions.T, positions)), positions.T), ratings).T
+    assert np.allclose(IterFeatures.compute_features(embeddings, ratings), expected)
+    rank_deficient = Embeddings(np.array([[1, 1], [2, 2], [3, 3]]), norm=False)
+    assert np.allclose(rank_deficient.projection(), np.linalg.pinv(np.array(rank_deficient)))
@@ -1,8 +1,17 @@
+import copy
 from embedded_voting.scoring.singlewinner.features import FeaturesRule
-from embedded_voting.scoring.singlewinner.svd import SVDMax
+from embedded_voting.scoring.singlewinner.svd import SVDMax, SVDNash, SVDSum
+from embedded_voting.scoring.singlewinner.mlerules import MLEGaussian
+from embedded_voting.scoring.singlewinner.trivialRules import SumScores, ProductScores
+from embedded_voting.scoring.singlewinner.ordinal import BordaExtension, InstantRunoffExtension, KApprovalExtension, \
+    VetoExtension, PluralityExtension
 from embedded_voting.scoring.multiwinner.svd import IterSVD
 from embedded_voting.ratings.ratings import Ratings
+from embedded_voting.ratings.rankings import Rankings
 from embedded_voting.embeddings.embeddings import Embeddings
+from embedded_voting.epistemicGenerators import RatingsGeneratorEpistemicGroupedMix
+from embedded_voting.manipulation.voter.borda import SingleVoterManipulationBorda
+from embedded_voting.manipulation.voter.irv import SingleVoterManipulationIRV
 import numpy as np
 import pytest
 
@@ -17,6 +26,17 @@ def test_features():
         election.plot_features("3D", dim=[0, 1], show=False)
 
 
+def test_features_moving_embeddings():
+    ratings = Ratings(np.array([[.5, .6, .3], [.7, 0, .2], [.2, 1, .8]]))
+    embeddings = Embeddings(np.array([[1, 1, 0], [1, 0, 1], [0, 1, 0]]))
+    rule = FeaturesRule()
+    rule(ratings, embeddings)
+    embeddings[0] = [0, 0, 1]
+    expected = FeaturesRule()(ratings, np.array(embeddings))
+    assert np.allclose(rule(ratings, embeddings).scores_, expected.scores_)
+    assert np.allclose(rule.single_voter_scores(0), expected.single_voter_scores(0))
+
+
 def test_svd():
     ratings = Ratings(np.array([[.5, .6, .3], [.7, 0, .2], [.2, 1, .8]]))
     embeddings = Embeddings(np.array([[1, 1, 0], [1, 0, 1], [0, 1, 0]]))
@@ -40,3 +60,183 @@ def test_multi():
         election.plot_weights("3D", dim=[0, 1], show=False)
 
     election.plot_winners("3D", show=False)
+
+
+def test_batch_scores():
+    np.random.seed(42)
+    ratings_stack = np.random.rand(4, 20, 5)
+    for positions in [np.random.rand(20, 3), np.random.rand(20, 30)]:
+        embeddings = Embeddings(positions)
+        for rule in [SumScores(), FeaturesRule(), MLEGaussian(), SVDNash(), SVDSum(), SVDNash(use_rank=True),
+                     ProductScores(), BordaExtension(5, SVDNash())]:
+            scores = rule.batch_scores(ratings_stack, embeddings)
+            assert np.allclose(scores, [rule(ratings, embeddings).scores_ for ratings in ratings_stack])
+            assert list(rule.batch_winners(ratings_stack, embeddings)) == [
+                rule(ratings, embeddings).winner_ for ratings in ratings_stack]
+    rule = InstantRunoffExtension(SVDNash())
+    assert list(rule.batch_winners(ratings_stack)) == [rule(ratings).winner_ for ratings in ratings_stack]
+
+
+def test_modified_scores():
+    np.random.seed(42)
+    ratings = np.random.rand(20, 5)
+    rows = [3, 7]
+    new_ratings = np.random.rand(4, 2, 5)
+    profiles = np.repeat(ratings[np.newaxis], 4, axis=0)
+    profiles[:, rows] = new_ratings
+    for positions in [np.random.rand(20, 3), np.random.rand(20, 30)]:
+        embeddings = Embeddings(positions)
+        for rule in [SumScores(), FeaturesRule(), MLEGaussian(), SVDNash(), SVDMax(), SVDNash(use_rank=True),
+                     ProductScores(), BordaExtension(5, SVDNash())]:
+            rule(ratings, embeddings)
+            scores = rule.modified_scores(rows, new_ratings)
+            assert np.allclose(scores, [rule(profile, embeddings).scores_ for profile in profiles])
+            rule(ratings, embeddings)
+            assert list(rule.modified_winners(rows, new_ratings)) == [
+                rule(profile, embeddings).winner_ for profile in profiles]
+    rule = InstantRunoffExtension(SVDNash())(ratings)
+    assert list(rule.modified_winners(rows, new_ratings)) == [rule(profile).winner_ for profile in profiles]
+
+
+def test_fake_ratings_ties():
+    np.random.seed(42)
+    ratings = np.random.rand(50, 6)
+    extension = BordaExtension(6)
+    points = np.arange(6)[::-1] / 5
+    expected = [points[np.argsort(np.argsort(ratings_i)[::-1])] for ratings_i in ratings]
+    assert np.allclose(extension._create_fake_ratings(ratings), expected)
+    buffer = np.empty(ratings.shape)
+    assert extension._create_fake_ratings(ratings, out=buffer) is buffer
+
+    ratings = np.round(ratings * 2) / 2
+    fake_ratings = KApprovalExtension(6, k=2, tie_breaking="average")._create_fake_ratings(ratings)
+    assert np.allclose(fake_ratings.sum(axis=1), 2)
+    random_ratings = [KApprovalExtension(6, k=2, tie_breaking="random", seed=3)._create_fake_ratings(ratings)
+                      for _ in range(2)]
+    assert np.array_equal(random_ratings[0], random_ratings[1])
+    assert np.all(random_ratings[0].sum(axis=1) == 2)
+    with pytest.raises(ValueError):
+        BordaExtension(6, tie_breaking="first")
+
+
+def test_extension_ties():
+    ratings = np.array([[.8, .2, .8, .5], [.1, .1, .1, .1], [.3, .9, .9, 0]])
+    assert BordaExtension(4, SumScores())(ratings).winner_ == 2
+    assert BordaExtension(4, SumScores(), tie_breaking="stable")(ratings).winner_ == 0
+    assert PluralityExtension(3, SumScores())(np.array([[.5, .5, 0], [.5, .5, 0], [0, 0, 1]])).winner_ == 1
+
+    np.random.seed(42)
+    ratings = np.round(np.random.rand(20, 5), 1)
+    for tie_breaking in ["reverse", "stable"]:
+        extension = BordaExtension(5, SumScores(), tie_breaking=tie_breaking)
+        assert np.allclose(extension.stream_scores([ratings[:, :2], ratings[:, 2:]]), extension(ratings).scores_)
+
+    rows = [3, 7]
+    new_ratings = np.round(np.random.rand(4, 2, 5), 1)
+    profiles = np.repeat(ratings[np.newaxis], 4, axis=0)
+    profiles[:, rows] = new_ratings
+    extension = KApprovalExtension(5, 2, SumScores(), tie_breaking="random")(ratings)
+    assert np.array_equal(extension.fake_ratings_, extension(ratings).fake_ratings_)
+    assert np.allclose(extension.modified_scores(rows, new_ratings),
+                       [copy.copy(extension)(profile).scores_ for profile in profiles])
+
+
+def test_irv_incremental_rounds():
+    np.random.seed(42)
+    ratings = np.round(np.random.rand(40, 6), 1)
+    embeddings = Embeddings(np.random.rand(40, 3))
+    for rule in [SVDNash(), SumScores(), FeaturesRule(), ProductScores()]:
+        election = InstantRunoffExtension(rule)(ratings, embeddings)
+        eliminated = []
+        for _ in range(6):
+            ranking = rule(election._create_fake_ratings(eliminated), embeddings).ranking_
+            eliminated.append([c for c in ranking if c not in eliminated][-1])
+        assert election.ranking_ == eliminated[::-1]
+
+
+def test_rankings():
+    np.random.seed(42)
+    ratings = np.random.rand(30, 5)
+    embeddings = Embeddings(np.random.rand(30, 3))
+    rankings = Rankings.from_ratings(ratings)
+    assert rankings.dtype == np.uint8 and rankings.nbytes * 8 == ratings.nbytes
+    assert np.array_equal(rankings.orders(), np.argsort(-ratings, axis=1))
+    for extension in [BordaExtension(5, SVDNash()), KApprovalExtension(5, 2, SVDNash())]:
+        assert np.array_equal(extension(rankings, embeddings).fake_ratings_,
+                              extension(ratings, embeddings).fake_ratings_)
+    irv = InstantRunoffExtension(SVDNash())
+    assert irv(rankings, embeddings).ranking_ == irv(ratings, embeddings).ranking_
+    top_2 = Rankings.from_ratings(ratings, k=2)
+    assert np.all(np.sort(top_2, axis=1)[:, 2:] == 2)
+    assert np.allclose(BordaExtension(5)(top_2).fake_ratings_.sum(axis=1), 1 + .75 + 3 * .25)
+    assert Rankings.from_ratings(np.random.rand(2, 300)).dtype == np.uint16
+    with pytest.raises(ValueError):
+        Rankings([[0, 1.5, 2]])
+    with pytest.raises(ValueError):
+        Rankings([[300, 0]])
+    with pytest.raises(ValueError):
+        Rankings([[0, 0, 0]])
+    with pytest.raises(ValueError):
+        Rankings([[0, 2, 2, 2]], k=2)
+    assert Rankings([[1, 2, 0, 2]], k=2).k == 2
+
+
+def test_truncated_rankings():
+    np.random.seed(42)
+    ratings = np.random.rand(30, 5)
+    embeddings = Embeddings(np.random.rand(30, 3))
+    top_1 = Rankings.from_ratings(ratings, k=1)
+    for tie_breaking in ["reverse", "stable", "random", "average"]:
+        extension = BordaExtension(5, SumScores(), tie_breaking=tie_breaking, seed=3)
+        assert np.array_equal(extension(top_1, embeddings).fake_ratings_,
+                              extension(top_1.to_ratings(), embeddings).fake_ratings_)
+    assert SingleVoterManipulationBorda(top_1, embeddings, SumScores()).winner_ == \
+        BordaExtension(5, SumScores())(top_1, embeddings).winner_
+    with pytest.raises(ValueError):
+        SingleVoterManipulationIRV(top_1, embeddings, SumScores())
+
+    # The ballots whose ranked candidates are all eliminated are exhausted.
+    rankings = Rankings.from_orders([[2], [2], [2], [0], [0], [1], [1], [3], [4], [4]], 5)
+    election = InstantRunoffExtension(SumScores())(rankings)
+    assert election.ranking_ == [2, 4, 1, 0, 3]
+    assert np.all(election._create_fake_ratings([2, 3])[:3] == 0)
+    eliminated = []
+    for _ in range(5):
+        ranking = SumScores()(election._create_fake_ratings(eliminated)).ranking_
+        eliminated.append([c for c in ranking if c not in eliminated][-1])
+    assert election.ranking_ == eliminated[::-1]
+
+
+def test_stream_scores():
+    generator = RatingsGeneratorEpistemicGroupedMix([3, 4, 3], [[1, 0], [1, 1], [0, 1]], independent_noise=.5)
+    np.random.seed(42)
+    chunks = [np.round(ratings) for _, ratings in generator.iter_chunks(9, 4)]
+    ratings = np.hstack(chunks)
+    embeddings = Embeddings(np.random.rand(10, 3))
+    for rule in [SumScores(), MLEGaussian()]:
+        assert np.allclose(rule.stream_scores(chunks, embeddings), rule(ratings, embeddings).scores_)
+        for extension in [KApprovalExtension(9, 3, rule), VetoExtension(9, rule), BordaExtension(9, rule)]:
+            scores = extension(ratings, embeddings).scores_
+            assert np.allclose(extension.stream_scores(iter(chunks), embeddings), scores)
+    with pytest.raises(NotImplementedError):
+        SVDNash().stream_scores(chunks, embeddings)
+    with pytest.raises(ValueError):
+        BordaExtension(10, SumScores()).stream_scores(chunks)
+
+
+def test_batch_keeps_election():
+    np.random.seed(42)
+    ratings = np.random.rand(6, 4)
+    embeddings = np.random.rand(6, 2)
+    ratings_stack = np.random.rand(5, 6, 4)
+    rules = [SumScores(), SVDNash(), SVDNash(use_rank=True), BordaExtension(4, SVDNash()),
+             BordaExtension(4, SVDNash(use_rank=True)), InstantRunoffExtension(SVDNash())]
+    for rule in rules:
+        rule(ratings, embeddings)
+        ranking = list(rule.ranking_)
+        rule.delete_cache()
+        rule.batch_winners(ratings_stack, embeddings)
+        if not isinstance(rule, InstantRunoffExtension):
+            rule.batch_scores(ratings_stack, embeddings)
+        assert np.allclose(rule.ratings_, ratings)
+        assert list(rule.ranking_) == ranking